@@ -1,28 +1,30 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox
 from datetime import datetime
-import mysql.connector
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import csv
-# MySQL connection setup
-db = mysql.connector.connect(
-    host="localhost",        # Change this if your database is not on localhost
-    user="root",             # Assuming 'root' is the username
-    password="Antim@123",    # Provided MySQL password
-    database="Personal_Finance"  # Provided database name
-)
-cursor = db.cursor()
-
-# Create budgets table if it doesn't exist
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS budgets (
-        id INT AUTO_INCREMENT PRIMARY KEY,
-        category VARCHAR(255) NOT NULL,
-        amount DECIMAL(10, 2) NOT NULL,
-        date DATE NOT NULL
-    )
-''')
+from decimal import Decimal
+from functools import partial
+import startup
+from filter_panel import FilterPanel
+from recurring_window import RecurringWindow, catch_up
+from store import Budget, BudgetStore, date_range, month_range
+from store_window import StoreWindow
+from charts import PieChart
+from search_index import ColumnSearch
+import variance
+from virtual_table import VirtualTable
+from worker import Worker
+
+store = BudgetStore()
+
+# Search type -> the column it searches
+search_columns = {
+    "category": "category",
+    "amount": "amount",
+    "date": "date",
+}
+
+# Prefix search over category names for search-as-you-type
+search = ColumnSearch(store, ("category",))
 
 # Predefined categories
 categories = [
@@ -37,248 +39,426 @@ categories = [
     "Savings"
 ]
 
-# Functions
-def add_budget():
-    category = category_var.get()
-    amount = amount_var.get()
-    expense_date = date_var.get()
 
-    if not amount.isdigit():
-        messagebox.showerror("Input Error", "Amount must be a positive number.")
-        return
+class BudgetWindow(StoreWindow, tk.Toplevel):
+    """The Budget Tracker window; opened from index.py or run on its own."""
+
+    store = store
+    search = search
+    search_columns = search_columns
+    noun = "budgets"
+
+    def __init__(self, master=None):
+        super().__init__(master)
+
+        # Filters behind the rows currently shown, and the total of those rows
+        self.current_filters = None
+        self.total_budget = Decimal(0)
+
+        # Per-category totals behind the pie chart (None until it is first drawn)
+        self.chart_data = None
+        self.chart = None  # PieChart in frame_charts, created with the first data
+        self.variance_window = None  # Budget vs actual report (created on first use)
+        self.forecast_window = None  # Forecast vs budget (created on first use)
+        self.recurring_window = None  # Recurring budget rules (created on first use)
+        self.typing_after = None  # Pending after() id of the search-as-you-type delay
+        self.filter_panel = None  # Multi-criteria filter dialog (created on first use)
+
+        self.title("Budget Tracker")
+        self.geometry("1500x800")  # Set window size to 1500x800
+        self.protocol("WM_DELETE_WINDOW", self.exit_application)
+
+        # Runs the database calls so the window stays responsive
+        self.worker = Worker(self, on_busy=self.show_busy)
+
+        self.build()
+        startup.mark("budget: window built")
+
+        # Create the table (and its indexes) on first run, then load the
+        # rows; both run on the worker so the window paints straight away
+        self.worker.submit(store.ensure_table, on_done=lambda _: self.load_data(), on_error=self.connect_failed)
+
+    # Functions
+    def fields_record(self):
+        """The budget typed into the input fields, or None after telling the user what is wrong."""
+        category = self.category_var.get()
+        amount = self.amount_var.get()
+        expense_date = self.date_var.get()
+
+        if not amount.isdigit():
+            messagebox.showerror("Input Error", "Amount must be a positive number.", parent=self)
+            return None
+
+        if not (category and amount and expense_date):
+            messagebox.showerror("Input Error", "All fields are required.", parent=self)
+            return None
+        return Budget(None, category, amount, expense_date)
+
+    def add_budget(self):
+        record = self.fields_record()
+        if record is None:
+            return
+
+        def added(record):
+            search.note(record)
+            if store.matches(record, self.current_filters):
+                self.table.add_row(record)  # Show just the new row
+                self.adjust_charts(record.category, record.amount)  # and add it to its slice
+                self.adjust_total_budget(record.amount)
+            self.reset_fields()
+
+        self.worker.submit(store.insert, record, on_done=added,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to add budget: {e}", parent=self))
+
+    def show_recurring(self):
+        # Budgets set once and carried into every month
+        if self.recurring_window is None:
+            self.recurring_window = RecurringWindow(self, store, self.fields_record, self.load_data, "Recurring Budgets")
+        else:
+            self.recurring_window.show()
+
+    def reset_fields(self):
+        self.category_var.set(categories[0])
+        self.amount_var.set('')
+        self.date_var.set(datetime.now().strftime("%Y-%m-%d"))  # Default to current date
+
+    def show_all(self):
+        self.load_data()
+        self.update_charts()  # Update charts when showing all
+
+    def search_budgets(self):
+        search_type = self.search_type_var.get()
+        search_value = self.search_item_var.get().strip()
+
+        if not search_value:
+            messagebox.showerror("Input Error", "Search value cannot be empty.", parent=self)
+            return
+
+        column = search_columns.get(search_type)
+        if column is None:
+            messagebox.showerror("Input Error", "Invalid search type.", parent=self)
+            return
 
-    if category and amount and expense_date:
         try:
-            cursor.execute('INSERT INTO budgets (category, amount, date) VALUES (%s, %s, %s)', 
-                           (category, float(amount), expense_date))
-            db.commit()
-            load_data()  # Refresh treeview
-            reset_fields()
-            update_charts()  # Update charts after adding a budget
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add budget: {e}")
-    else:
-        messagebox.showerror("Input Error", "All fields are required.")
-
-def delete_budget():
-    selected_item = tree.selection()
-    if not selected_item:
-        messagebox.showerror("Selection Error", "No item selected to delete.")
-        return
-
-    try:
-        item = tree.item(selected_item)
-        record_id = item['values'][0]  # Get ID from treeview
-        cursor.execute('DELETE FROM budgets WHERE id = %s', (record_id,))
-        db.commit()
-        load_data()  # Refresh treeview
-        update_charts()  # Update charts after deleting a budget
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to delete budget: {e}")
-
-def reset_fields():
-    category_var.set(categories[0])
-    amount_var.set('')
-    date_var.set(datetime.now().strftime("%Y-%m-%d"))  # Default to current date
-
-def show_all():
-    load_data()
-    update_charts()  # Update charts when showing all
-
-def search_budgets():
-    search_type = search_type_var.get()
-    search_value = search_item_var.get().strip()
-
-    if not search_value:
-        messagebox.showerror("Input Error", "Search value cannot be empty.")
-        return
-
-    query = f"SELECT * FROM budgets WHERE {search_type.lower()} LIKE %s"
-    cursor.execute(query, (f"%{search_value}%",))
-    filtered_budgets = cursor.fetchall()
-    load_treeview(filtered_budgets)
-    update_charts(filtered_budgets)  # Update charts based on search
-
-def load_data():
-    cursor.execute("SELECT * FROM budgets")
-    all_budgets = cursor.fetchall()
-    load_treeview(all_budgets)
-
-def load_treeview(data):
-    # Clear current entries in treeview
-    for item in tree.get_children():
-        tree.delete(item)
-
-    # Load data into the treeview
-    for row in data:
-        tree.insert('', 'end', values=row)
-
-def update_charts(data=None):
-    if data is None:
-        cursor.execute("SELECT category, SUM(amount) FROM budgets GROUP BY category")
-        data = cursor.fetchall()
-
-    categories_data = {row[0]: row[1] for row in data}
-
-    # Pie Chart
-    fig, ax = plt.subplots(figsize=(6, 6))
-    ax.pie(categories_data.values(), labels=categories_data.keys(), autopct='%1.1f%%', startangle=90)
-    ax.axis('equal')
-
-    # Clear and embed pie chart
-    for widget in frame_charts.winfo_children():
-        widget.destroy()
-    canvas = FigureCanvasTkAgg(fig, master=frame_charts)
-    canvas.get_tk_widget().pack(fill='both', expand=True)
-    canvas.draw()
-
-def save_to_file():
-    filepath = filedialog.asksaveasfilename(defaultextension=".csv",
-                                            filetypes=[("CSV files", "*.csv")],
-                                            title="Save as")
-    if filepath:
+            filters = self.search_filters(column, search_value)
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e), parent=self)
+            return
+        self.load_treeview(filters, charts=True, error_message="Failed to search budgets")  # Update charts based on search
+
+    def show_filters(self):
+        if self.filter_panel is None:
+            self.filter_panel = FilterPanel(self, store, search_columns, self.apply_filters, "Budget Filters")
+        self.filter_panel.show()
+
+    def apply_filters(self, filters):
+        # All of the panel's filters ANDed into one query (None shows everything)
+        self.search_status_label.config(text="")
+        self.load_treeview(filters, charts=True, error_message="Failed to filter budgets")
+
+    def show_by_range(self):
+        # Date range from the input fields (YYYY-MM-DD, either end may be left blank)
+        start_date = self.start_date_var.get().strip() or None
+        end_date = self.end_date_var.get().strip() or None
+
+        if not start_date and not end_date:
+            messagebox.showerror("Input Error", "Please enter a start and/or end date (YYYY-MM-DD).", parent=self)
+            return
+
         try:
-            cursor.execute("SELECT * FROM budgets")
-            rows = cursor.fetchall()
-            with open(filepath, 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(["ID", "Category", "Amount", "Date"])  # Write header
-                writer.writerows(rows)  # Write rows
-            messagebox.showinfo("Export Successful", f"Data saved to {filepath}")
-        except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to save file: {e}")
-
-def import_from_file():
-    filepath = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")], title="Select a CSV file")
-    if filepath:
+            filters = date_range(start_date, end_date)
+        except ValueError:
+            messagebox.showerror("Format Error", "Invalid date format. Please use YYYY-MM-DD format.", parent=self)
+            return
+
+        self.load_treeview(filters, charts=True, error_message="Failed to load budgets for that range")  # Update charts for the range
+
+    def load_data(self):
+        self.load_treeview()
+
+    def fetch_view(self, filters, charts):
+        # First page of the matching budgets, their total (the table only holds a
+        # window of rows, so it is summed in SQL) and, if wanted, the chart slices
+        rows = store.page(filters, limit=self.table.page_size)
+        total = store.total(filters)
+        data = None
+        if charts:
+            # Unfiltered slices come from monthly_rollup rather than a GROUP BY over every budget
+            data = store.category_totals() if not filters else store.aggregate("category", filters)
+        return rows, total, data
+
+    def load_treeview(self, filters=None, charts=False, error_message="Failed to load budgets"):
+        # Page the matching budgets into the table in the background; a newer
+        # search supersedes this one
+        def loaded(view):
+            rows, self.total_budget, data = view
+            self.current_filters = filters
+            self.table.load(partial(store.page, filters), rows)
+            self.show_total_budget()
+            if data is not None:
+                self.update_charts(data)
+
+        self.worker.submit(self.fetch_view, filters, charts, key="view", on_done=loaded,
+                           on_error=lambda e: messagebox.showerror("Error", f"{error_message}: {e}", parent=self))
+
+    def show_results(self, filters=None, error_message="Failed to search budgets"):
+        self.load_treeview(filters, charts=True, error_message=error_message)  # Charts follow the search
+
+    def refresh(self):
+        self.load_data()
+        self.update_charts()
+
+    def adjust_total_budget(self, delta):
+        # Apply one added/deleted row to the running total
+        self.total_budget += delta
+        self.show_total_budget()
+
+    def show_total_budget(self):
+        self.total_budget_label.config(text=f"Total Budget: ₹{self.total_budget:.2f}")
+
+    def update_charts(self, data=None):
+        if data is None:
+            # Pre-summed per month in monthly_rollup
+            self.worker.submit(store.category_totals, key="charts", on_done=self.update_charts,
+                               on_error=lambda e: messagebox.showerror("Error", f"Failed to load chart data: {e}", parent=self))
+            return
+
+        self.chart_data = {row[0]: row[1] for row in data}
+        self.draw_charts()
+
+    def adjust_charts(self, category, delta):
+        # Apply one added/deleted budget to its slice instead of re-aggregating the table
+        if self.chart_data is None:
+            self.update_charts()
+            return
+
+        total = self.chart_data.get(category, 0) + delta
+        if total:
+            self.chart_data[category] = total
+        else:
+            self.chart_data.pop(category, None)
+        self.draw_charts()
+
+    def draw_charts(self):
+        # Pie Chart, kept for the life of the window and updated in place
+        if self.chart is None:
+            self.chart = PieChart(self.frame_charts, figsize=(6, 6), startangle=90)
+            self.chart.pack(fill='both', expand=True)
+        self.chart.set_data(self.chart_data)
+
+    def show_variance(self):
+        # Budget vs actual for the months the From/To fields cover (all if blank)
+        start = self.start_date_var.get().strip()
+        end = self.end_date_var.get().strip()
         try:
-            with open(filepath, 'r') as file:
-                reader = csv.reader(file)
-                next(reader)  # Skip header row
-                for row in reader:
-                    cursor.execute('INSERT INTO budgets (category, amount, date) VALUES (%s, %s, %s)', 
-                                   (row[1], float(row[2]), row[3]))
-            db.commit()
-            load_data()  # Refresh treeview
-            update_charts()  # Update charts after importing data
-            messagebox.showinfo("Import Successful", f"Data imported from {filepath}")
-        except Exception as e:
-            messagebox.showerror("Import Error", f"Failed to import file: {e}")
-
-
-# Add this function to handle the delete functionality
-def delete_budget():
-    selected_item = tree.selection()
-    if not selected_item:
-        messagebox.showerror("Selection Error", "Please select a record to delete.")
-        return
-
-    # Get the selected item's ID
-    item = tree.item(selected_item)
-    record_id = item['values'][0]  # Assuming ID is the first column
-
-    try:
-        # Delete the record from the database
-        cursor.execute("DELETE FROM budgets WHERE id = %s", (record_id,))
-        db.commit()
-
-        # Remove the record from the Treeview
-        tree.delete(selected_item)
-
-        # Update charts after deletion
-        update_charts()
-
-        messagebox.showinfo("Success", f"Record with ID {record_id} has been deleted.")
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to delete record: {e}")
-
-
-
-def exit_application():
-    db.close()
-    root.destroy()
-
-# Main Window
-root = tk.Tk()
-root.title("Budget Tracker")
-root.geometry("1500x800")  # Set window size to 1500x800
-
-font_style = ('Arial', 12)
-
-# Menu Bar
-menu_bar = tk.Menu(root)
-root.config(menu=menu_bar)
-
-file_menu = tk.Menu(menu_bar, tearoff=0)
-menu_bar.add_cascade(label="File", menu=file_menu)
-file_menu.add_command(label="Save File", command=save_to_file)
-file_menu.add_command(label="Import File", command=import_from_file)
-file_menu.add_separator()
-file_menu.add_command(label="Exit", command=exit_application)
+            start = datetime.strptime(start, "%Y-%m-%d").date().replace(day=1) if start else None
+            end = month_range(datetime.strptime(end, "%Y-%m-%d").strftime("%Y-%m"))[1] if end else None
+        except ValueError:
+            messagebox.showerror("Format Error", "Invalid date format. Please use YYYY-MM-DD format.", parent=self)
+            return
+
+        def show(rows):
+            if self.variance_window is None or not self.variance_window.winfo_exists():
+                self.variance_window = VarianceWindow(self)
+            self.variance_window.show(rows)
+
+        self.worker.submit(variance.report, start, end, key="variance", on_done=show,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to compare budgets with expenses: {e}", parent=self))
+
+    def show_forecast(self):
+        # Projected spending per budget category next to what is budgeted for
+        # next month and the next quarter
+        def show(rows):
+            if self.forecast_window is None or not self.forecast_window.winfo_exists():
+                from forecast_window import ForecastWindow
+                self.forecast_window = ForecastWindow(
+                    self, "Spending Forecast", ("Category", "Next Month", "Month Budget", "Next Quarter", "Quarter Budget"),
+                    over_budget=lambda row: row.next_month > row.month_budget > 0 or row.next_quarter > row.quarter_budget > 0)
+            self.forecast_window.show(rows)
+
+        def budgets():
+            import forecast  # NumPy is only loaded once a forecast is asked for
+            return forecast.budgets()
+
+        self.worker.submit(budgets, key="forecast", on_done=show,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to forecast spending: {e}", parent=self))
+
+    # Add this function to handle the delete functionality
+    def delete_budget(self):
+        selected_item = self.tree.selection()
+        if not selected_item:
+            messagebox.showerror("Selection Error", "Please select a record to delete.", parent=self)
+            return
+
+        # Get the selected item's ID
+        item = self.tree.item(selected_item)
+        record_id = item['values'][0]  # Assuming ID is the first column
+
+        def deleted(record):
+            # Remove the record from the Treeview
+            self.table.remove_row(record_id)
+
+            # Take the deleted amount off its slice
+            if record and store.matches(record, self.current_filters):
+                self.adjust_charts(record.category, -record.amount)
+                self.adjust_total_budget(-record.amount)
+
+            messagebox.showinfo("Success", f"Record with ID {record_id} has been deleted.", parent=self)
 
-# Input Section
-frame_input = tk.Frame(root, padx=20, pady=20)
-frame_input.pack(fill='x')
-
-# Row 1
-tk.Label(frame_input, text="Category:", font=font_style).grid(row=0, column=0, padx=10, pady=10, sticky='w')
-category_var = tk.StringVar(value=categories[0])  # Default to the first category
-ttk.Combobox(frame_input, textvariable=category_var, values=categories, font=font_style, width=35, state="readonly").grid(row=0, column=1, padx=10, pady=10)
-
-tk.Label(frame_input, text="Amount:", font=font_style).grid(row=0, column=2, padx=10, pady=10, sticky='w')
-amount_var = tk.StringVar()
-tk.Entry(frame_input, textvariable=amount_var, font=font_style, width=20).grid(row=0, column=3, padx=10, pady=10)
-
-# Row 2
-tk.Label(frame_input, text="Date (YYYY-MM-DD):", font=font_style).grid(row=1, column=0, padx=10, pady=10, sticky='w')
-date_var = tk.StringVar(value=datetime.now().strftime("%Y-%m-%d"))  # Default to current date
-tk.Entry(frame_input, textvariable=date_var, font=font_style, width=20).grid(row=1, column=1, padx=10, pady=10)
-
-tk.Button(frame_input, text="Add Budget", command=add_budget, bg="green", fg="white", font=font_style, width=15).grid(row=1, column=2, padx=10, pady=10)
-
-# Search Section
-frame_search = tk.Frame(root, padx=20, pady=20)
-frame_search.pack(fill='x')
-
-tk.Label(frame_search, text="Search By:", font=font_style).grid(row=0, column=0, padx=10, pady=10, sticky='w')
-search_type_var = tk.StringVar(value="category")
-search_type_cb = ttk.Combobox(frame_search, textvariable=search_type_var, values=["category", "amount", "date"], state="readonly", font=font_style, width=20)
-search_type_cb.grid(row=0, column=1, padx=10, pady=10)
-
-tk.Label(frame_search, text="Search Value:", font=font_style).grid(row=0, column=2, padx=10, pady=10, sticky='w')
-search_item_var = tk.StringVar()
-tk.Entry(frame_search, textvariable=search_item_var, font=font_style, width=30).grid(row=0, column=3, padx=10, pady=10)
-
-tk.Button(frame_search, text="Search", command=search_budgets, bg="blue", fg="white", font=font_style, width=15).grid(row=0, column=4, padx=10, pady=10)
-
-# Table Section
-frame_table = tk.Frame(root)
-frame_table.pack(fill='both', expand=True)
-
-columns = ("ID", "Category", "Amount", "Date")
-tree = ttk.Treeview(frame_table, columns=columns, show='headings', selectmode='browse')
+        # Delete the record from the database
+        self.worker.submit(store.delete, record_id, on_done=deleted,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to delete record: {e}", parent=self))
 
-# Set column headings
-for col in columns:
-    tree.heading(col, text=col)
-    tree.column(col, width=100)
+    def build(self):
+        font_style = ('Arial', 12)
 
-tree.pack(fill='both', expand=True)
+        # Menu Bar
+        menu_bar = tk.Menu(self)
+        self.config(menu=menu_bar)
 
-# Chart Section
-frame_charts = tk.Frame(root, padx=20, pady=20)
-frame_charts.pack(side="bottom", fill='both', expand=True)
+        file_menu = tk.Menu(menu_bar, tearoff=0)
+        menu_bar.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="Save File", command=self.save_to_file)
+        file_menu.add_command(label="Import File", command=self.import_from_file)
+        file_menu.add_separator()
+        file_menu.add_command(label="Exit", command=self.exit_application)
 
+        # Input Section
+        frame_input = tk.Frame(self, padx=20, pady=20)
+        frame_input.pack(fill='x')
 
-# Add the Delete Button to the frame_input
-tk.Button(frame_input, text="Delete Selected", command=delete_budget, bg="red", fg="white", font=font_style, width=15).grid(row=1, column=3, padx=10, pady=10)
+        # Row 1
+        tk.Label(frame_input, text="Category:", font=font_style).grid(row=0, column=0, padx=10, pady=10, sticky='w')
+        self.category_var = tk.StringVar(self, value=categories[0])  # Default to the first category
+        ttk.Combobox(frame_input, textvariable=self.category_var, values=categories, font=font_style, width=35, state="readonly").grid(row=0, column=1, padx=10, pady=10)
 
-# Exit Button
-exit_button = tk.Button(root, text="Exit", command=exit_application, bg="red", fg="white", font=font_style)
-exit_button.place(relx=0.9, rely=0.02)
+        tk.Label(frame_input, text="Amount:", font=font_style).grid(row=0, column=2, padx=10, pady=10, sticky='w')
+        self.amount_var = tk.StringVar(self)
+        tk.Entry(frame_input, textvariable=self.amount_var, font=font_style, width=20).grid(row=0, column=3, padx=10, pady=10)
 
-# Load data on startup
-load_data()
+        # Row 2
+        tk.Label(frame_input, text="Date (YYYY-MM-DD):", font=font_style).grid(row=1, column=0, padx=10, pady=10, sticky='w')
+        self.date_var = tk.StringVar(self, value=datetime.now().strftime("%Y-%m-%d"))  # Default to current date
+        tk.Entry(frame_input, textvariable=self.date_var, font=font_style, width=20).grid(row=1, column=1, padx=10, pady=10)
 
-# Mainloop
-root.mainloop()
+        tk.Button(frame_input, text="Add Budget", command=self.add_budget, bg="green", fg="white", font=font_style, width=15).grid(row=1, column=2, padx=10, pady=10)
+
+        # Search Section
+        frame_search = tk.Frame(self, padx=20, pady=20)
+        frame_search.pack(fill='x')
+
+        tk.Label(frame_search, text="Search By:", font=font_style).grid(row=0, column=0, padx=10, pady=10, sticky='w')
+        self.search_type_var = tk.StringVar(self, value="category")
+        search_type_cb = ttk.Combobox(frame_search, textvariable=self.search_type_var, values=list(search_columns), state="readonly", font=font_style, width=20)
+        search_type_cb.grid(row=0, column=1, padx=10, pady=10)
+        # Re-run a typed search against the newly picked column
+        search_type_cb.bind("<<ComboboxSelected>>", lambda _: self.search_item_var.get().strip() and self.search_typed())
+
+        tk.Label(frame_search, text="Search Value:", font=font_style).grid(row=0, column=2, padx=10, pady=10, sticky='w')
+        self.search_item_var = tk.StringVar(self)
+        self.search_item_var.trace_add("write", self.search_typed)
+        tk.Entry(frame_search, textvariable=self.search_item_var, font=font_style, width=30).grid(row=0, column=3, padx=10, pady=10)
+
+        tk.Button(frame_search, text="Search", command=self.search_budgets, bg="blue", fg="white", font=font_style, width=15).grid(row=0, column=4, padx=10, pady=10)
+
+        # How many categories the typed search matched
+        self.search_status_label = tk.Label(frame_search, text="", font=font_style, fg="grey")
+        self.search_status_label.grid(row=0, column=5, padx=10, pady=10, sticky='w')
+
+        tk.Label(frame_search, text="From (YYYY-MM-DD):", font=font_style).grid(row=1, column=0, padx=10, pady=10, sticky='w')
+        self.start_date_var = tk.StringVar(self)
+        tk.Entry(frame_search, textvariable=self.start_date_var, font=font_style, width=20).grid(row=1, column=1, padx=10, pady=10)
+
+        tk.Label(frame_search, text="To (YYYY-MM-DD):", font=font_style).grid(row=1, column=2, padx=10, pady=10, sticky='w')
+        self.end_date_var = tk.StringVar(self)
+        tk.Entry(frame_search, textvariable=self.end_date_var, font=font_style, width=30).grid(row=1, column=3, padx=10, pady=10)
+
+        tk.Button(frame_search, text="Show Range", command=self.show_by_range, bg="purple", fg="white", font=font_style, width=15).grid(row=1, column=4, padx=10, pady=10)
+        tk.Button(frame_search, text="Budget vs Actual", command=self.show_variance, bg="dark orange", fg="white", font=font_style, width=15).grid(row=1, column=5, padx=10, pady=10)
+        tk.Button(frame_search, text="Filters...", command=self.show_filters, bg="dark orange", fg="white", font=font_style, width=15).grid(row=1, column=6, padx=10, pady=10)
+
+        # Table Section
+        frame_table = tk.Frame(self)
+        frame_table.pack(fill='both', expand=True)
+
+        self.columns = ("ID", "Category", "Amount", "Date")
+        self.table = VirtualTable(frame_table, self.columns, store.key_of, self.worker, selectmode='browse')
+        self.tree = self.table.tree
+
+        # Set column headings
+        for col in self.columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100)
+
+        self.table.pack(fill='both', expand=True)
+
+        # Summary Section
+        frame_summary = tk.Frame(self, padx=20)
+        frame_summary.pack(fill='x')
+
+        self.total_budget_label = tk.Label(frame_summary, text="Total Budget: ₹0.00", font=font_style, fg="blue")
+        self.total_budget_label.pack(side='left', padx=10)
+
+        self.status_label = tk.Label(frame_summary, text="", font=font_style, fg="grey")
+        self.status_label.pack(side='right', padx=10)
+
+        # Chart Section
+        self.frame_charts = tk.Frame(self, padx=20, pady=20)
+        self.frame_charts.pack(side="bottom", fill='both', expand=True)
+
+        # Add the Delete Button to the frame_input
+        tk.Button(frame_input, text="Delete Selected", command=self.delete_budget, bg="red", fg="white", font=font_style, width=15).grid(row=1, column=3, padx=10, pady=10)
+        tk.Button(frame_input, text="Recurring...", command=self.show_recurring, bg="dark green", fg="white", font=font_style, width=15).grid(row=1, column=5, padx=10, pady=10)
+        tk.Button(frame_input, text="Forecast", command=self.show_forecast, bg="purple", fg="white", font=font_style, width=15).grid(row=1, column=4, padx=10, pady=10)
+
+        # Exit Button
+        exit_button = tk.Button(self, text="Exit", command=self.exit_application, bg="red", fg="white", font=font_style)
+        exit_button.place(relx=0.9, rely=0.02)
+
+
+
+class VarianceWindow(tk.Toplevel):
+    """Budgeted vs spent vs remaining per category: range totals first, then each month."""
+
+    columns = ("Month", "Category", "Budgeted", "Spent", "Remaining")
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Budget vs Actual")
+        self.geometry("900x600")
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show='headings')
+        scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        for col in self.columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=120 if col != "Category" else 250)
+        self.tree.tag_configure("over", foreground="red")
+        self.tree.tag_configure("total", font=('Arial', 10, 'bold'))
+        scrollbar.pack(side='right', fill='y')
+        self.tree.pack(fill='both', expand=True)
+
+    def show(self, rows):
+        self.tree.delete(*self.tree.get_children())
+        # A few rows per month and category, so even years of history stay small
+        for row in variance.by_category(rows):
+            self.insert(row, "All", ("total",))
+        for row in rows:
+            self.insert(row, row.month.strftime("%Y-%m"), ())
+        self.deiconify()
+        self.lift()
+
+    def insert(self, row, month, tags):
+        if row.remaining < 0:
+            tags += ("over",)
+        self.tree.insert('', 'end', values=(month, row.category, f"{row.budgeted:.2f}", f"{row.spent:.2f}", f"{row.remaining:.2f}"), tags=tags)
+
+
+if __name__ == "__main__":
+    # Run on its own: a hidden root that quits when the window closes
+    root = tk.Tk()
+    root.withdraw()
+    window = BudgetWindow(root)
+    window.bind("<Destroy>", lambda event: root.destroy() if event.widget is window else None)
+    catch_up(window.worker, lambda _: window.load_data(), window)
+    root.mainloop()
@@ -1,25 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
-import matplotlib.pyplot as plt
-import mysql.connector
-
-# MySQL Connection Setup
-def create_connection():
-    try:
-        connection = mysql.connector.connect(
-            host="localhost", 
-            user="root", 
-            password="Antim@123", 
-            database="Personal_Finance"
-        )
-        return connection
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", f"Error connecting to MySQL: {err}")
-        return None
-
-# Sample in-memory list to store expenses (for reference, data will be pulled from MySQL)
-expenses = []
+from decimal import Decimal
+from functools import partial
+import startup
+from filter_panel import FilterPanel
+from recurring_window import RecurringWindow, catch_up
+from search_index import ColumnSearch
+from store import Expense, ExpenseStore, Ranking, date_range, month_range
+from store_window import StoreWindow
+from charts import ChartWindow
+from virtual_table import VirtualTable
+from worker import Worker
+
+store = ExpenseStore()
+
+# Typo-tolerant search over item and category names, shared by every window
+search = ColumnSearch(store, ("item", "category"))
 
 # Predefined categories
 categories = [
@@ -31,497 +28,494 @@ categories = [
     "Vacations/Travel", "Home Repairs and Maintenance", "Large Purchases (Appliances, Furniture, Electronics)", "Emergencies (Medical, Vehicle Repairs)"
 ]
 
-search_types = ["Item", "Category", "Payment Mode", "Date", "Amount"]
+search_types = ["Item", "Category", "Payment Mode", "Date", "Amount", "Total"]
 
-# Functions
-def add_expense():
-    category = category_var.get()
-    item = item_var.get()
-    amount = amount_var.get()
-    quantity = quantity_var.get()
-    expense_date = date_var.get()
-    payment_mode = payment_mode_var.get()
+# Search type -> the column it searches
+search_columns = {
+    "Item": "item",
+    "Category": "category",
+    "Payment Mode": "payment_mode",
+    "Date": "date",
+    "Amount": "amount",
+    "Total": "total"  # amount * quantity
+}
 
-    if not amount.isdigit() or not quantity.isdigit():
-        messagebox.showerror("Input Error", "Amount and Quantity must be positive numbers.")
-        return
+# How many of the largest expenses "Top Expenses" lists
+TOP_COUNT = 10
 
-    if category and item and expense_date and payment_mode:
-        try:
-            # Convert the date from DD-MM-YYYY to YYYY-MM-DD
-            try:
-                expense_date = datetime.strptime(expense_date, "%d-%m-%Y").strftime("%Y-%m-%d")
-            except ValueError:
-                messagebox.showerror("Date Error", "Incorrect date format. Please use DD-MM-YYYY format.")
-                return
 
-            # Add expense to the database
-            connection = create_connection()
-            if connection:
-                cursor = connection.cursor()
-                query = """
-                    INSERT INTO expenses (category, item, amount, quantity, date, payment_mode)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """
-                cursor.execute(query, (category, item, float(amount), int(quantity), expense_date, payment_mode))
-                connection.commit()
-                connection.close()
-                load_data()  # Refresh the data
-                reset_fields()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add expense: {e}")
-    else:
-        messagebox.showerror("Input Error", "All fields are required.")
-
-# Create the database analysis
-def show_analysis_pie():
-    try:
-        conn = create_connection()
-        if conn:
-            cursor = conn.cursor()
-            # Query to fetch total expenses grouped by category
-            query = """
-                SELECT category, SUM(amount * quantity) AS total_expense
-                FROM expenses
-                GROUP BY category
-                ORDER BY total_expense DESC
-            """
-            cursor.execute(query)
-            results = cursor.fetchall()
-            cursor.close()
-            conn.close()
-
-            if not results:
-                messagebox.showinfo("No Data", "No data available for analysis.")
-                return
+class ExpenseWindow(StoreWindow, tk.Toplevel):
+    """The Expense Tracker window; opened from index.py or run on its own."""
 
-            # Prepare data for plotting
-            categories = [row[0] for row in results]
-            total_expenses = [float(row[1]) for row in results]
-
-            # Create the pie chart
-            plt.figure(figsize=(8, 6))
-            plt.pie(
-                total_expenses, 
-                labels=categories, 
-                autopct='%1.1f%%', 
-                startangle=140, 
-                colors=plt.cm.Paired.colors
-            )
-            plt.title('Expense Distribution by Category', fontsize=16)
-            plt.axis('equal')  # Equal aspect ratio to make the pie chart circular
-            plt.show()
-
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred while generating analysis: {e}")
-        
-        
-def show_analysis_this_month():
-    try:
-        # Get the current year and month
-        current_month = datetime.now().strftime("%Y-%m")
+    store = store
+    search = search
+    search_columns = search_columns
+    noun = "expenses"
 
-        # Establish database connection
-        conn = create_connection()
-        if conn is None:
-            return
+    def __init__(self, master=None):
+        super().__init__(master)
 
-        cursor = conn.cursor()
-
-        # Query to fetch expenses grouped by category for the current month
-        query = """
-            SELECT category, SUM(amount * quantity) AS total_expense
-            FROM expenses
-            WHERE DATE_FORMAT(date, '%Y-%m') = %s
-            GROUP BY category
-            ORDER BY total_expense DESC
-        """
-        cursor.execute(query, (current_month,))
-        results = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        # Filters behind the rows currently shown, and the total of those rows
+        self.current_filters = None
+        self.total_expenses = Decimal(0)
 
-        if not results:
-            messagebox.showinfo("No Data", "No expenses found for this month.")
-            return
-
-        # Prepare data for the pie chart
-        categories = [row[0] for row in results]
-        total_expenses = [float(row[1]) for row in results]
-
-        # Create the pie chart
-        plt.figure(figsize=(8,6))
-        plt.pie(
-            total_expenses,
-            labels=categories,
-            autopct='%1.1f%%',
-            startangle=140,
-            colors=plt.cm.Paired.colors
-        )
-        plt.title('Expense Distribution for This Month', fontsize=16)
-        plt.axis('equal')  # Ensure the pie chart is a circle
-        plt.show()
-
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred while generating analysis: {e}")
+        # Window the analysis charts are drawn in (created on first use)
+        self.analysis_window = None
 
+        # Pending after() id of the search-as-you-type delay
+        self.typing_after = None
+        self.filter_panel = None  # Multi-criteria filter dialog (created on first use)
+        self.top_window = None  # Largest expenses (created on first use)
+        self.forecast_window = None  # Spending forecast (created on first use)
+        self.recurring_window = None  # Recurring expense rules (created on first use)
 
+        self.title("Expense Tracker")
+        self.geometry("1500x800")  # Set window size to 1500x800
+        self.protocol("WM_DELETE_WINDOW", self.exit_application)
 
-def delete_expense():
-    selected_item = tree.selection()
-    if not selected_item:
-        messagebox.showerror("Selection Error", "No item selected to delete.")
-        return
-
-    try:
-        item = tree.item(selected_item)
-        record_id = int(item['values'][0])  # Use ID to find expense in the list
-        conn = create_connection()
-        if conn is None:
-            return
+        # Runs the database calls so the window stays responsive
+        self.worker = Worker(self, on_busy=self.show_busy)
 
-        cursor = conn.cursor()
-        query = "DELETE FROM expenses WHERE id = %s"
-        cursor.execute(query, (record_id,))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        self.build()
+        startup.mark("expense: window built")
 
-        load_data()  # Refresh table data
+        # Create the table (and its indexes) on first run, then load the
+        # rows; both run on the worker so the window paints straight away
+        self.worker.submit(store.ensure_table, on_done=lambda _: self.load_data(), on_error=self.connect_failed)
 
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to delete expense: {e}")
+    # Functions
+    def fields_record(self):
+        """The expense typed into the input fields, or None after telling the user what is wrong."""
+        category = self.category_var.get()
+        item = self.item_var.get()
+        amount = self.amount_var.get()
+        quantity = self.quantity_var.get()
+        expense_date = self.date_var.get()
+        payment_mode = self.payment_mode_var.get()
 
-def reset_fields():
-    category_var.set(categories[0])
-    item_var.set('')
-    amount_var.set('')
-    quantity_var.set('1')  # Default quantity
-    date_var.set(datetime.now().strftime("%d-%m-%Y"))  # Default to current date
-    payment_mode_var.set('Offline')
+        if not amount.isdigit() or not quantity.isdigit():
+            messagebox.showerror("Input Error", "Amount and Quantity must be positive numbers.", parent=self)
+            return None
 
-from datetime import datetime
+        if not (category and item and expense_date and payment_mode):
+            messagebox.showerror("Input Error", "All fields are required.", parent=self)
+            return None
 
-def show_this_month():
-    current_month = datetime.now().strftime("%Y-%m")  # Get the current year-month (e.g., '2024-11')
-    
-    # Establish database connection
-    conn = create_connection()
-    if conn is None:
-        return
-
-    try:
-        cursor = conn.cursor()
-        
-        # Query to fetch expenses for the current month
-        query = """
-            SELECT id, category, item, amount, quantity, date, payment_mode
-            FROM expenses
-            WHERE DATE_FORMAT(date, '%Y-%m') = %s
-        """
-        
-        # Execute the query with the current month
-        cursor.execute(query, (current_month,))
-        records = cursor.fetchall()
-
-        # Clear current entries in the treeview
-        for item in tree.get_children():
-            tree.delete(item)
-
-        # Load data from the database
-        for record in records:
-            tree.insert('', 'end', values=record)
-
-        cursor.close()
-        conn.close()
-
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to load data for this month: {e}")
-
-
-def show_all():
-    try:
-        # Connect to the database
-        conn = create_connection()
-        if conn is None:
+        # Convert the date from DD-MM-YYYY to YYYY-MM-DD
+        try:
+            expense_date = datetime.strptime(expense_date, "%d-%m-%Y").date()
+        except ValueError:
+            messagebox.showerror("Date Error", "Incorrect date format. Please use DD-MM-YYYY format.", parent=self)
+            return None
+        return Expense(None, category, item, amount, int(quantity), expense_date, payment_mode)
+
+    def add_expense(self):
+        record = self.fields_record()
+        if record is None:
             return
 
-        cursor = conn.cursor()
-
-        # Query to fetch all expenses
-        query = """
-            SELECT id, category, item, amount, quantity, date, payment_mode
-            FROM expenses
-        """
-        cursor.execute(query)
-        results = cursor.fetchall()
-
-        # Clear the current data in the treeview
-        for item in tree.get_children():
-            tree.delete(item)
-
-        # If no results found, show a message
+        # Add expense to the database and show just that row
+        def added(record):
+            search.note(record)
+            if store.matches(record, self.current_filters):
+                self.table.add_row(record)
+                self.adjust_total_expenses(store.amount_of(record))
+            self.reset_fields()
+
+        self.worker.submit(store.insert, record, on_done=added,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to add expense: {e}", parent=self))
+
+    def show_recurring(self):
+        # Rent, utilities and subscriptions entered once and added every period
+        if self.recurring_window is None:
+            self.recurring_window = RecurringWindow(self, store, self.fields_record, self.load_data, "Recurring Expenses")
+        else:
+            self.recurring_window.show()
+
+    # Create the database analysis
+    def show_analysis_pie(self):
+        # Total expenses grouped by category, from the monthly rollup
+        self.worker.submit(store.category_totals, key="analysis", on_done=self.plot_analysis_pie,
+                           on_error=lambda e: messagebox.showerror("Error", f"An error occurred while generating analysis: {e}", parent=self))
+
+    def plot_analysis_pie(self, results):
         if not results:
-            messagebox.showinfo("No Results", "No expenses found.")
+            messagebox.showinfo("No Data", "No data available for analysis.", parent=self)
             return
+        self.show_analysis(results, 'Expense Distribution by Category')
 
-        # Insert the results into the treeview
-        for record in results:
-            tree.insert('', 'end', values=record)
-
-        # Close the database connection
-        cursor.close()
-        conn.close()
-
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred while fetching all expenses: {e}")
-
-
-def show_by_month():
-    # Get the selected month from the input field (e.g., MM-YYYY)
-    selected_month = month_var.get().strip()
-
-    if not selected_month:
-        messagebox.showerror("Input Error", "Please select a month in MM-YYYY format.")
-        return
-
-    # Validate if the entered month is in the correct MM-YYYY format
-    try:
-        datetime.strptime(selected_month, "%m-%Y")  # Check if the month format is valid
-    except ValueError:
-        messagebox.showerror("Format Error", "Invalid month format. Please use MM-YYYY format.")
-        return
-
-    # SQL query to fetch expenses where the date matches the selected month
-    query = """
-        SELECT id, category, item, amount, quantity, date, payment_mode
-        FROM expenses
-        WHERE DATE_FORMAT(date, '%m-%Y') = %s
-    """
-
-    try:
-        conn = create_connection()
-        if conn is None:
-            return
-
-        cursor = conn.cursor()
-        cursor.execute(query, (selected_month,))
-        results = cursor.fetchall()
+    def show_analysis_this_month(self):
+        # Get the current year and month
+        current_month = datetime.now().strftime("%Y-%m")
 
-        # Clear the current data in the treeview
-        for item in tree.get_children():
-            tree.delete(item)
+        # Expenses grouped by category for the current month
+        self.worker.submit(store.category_totals, *month_range(current_month), key="analysis", on_done=self.plot_analysis_this_month,
+                           on_error=lambda e: messagebox.showerror("Error", f"An error occurred while generating analysis: {e}", parent=self))
 
-        # If no results found, show a message
+    def plot_analysis_this_month(self, results):
         if not results:
-            messagebox.showinfo("No Results", f"No expenses found for {selected_month}.")
+            messagebox.showinfo("No Data", "No expenses found for this month.", parent=self)
             return
-
-        # Insert the results into the treeview
-        for record in results:
-            tree.insert('', 'end', values=record)
-
-        # Close the database connection
-        cursor.close()
-        conn.close()
-
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred while fetching data for {selected_month}: {e}")
-
-
-def search_expenses():
-    search_type = search_type_var.get()  # Get selected search criteria
-    search_value = search_item_var.get().strip()  # Get search term from user input
-    
-    if not search_value:
-        messagebox.showerror("Input Error", "Search value cannot be empty.")
-        return
-    
-    # Map the search type to the corresponding column in the database
-    column_map = {
-        "Item": "item",
-        "Category": "category",
-        "Payment Mode": "payment_mode",
-        "Date": "date",
-        "Amount": "amount"
-    }
-    
-    # Check if the selected search type is valid
-    if search_type not in column_map:
-        messagebox.showerror("Input Error", "Invalid search type.")
-        return
-    
-    # Get the database column for the selected search type
-    search_column = column_map[search_type]
-    
-    # SQL query based on search type
-    query = f"SELECT id, category, item, amount, quantity, date, payment_mode FROM expenses WHERE {search_column} LIKE %s"
-    
-    # Prepare search term with wildcards for SQL LIKE query
-    search_value = f"%{search_value}%"
-    
-    # Connect to the database and perform the search
-    try:
-        conn = create_connection()
-        if conn is None:
-            return
-        
-        cursor = conn.cursor()
-        cursor.execute(query, (search_value,))
-        results = cursor.fetchall()
-        
-        # Clear the current data in the treeview
-        for item in tree.get_children():
-            tree.delete(item)
-        
-        # If no results found, show a message
-        if not results:
-            messagebox.showinfo("No Results", "No records found matching your search.")
+        self.show_analysis(results, 'Expense Distribution for This Month')
+
+    def show_analysis(self, results, title):
+        # Every analysis reuses one chart window and figure
+        if self.analysis_window is None:
+            self.analysis_window = ChartWindow(self, "Expense Analysis", figsize=(8, 6), startangle=140, colormap="Paired")
+        self.analysis_window.show(results, title)
+
+    def delete_expense(self):
+        selected_item = self.tree.selection()
+        if not selected_item:
+            messagebox.showerror("Selection Error", "No item selected to delete.", parent=self)
             return
-        
-        # Insert the search results into the treeview
-        for record in results:
-            tree.insert('', 'end', values=record)
-        
-        # Close the database connection
-        cursor.close()
-        conn.close()
-    
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred while searching: {e}")
-
 
-def load_data():
-    conn = create_connection()
-    if conn is None:
-        return
-
-    cursor = conn.cursor()
-    query = "SELECT id, category, item, amount, quantity, date, payment_mode FROM expenses"
-    cursor.execute(query)
-    records = cursor.fetchall()
-
-    # Clear current entries in treeview
-    for item in tree.get_children():
-        tree.delete(item)
-
-    # Load data from the database
-    for record in records:
-        tree.insert('', 'end', values=record)
-
-    cursor.close()
-    conn.close()
-
-def exit_application():
-    root.destroy()
-
-# Main Window
-root = tk.Tk()
-root.title("Expense Tracker")
-root.geometry("1500x800")  # Set window size to 1500x800
+        item = self.tree.item(selected_item)
+        record_id = int(item['values'][0])  # Use ID to find expense in the list
 
-font_style = ('Arial', 12)
+        def deleted(record):
+            self.table.remove_row(record_id)  # Drop just that row from the table
+            if record and store.matches(record, self.current_filters):
+                self.adjust_total_expenses(-store.amount_of(record))
+
+        self.worker.submit(store.delete, record_id, on_done=deleted,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to delete expense: {e}", parent=self))
+
+    def reset_fields(self):
+        self.category_var.set(categories[0])
+        self.item_var.set('')
+        self.amount_var.set('')
+        self.quantity_var.set('1')  # Default quantity
+        self.date_var.set(datetime.now().strftime("%d-%m-%Y"))  # Default to current date
+        self.payment_mode_var.set('Offline')
+
+    def fetch_view(self, filters, order):
+        # First page of the matching expenses and their total; the table only
+        # holds a window of rows, so the total (amount * quantity) is summed in SQL
+        return store.page(filters, limit=self.table.page_size, order=order), store.total(filters)
+
+    def show(self, filters=None, empty_message=None, error_message="An error occurred while fetching expenses", order="id"):
+        # Page the matching expenses into the table in the background; a newer
+        # search supersedes this one. empty_message is shown if nothing matched,
+        # and order is a store.page() order (a Ranking lists search results best first).
+        def loaded(view):
+            rows, self.total_expenses = view
+            self.current_filters = filters
+            self.table.load(partial(store.page, filters, order=order), rows, partial(store.key_of, order=order))
+            self.show_total_expenses()
+            if not rows and empty_message:
+                messagebox.showinfo("No Results", empty_message, parent=self)
+
+        self.worker.submit(self.fetch_view, filters, order, key="view", on_done=loaded,
+                           on_error=lambda e: messagebox.showerror("Error", f"{error_message}: {e}", parent=self))
+
+    def show_results(self, filters=None, error_message="An error occurred while searching"):
+        self.show(filters, error_message=error_message)
+
+    def adjust_total_expenses(self, delta):
+        # Apply one added/deleted row to the running total
+        self.total_expenses += delta
+        self.show_total_expenses()
+
+    def show_total_expenses(self):
+        self.total_expenses_label.config(text=f"Total Expenses: ₹{self.total_expenses:.2f}")
+
+    def show_this_month(self):
+        current_month = datetime.now().strftime("%Y-%m")  # Get the current year-month (e.g., '2024-11')
+
+        # Expenses for the current month
+        self.show([("date", "month", current_month)], error_message="Failed to load data for this month")
+
+    def show_all(self):
+        # If no results found, show a message
+        self.show(empty_message="No expenses found.", error_message="An error occurred while fetching all expenses")
 
-# Input Section
-frame_input = tk.Frame(root, padx=20, pady=20)
-frame_input.pack(fill='x')
+    def show_by_month(self):
+        # Get the selected month from the input field (e.g., MM-YYYY)
+        selected_month = self.month_var.get().strip()
 
-# Row 1
-tk.Label(frame_input, text="Category:", font=font_style).grid(row=0, column=0, padx=10, pady=10, sticky='w')
-category_var = tk.StringVar(value=categories[0])  # Default to the first category
-ttk.Combobox(frame_input, textvariable=category_var, values=categories, font=font_style, width=35, state="readonly").grid(row=0, column=1, padx=10, pady=10)
+        if not selected_month:
+            messagebox.showerror("Input Error", "Please select a month in MM-YYYY format.", parent=self)
+            return
 
-tk.Label(frame_input, text="Item:", font=font_style).grid(row=0, column=2, padx=10, pady=10, sticky='w')
-item_var = tk.StringVar()
-tk.Entry(frame_input, textvariable=item_var, font=font_style, width=20).grid(row=0, column=3, padx=10, pady=10)
+        # Validate if the entered month is in the correct MM-YYYY format
+        try:
+            month = datetime.strptime(selected_month, "%m-%Y").strftime("%Y-%m")
+        except ValueError:
+            messagebox.showerror("Format Error", "Invalid month format. Please use MM-YYYY format.", parent=self)
+            return
 
-tk.Label(frame_input, text="Amount:", font=font_style).grid(row=0, column=4, padx=10, pady=10, sticky='w')
-amount_var = tk.StringVar()
-tk.Entry(frame_input, textvariable=amount_var, font=font_style, width=15).grid(row=0, column=5, padx=10, pady=10)
+        # If no results found, show a message
+        self.show([("date", "month", month)], empty_message=f"No expenses found for {selected_month}.",
+                  error_message=f"An error occurred while fetching data for {selected_month}")
 
-# Row 2
-tk.Label(frame_input, text="Quantity:", font=font_style).grid(row=1, column=0, padx=10, pady=10, sticky='w')
-quantity_var = tk.StringVar(value="1")  # Default to 1
-tk.Entry(frame_input, textvariable=quantity_var, font=font_style, width=15).grid(row=1, column=1, padx=10, pady=10)
+    def show_by_range(self):
+        # Get the date range from the input fields (DD-MM-YYYY, either end may be left blank)
+        start_date = self.start_date_var.get().strip()
+        end_date = self.end_date_var.get().strip()
 
-tk.Label(frame_input, text="Date (DD-MM-YYYY):", font=font_style).grid(row=1, column=2, padx=10, pady=10, sticky='w')
-date_var = tk.StringVar(value=datetime.now().strftime("%d-%m-%Y"))  # Default to current date
-tk.Entry(frame_input, textvariable=date_var, font=font_style, width=20).grid(row=1, column=3, padx=10, pady=10)
+        if not start_date and not end_date:
+            messagebox.showerror("Input Error", "Please enter a start and/or end date in DD-MM-YYYY format.", parent=self)
+            return
 
-tk.Label(frame_input, text="Payment Mode:", font=font_style).grid(row=1, column=4, padx=10, pady=10, sticky='w')
-payment_mode_var = tk.StringVar(value="Offline")
-ttk.Combobox(frame_input, textvariable=payment_mode_var, values=["Offline", "Online"], state="readonly", font=font_style, width=15).grid(row=1, column=5, padx=10, pady=10)
+        try:
+            start_date = datetime.strptime(start_date, "%d-%m-%Y").date() if start_date else None
+            end_date = datetime.strptime(end_date, "%d-%m-%Y").date() if end_date else None
+        except ValueError:
+            messagebox.showerror("Format Error", "Invalid date format. Please use DD-MM-YYYY format.", parent=self)
+            return
 
-tk.Button(frame_input, text="Add Expense", command=add_expense, bg="green",cursor="hand2", fg="white", font=font_style, width=15).grid(row=1, column=6, padx=10, pady=10)
+        # If no results found, show a message
+        self.show(date_range(start_date, end_date), empty_message="No expenses found in that date range.",
+                  error_message="An error occurred while fetching expenses for that range")
 
-# Search Section
-frame_search = tk.Frame(root, padx=20, pady=20)
-frame_search.pack(fill='x')
+    def search_expenses(self):
+        search_type = self.search_type_var.get()  # Get selected search criteria
+        search_value = self.search_item_var.get().strip()  # Get search term from user input
 
-tk.Label(frame_search, text="Search By:", font=font_style).grid(row=0, column=0, padx=10, pady=10, sticky='w')
-search_type_var = tk.StringVar(value=search_types[0])
-search_type_cb = ttk.Combobox(frame_search, textvariable=search_type_var, values=search_types, state="readonly", font=font_style, width=20)
-search_type_cb.grid(row=0, column=1, padx=10, pady=10)
+        if not search_value:
+            messagebox.showerror("Input Error", "Search value cannot be empty.", parent=self)
+            return
 
-tk.Label(frame_search, text="Search Item:", font=font_style).grid(row=0, column=2, padx=10, pady=10, sticky='w')
-search_item_var = tk.StringVar()
-tk.Entry(frame_search, textvariable=search_item_var, font=font_style, width=30).grid(row=0, column=3, padx=10, pady=10)
+        # Check if the selected search type is valid
+        if search_type not in search_columns:
+            messagebox.showerror("Input Error", "Invalid search type.", parent=self)
+            return
 
-tk.Button(frame_search, text="Search", command=search_expenses,cursor="hand2", bg="blue", fg="white", font=font_style, width=15).grid(row=0, column=4, padx=10, pady=10)
+        # Search the selected column for the term
+        column = search_columns[search_type]
+        if column in search.columns:
+            # Item and category names are matched through the fuzzy index,
+            # then looked up with an indexed IN (...) and listed best match first
+            def matched(result):
+                filters, values = result
+                self.search_status_label.config(text="Matched: " + ", ".join(values[:5]) if values else "")
+                self.show(filters, empty_message="No records found matching your search.",
+                          error_message="An error occurred while searching", order=Ranking(column, tuple(values)))
+
+            # The first search builds the index, so it runs in the background too
+            self.worker.submit(search.filters, column, search_value, key="view", on_done=matched,
+                               on_error=lambda e: messagebox.showerror("Error", f"An error occurred while searching: {e}", parent=self))
+        else:
+            try:
+                filters = self.search_filters(column, search_value)
+            except ValueError as e:
+                messagebox.showerror("Input Error", str(e), parent=self)
+                return
+            self.search_status_label.config(text="")
+            # If no results found, show a message
+            self.show(filters, empty_message="No records found matching your search.",
+                      error_message="An error occurred while searching")
+
+    def show_filters(self):
+        if self.filter_panel is None:
+            self.filter_panel = FilterPanel(self, store, search_columns, self.apply_filters, "Expense Filters")
+        self.filter_panel.show()
+
+    def apply_filters(self, filters):
+        # All of the panel's filters ANDed into one query (None shows everything)
+        self.search_status_label.config(text="")
+        self.show(filters, empty_message="No expenses match those filters.",
+                  error_message="An error occurred while filtering")
+
+    def show_top_expenses(self):
+        # The largest expenses (amount * quantity) among the rows shown,
+        # read in order from the index on the total column
+        def loaded(rows):
+            if self.top_window is None:
+                self.top_window = TopExpensesWindow(self)
+            self.top_window.show(rows)
+
+        self.worker.submit(store.top, TOP_COUNT, self.current_filters, "total", key="top", on_done=loaded,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to load the largest expenses: {e}", parent=self))
+
+    def show_forecast(self):
+        # Next month's and next quarter's spending per category, projected from history
+        def show(rows):
+            if not rows:
+                messagebox.showinfo("No Data", "No spending history to forecast from.", parent=self)
+                return
+            if self.forecast_window is None or not self.forecast_window.winfo_exists():
+                from forecast_window import ForecastWindow
+                self.forecast_window = ForecastWindow(self, "Spending Forecast",
+                                                      ("Category", "Last Month", "Next Month", "Next Quarter"))
+            self.forecast_window.show(rows)
+
+        def expenses():
+            import forecast  # NumPy is only loaded once a forecast is asked for
+            return forecast.expenses()
+
+        self.worker.submit(expenses, key="forecast", on_done=show,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to forecast spending: {e}", parent=self))
+
+    def load_data(self):
+        self.show(error_message="Error connecting to MySQL")
+
+    def build(self):
+        font_style = ('Arial', 12)
+
+        # Menu Bar
+        menu_bar = tk.Menu(self)
+        self.config(menu=menu_bar)
+
+        file_menu = tk.Menu(menu_bar, tearoff=0)
+        menu_bar.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="Save File", command=self.save_to_file)
+        file_menu.add_command(label="Import File", command=self.import_from_file)
+        file_menu.add_separator()
+        file_menu.add_command(label="Exit", command=self.exit_application)
 
-# Month Selection
-tk.Label(frame_search, text="Select Month (MM-YYYY):", font=font_style).grid(row=1, column=0, padx=10, pady=10, sticky='w')
-month_var = tk.StringVar()
-tk.Entry(frame_search, textvariable=month_var, font=font_style, width=20).grid(row=1, column=1, padx=10, pady=10)
+        # Input Section
+        frame_input = tk.Frame(self, padx=20, pady=20)
+        frame_input.pack(fill='x')
 
-tk.Button(frame_search, text="Show Month", command=show_by_month, bg="purple",cursor="hand2", fg="white", font=font_style, width=15).grid(row=1, column=2, padx=10, pady=10)
-tk.Button(frame_search, text="Show All", command=show_all, bg="dark orange",cursor="hand2", fg="white", font=font_style, width=15).grid(row=1, column=3, padx=10, pady=10)
+        # Row 1
+        tk.Label(frame_input, text="Category:", font=font_style).grid(row=0, column=0, padx=10, pady=10, sticky='w')
+        self.category_var = tk.StringVar(self, value=categories[0])  # Default to the first category
+        ttk.Combobox(frame_input, textvariable=self.category_var, values=categories, font=font_style, width=35, state="readonly").grid(row=0, column=1, padx=10, pady=10)
 
-# Table Section
-frame_table = tk.Frame(root)
-frame_table.pack(fill='both', expand=True)
+        tk.Label(frame_input, text="Item:", font=font_style).grid(row=0, column=2, padx=10, pady=10, sticky='w')
+        self.item_var = tk.StringVar(self)
+        tk.Entry(frame_input, textvariable=self.item_var, font=font_style, width=20).grid(row=0, column=3, padx=10, pady=10)
+
+        tk.Label(frame_input, text="Amount:", font=font_style).grid(row=0, column=4, padx=10, pady=10, sticky='w')
+        self.amount_var = tk.StringVar(self)
+        tk.Entry(frame_input, textvariable=self.amount_var, font=font_style, width=15).grid(row=0, column=5, padx=10, pady=10)
+
+        # Row 2
+        tk.Label(frame_input, text="Quantity:", font=font_style).grid(row=1, column=0, padx=10, pady=10, sticky='w')
+        self.quantity_var = tk.StringVar(self, value="1")  # Default to 1
+        tk.Entry(frame_input, textvariable=self.quantity_var, font=font_style, width=15).grid(row=1, column=1, padx=10, pady=10)
 
-columns = ("ID", "Category", "Item", "Amount", "Quantity", "Date", "Payment Mode")
-tree = ttk.Treeview(frame_table, columns=columns, show='headings', selectmode='browse')
+        tk.Label(frame_input, text="Date (DD-MM-YYYY):", font=font_style).grid(row=1, column=2, padx=10, pady=10, sticky='w')
+        self.date_var = tk.StringVar(self, value=datetime.now().strftime("%d-%m-%Y"))  # Default to current date
+        tk.Entry(frame_input, textvariable=self.date_var, font=font_style, width=20).grid(row=1, column=3, padx=10, pady=10)
 
-# Set column headings
-for col in columns:
-    tree.heading(col, text=col)
-    tree.column(col, width=100 if col == "ID" else 150)
+        tk.Label(frame_input, text="Payment Mode:", font=font_style).grid(row=1, column=4, padx=10, pady=10, sticky='w')
+        self.payment_mode_var = tk.StringVar(self, value="Offline")
+        ttk.Combobox(frame_input, textvariable=self.payment_mode_var, values=["Offline", "Online"], state="readonly", font=font_style, width=15).grid(row=1, column=5, padx=10, pady=10)
 
-tree.pack(fill='both', expand=True)
+        tk.Button(frame_input, text="Add Expense", command=self.add_expense, bg="green",cursor="hand2", fg="white", font=font_style, width=15).grid(row=1, column=6, padx=10, pady=10)
 
-# Action Buttons Section
-frame_actions = tk.Frame(root, padx=20, pady=20)
-frame_actions.pack(fill='x')
+        # Search Section
+        frame_search = tk.Frame(self, padx=20, pady=20)
+        frame_search.pack(fill='x')
 
+        tk.Label(frame_search, text="Search By:", font=font_style).grid(row=0, column=0, padx=10, pady=10, sticky='w')
+        self.search_type_var = tk.StringVar(self, value=search_types[0])
+        search_type_cb = ttk.Combobox(frame_search, textvariable=self.search_type_var, values=search_types, state="readonly", font=font_style, width=20)
+        search_type_cb.grid(row=0, column=1, padx=10, pady=10)
+        # Re-run a typed search against the newly picked column
+        search_type_cb.bind("<<ComboboxSelected>>", lambda _: self.search_item_var.get().strip() and self.search_typed())
+
+        tk.Label(frame_search, text="Search Item:", font=font_style).grid(row=0, column=2, padx=10, pady=10, sticky='w')
+        self.search_item_var = tk.StringVar(self)
+        self.search_item_var.trace_add("write", self.search_typed)
+        tk.Entry(frame_search, textvariable=self.search_item_var, font=font_style, width=30).grid(row=0, column=3, padx=10, pady=10)
 
-# Add Analyze Expenses Button
-# Action Buttons Section
-frame_actions = tk.Frame(root, padx=30, pady=30)
-frame_actions.pack(fill='x')
+        tk.Button(frame_search, text="Search", command=self.search_expenses,cursor="hand2", bg="blue", fg="white", font=font_style, width=15).grid(row=0, column=4, padx=10, pady=10)
+
+        # Values the last item/category search matched, best first
+        self.search_status_label = tk.Label(frame_search, text="", font=font_style, fg="grey")
+        self.search_status_label.grid(row=0, column=5, columnspan=3, padx=10, pady=10, sticky='w')
+
+        # Month Selection
+        tk.Label(frame_search, text="Select Month (MM-YYYY):", font=font_style).grid(row=1, column=0, padx=10, pady=10, sticky='w')
+        self.month_var = tk.StringVar(self)
+        tk.Entry(frame_search, textvariable=self.month_var, font=font_style, width=20).grid(row=1, column=1, padx=10, pady=10)
+
+        tk.Button(frame_search, text="Show Month", command=self.show_by_month, bg="purple",cursor="hand2", fg="white", font=font_style, width=15).grid(row=1, column=2, padx=10, pady=10)
+        tk.Button(frame_search, text="Show All", command=self.show_all, bg="dark orange",cursor="hand2", fg="white", font=font_style, width=15).grid(row=1, column=3, padx=10, pady=10)
+
+        # Date Range Selection
+        tk.Label(frame_search, text="From (DD-MM-YYYY):", font=font_style).grid(row=2, column=0, padx=10, pady=10, sticky='w')
+        self.start_date_var = tk.StringVar(self)
+        tk.Entry(frame_search, textvariable=self.start_date_var, font=font_style, width=20).grid(row=2, column=1, padx=10, pady=10)
+
+        tk.Label(frame_search, text="To (DD-MM-YYYY):", font=font_style).grid(row=2, column=2, padx=10, pady=10, sticky='w')
+        self.end_date_var = tk.StringVar(self)
+        tk.Entry(frame_search, textvariable=self.end_date_var, font=font_style, width=30).grid(row=2, column=3, padx=10, pady=10)
+
+        tk.Button(frame_search, text="Show Range", command=self.show_by_range, bg="purple",cursor="hand2", fg="white", font=font_style, width=15).grid(row=2, column=4, padx=10, pady=10)
+        tk.Button(frame_search, text="Filters...", command=self.show_filters, bg="dark orange",cursor="hand2", fg="white", font=font_style, width=15).grid(row=2, column=5, padx=10, pady=10)
+        tk.Button(frame_search, text="Top Expenses", command=self.show_top_expenses, bg="dark orange",cursor="hand2", fg="white", font=font_style, width=15).grid(row=2, column=6, padx=10, pady=10)
+
+        # Table Section
+        frame_table = tk.Frame(self)
+        frame_table.pack(fill='both', expand=True)
+
+        self.columns = ("ID", "Category", "Item", "Amount", "Quantity", "Date", "Payment Mode")
+        self.table = VirtualTable(frame_table, self.columns, store.key_of, self.worker, selectmode='browse')
+        self.tree = self.table.tree
+
+        # Set column headings
+        for col in self.columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100 if col == "ID" else 150)
+
+        self.table.pack(fill='both', expand=True)
+
+        # Summary Section
+        frame_summary = tk.Frame(self, padx=20)
+        frame_summary.pack(fill='x')
+
+        self.total_expenses_label = tk.Label(frame_summary, text="Total Expenses: ₹0.00", font=font_style, fg="red")
+        self.total_expenses_label.pack(side='left', padx=10)
+
+        self.status_label = tk.Label(frame_summary, text="", font=font_style, fg="grey")
+        self.status_label.pack(side='right', padx=10)
 
-# Left-side buttons
-tk.Button(frame_actions, text="Delete Expense", command=delete_expense, bg="red", fg="white", font=font_style, width=15, cursor="hand2").pack(side='left', padx=20)
-tk.Button(frame_actions, text="Show This Month", command=show_this_month, bg="orange", fg="white", font=font_style, width=15, cursor="hand2").pack(side='left', padx=20)
+        # Action Buttons Section
+        frame_actions = tk.Frame(self, padx=30, pady=30)
+        frame_actions.pack(fill='x')
+
+        # Left-side buttons
+        tk.Button(frame_actions, text="Delete Expense", command=self.delete_expense, bg="red", fg="white", font=font_style, width=15, cursor="hand2").pack(side='left', padx=20)
+        tk.Button(frame_actions, text="Show This Month", command=self.show_this_month, bg="orange", fg="white", font=font_style, width=15, cursor="hand2").pack(side='left', padx=20)
+
+        # Buttons to the right of "Show This Month"
+        tk.Button(frame_actions, text="Analyze This Month", command=self.show_analysis_this_month, bg="purple", fg="white", font=font_style, width=15, cursor="hand2").pack(side='left', padx=10)
+        tk.Button(frame_actions, text="Analyze Expenses", command=self.show_analysis_pie, bg="blue", fg="white", font=font_style, width=15, cursor="hand2").pack(side='left', padx=10)
+        tk.Button(frame_actions, text="Recurring...", command=self.show_recurring, bg="dark green", fg="white", font=font_style, width=15, cursor="hand2").pack(side='left', padx=10)
+        tk.Button(frame_actions, text="Forecast", command=self.show_forecast, bg="purple", fg="white", font=font_style, width=15, cursor="hand2").pack(side='left', padx=10)
+
+        # Exit Button
+        exit_button = tk.Button(self, text="Exit", command=self.exit_application, bg="red", fg="white", font=font_style,cursor="hand2")
+        exit_button.place(relx=0.9, rely=0.02)
 
-# Buttons to the right of "Show This Month"
-tk.Button(frame_actions, text="Analyze This Month", command=show_analysis_this_month, bg="purple", fg="white", font=font_style, width=15, cursor="hand2").pack(side='left', padx=10)
-tk.Button(frame_actions, text="Analyze Expenses", command=show_analysis_pie, bg="blue", fg="white", font=font_style, width=15, cursor="hand2").pack(side='left', padx=10)
 
-# Exit Button
-exit_button = tk.Button(root, text="Exit", command=exit_application, bg="red", fg="white", font=font_style,cursor="hand2")
-exit_button.place(relx=0.9, rely=0.02)
 
-# Action Buttons
-frame_actions = tk.Frame(root, padx=20, pady=20)
-frame_actions.pack(fill='x')
+class TopExpensesWindow(tk.Toplevel):
+    """The largest expenses by amount * quantity, largest first."""
+
+    columns = ("Rank", "Total", "Item", "Category", "Amount", "Quantity", "Date", "Payment Mode")
 
-#tk.Button(frame_actions, text="Delete Expense", command=delete_expense, bg="red", fg="white", font=font_style, width=15,cursor="hand2").pack(side='left', padx=20)
-#tk.Button(frame_actions, text="Show This Month", command=show_this_month, bg="orange", fg="white", font=font_style, width=15,cursor="hand2").pack(side='left', padx=20)
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Largest Expenses")
+        self.geometry("1100x350")
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show='headings')
+        for col in self.columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=60 if col in ("Rank", "Quantity") else 140)
+        self.tree.pack(fill='both', expand=True)
+
+    def show(self, rows):
+        self.tree.delete(*self.tree.get_children())
+        for rank, row in enumerate(rows, start=1):
+            self.tree.insert('', 'end', values=(rank, f"{store.amount_of(row):.2f}", row.item, row.category,
+                                                row.amount, row.quantity, row.date, row.payment_mode))
+        self.deiconify()
+        self.lift()
 
-# Load data on startup
-load_data()
 
-# Mainloop
-root.mainloop()
+if __name__ == "__main__":
+    # Run on its own: a hidden root that quits when the window closes
+    root = tk.Tk()
+    root.withdraw()
+    window = ExpenseWindow(root)
+    window.bind("<Destroy>", lambda event: root.destroy() if event.widget is window else None)
+    catch_up(window.worker, lambda _: window.load_data(), window)
+    root.mainloop()
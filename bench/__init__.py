@@ -0,0 +1,9 @@
+"""Headless benchmarks of the windows' hot paths.
+
+    python -m bench --backend sqlite --rows 1000 100000 --output results.json
+    python -m bench --compare before.json results.json
+
+Each run fills a scratch database with synthetic data (bench.generate) and
+times the store calls the windows make (bench.run), writing the timings
+as JSON so runs on different commits can be compared.
+"""
@@ -0,0 +1,97 @@
+"""python -m bench: run the benchmarks, or compare two result files."""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_path, after_path, file=sys.stdout):
+    """Print the median of every benchmark in two result files and their ratio."""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{'rows':>9} {'benchmark':<32} {'before ms':>10} {'after ms':>10} {'after/before':>12}", file=file)
+    for rows, results in after["results"].items():
+        for name, stats in results.items():
+            old = before["results"].get(rows, {}).get(name, {})
+            if "median_ms" not in stats or "median_ms" not in old:
+                continue
+            ratio = stats["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+            print(f"{rows:>9} {name:<32} {old['median_ms']:10.2f} {stats['median_ms']:10.2f} {ratio:12.2f}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__)
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--database", help="MySQL database to run in; its expenses, income, budgets "
+                                           "and monthly_rollup tables are dropped (required for mysql)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="expense row counts to benchmark (income gets a tenth as many)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="pf_bench_")
+    # Must be set before db or config are first used
+    os.environ["PF_DATABASE_BACKEND"] = args.backend
+    os.environ["PF_QUERYLOG_SLOW_LOG"] = ""  # don't leave a slow_queries.log in the repo
+    if args.backend == "sqlite":
+        os.environ["PF_SQLITE_PATH"] = os.path.join(workdir, "bench.db")
+    elif args.database:
+        os.environ["PF_MYSQL_DATABASE"] = args.database
+    else:
+        parser.error("--backend mysql needs --database (a scratch database; its tables are dropped)")
+
+    from bench import run
+
+    output = {
+        "commit": _commit(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "backend": args.backend,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": {},
+    }
+    try:
+        for rows in args.rows:
+            print(f"Benchmarking {rows} rows...", file=sys.stderr)
+            output["results"][str(rows)] = run.run(rows, args.repeat, args.seed, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Synthetic expenses, income and budgets for the benchmarks.
+
+Categories are the ones the windows offer (Expence.categories,
+Budget.categories). Amounts are log-normal around a typical price per
+category and dates are spread over the last few years, so indexes,
+rollups and searches see roughly the distribution a real user's data has.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from Budget import categories as budget_categories
+from Expence import categories as expense_categories
+from store import CENT, Budget, Expense, Income
+
+# Item names, typical price and relative frequency per expense category;
+# categories not listed use OTHER
+ITEMS = {
+    "Groceries": (["Milk", "Bread", "Eggs", "Rice", "Vegetables", "Fruit", "Coffee", "Cheese"], 150, 30),
+    "Rent Payments": (["Rent"], 15000, 1),
+    "Utilities (Electricity, Water, Gas, Internet, Phone)": (["Electricity bill", "Water bill", "Gas cylinder", "Broadband", "Mobile recharge"], 900, 4),
+    "Subscription Services (Streaming platforms, Gym memberships, Magazines)": (["Netflix", "Spotify", "Gym membership", "Magazine"], 400, 3),
+    "Transportation (Fuel, Public Transport, Ride-sharing)": (["Petrol", "Metro card", "Bus ticket", "Uber ride", "Parking"], 250, 15),
+    "Dining Out": (["Pizza", "Burger", "Biryani", "Coffee shop", "Dinner"], 600, 10),
+    "Entertainment (Movies, Concerts, Hobbies)": (["Movie ticket", "Concert", "Board game", "Books"], 700, 4),
+    "Healthcare (Doctor visits, Medicines, Therapies)": (["Doctor visit", "Medicines", "Physiotherapy"], 800, 2),
+    "Education (Books, Tuition Fees, Courses)": (["Textbook", "Online course", "Tuition fee"], 2500, 1),
+    "Clothing and Accessories": (["Shirt", "Shoes", "Jacket", "Watch"], 1200, 3),
+    "Vacations/Travel": (["Flight", "Hotel", "Train ticket"], 8000, 1),
+}
+OTHER = (["Miscellaneous", "Service charge", "Purchase", "Repair"], 500, 1)
+
+PAYMENT_MODES = ["Offline", "Online"]
+
+# (source, type, typical amount) for income rows; types are the income window's
+INCOME = [
+    ("Employer", "Salary", 60000),
+    ("Shop", "Business", 20000),
+    ("Mutual funds", "Investments", 5000),
+    ("Client project", "Freelancing", 15000),
+    ("Gift", "Other", 2000),
+]
+
+
+def _amount(rng, typical):
+    return Decimal(rng.lognormvariate(0, 0.5) * typical).quantize(CENT)
+
+
+def _day(rng, start, days):
+    return start + timedelta(days=rng.randrange(days))
+
+
+def expenses(count, years=5, seed=0):
+    """Yield `count` Expense records dated within the last `years` years."""
+    rng = random.Random(seed)
+    days = 365 * years
+    start = date.today() - timedelta(days=days)
+    weights = [ITEMS.get(category, OTHER)[2] for category in expense_categories]
+    for _ in range(count):
+        category = rng.choices(expense_categories, weights)[0]
+        items, typical, _ = ITEMS.get(category, OTHER)
+        item = rng.choice(items)
+        # Occasional variants so the search index has more than a handful of names
+        if rng.random() < 0.2:
+            item = f"{item} {rng.randrange(100)}"
+        quantity = 1 if rng.random() < 0.8 else rng.randint(2, 5)
+        yield Expense(None, category, item, _amount(rng, typical), quantity,
+                      _day(rng, start, days), rng.choice(PAYMENT_MODES))
+
+
+def income(count, years=5, seed=0):
+    """Yield `count` Income records dated within the last `years` years."""
+    rng = random.Random(seed + 1)
+    days = 365 * years
+    start = date.today() - timedelta(days=days)
+    for _ in range(count):
+        source, kind, typical = rng.choice(INCOME)
+        yield Income(None, source, kind, _amount(rng, typical), _day(rng, start, days))
+
+
+def budgets(years=5, seed=0):
+    """Yield one Budget per category for every month of the last `years` years."""
+    rng = random.Random(seed + 2)
+    month = date.today().replace(day=1)
+    for _ in range(12 * years):
+        for category in budget_categories:
+            yield Budget(None, category, _amount(rng, 5000), month)
+        month = (month - timedelta(days=1)).replace(day=1)
+
+
+def batches(records, size):
+    """Group an iterable of records into lists of at most `size`."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def populate(stores, rows, years=5, seed=0, batch_size=10000):
+    """Fill empty expenses/income/budgets stores for a benchmark of `rows` expenses.
+
+    `stores` maps "expenses", "income" and "budgets" to their stores. Income
+    gets a tenth as many rows as expenses.
+    """
+    sources = {
+        "expenses": expenses(rows, years, seed),
+        "income": income(max(rows // 10, 1), years, seed),
+        "budgets": budgets(years, seed),
+    }
+    for name, records in sources.items():
+        for batch in batches(records, batch_size):
+            stores[name].bulk_insert(batch)
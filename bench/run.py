@@ -0,0 +1,234 @@
+"""The benchmarked operations, one per thing a window does that can feel slow.
+
+Each database benchmark clears the query cache before every run, so it
+measures the query itself rather than a cache hit.
+"""
+import os
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import db
+import recurring
+import rollup
+import variance
+from Budget import store as budgets
+from Expence import search, store as expenses
+from cache import query_cache
+from exporter import export_csv
+from importer import import_csv
+from income import store as income
+from store import Expense, month_range
+
+from bench import generate
+
+STORES = {"expenses": expenses, "income": income, "budgets": budgets}
+
+# Rows per page, as in the windows' VirtualTable
+PAGE_SIZE = 100
+
+# Monthly rules the recurring catch-up benchmark writes five years of
+RECURRING_RULES = 50
+
+# Misspelt on purpose: the fuzzy item search should still find "Petrol"
+SEARCH_TERM = "petorl"
+
+
+def _stats(runs, rows=None):
+    runs = [seconds * 1000 for seconds in runs]
+    result = {
+        "runs": len(runs),
+        "min_ms": round(min(runs), 3),
+        "median_ms": round(statistics.median(runs), 3),
+        "mean_ms": round(statistics.fmean(runs), 3),
+        "max_ms": round(max(runs), 3),
+    }
+    if rows:
+        result["rows_per_s"] = round(rows / (result["median_ms"] / 1000))
+    return result
+
+
+def timed(fn, repeat, setup=None, rows=None):
+    """Time `repeat` calls of fn(); setup() runs untimed before each one."""
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return _stats(runs, rows)
+
+
+def reset():
+    """Drop and recreate the benchmark tables, empty."""
+    with db.cursor(commit=True) as cursor:
+        for table in (*STORES, "monthly_rollup"):
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    for store in STORES.values():
+        store.create_table()
+    search.reset()
+    query_cache.clear()
+
+
+def _view(store, filters=None):
+    # What a window's fetch_view() does: the first page and the total
+    store.page(filters, limit=PAGE_SIZE)
+    store.total(filters)
+
+
+def _search():
+    filters, _ = search.filters("item", SEARCH_TERM)
+    _view(expenses, filters)
+
+
+def _typed():
+    # One keystroke of search-as-you-type: a prefix lookup, then the view
+    filters, _ = search.prefix_filters("item", SEARCH_TERM[:3])
+    _view(expenses, filters)
+
+
+def _last_id():
+    with db.cursor() as cursor:
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM expenses")
+        return cursor.fetchone()[0]
+
+
+def _remove_after(last_id):
+    # Undo an import: drop the rows it added and rebuild their rollup
+    with db.cursor(commit=True) as cursor:
+        cursor.execute("DELETE FROM expenses WHERE id > %s", (last_id,))
+        rollup.rebuild(cursor, expenses)
+    expenses.invalidate()
+
+
+def recurring_catch_up(repeat):
+    """Time one recurring.run() writing five years of RECURRING_RULES monthly expenses."""
+    last_id = _last_id()
+    start = date.today().replace(day=1) - timedelta(days=5 * 365)
+
+    def setup():
+        # Undo the previous run (untimed) and start every rule over
+        _remove_after(last_id)
+        recurring.ensure_table()
+        with db.cursor(commit=True) as cursor:
+            cursor.execute("DELETE FROM recurring_rules")
+        for i in range(RECURRING_RULES):
+            recurring.add(expenses, Expense(None, "Fixed Expenses", f"Subscription {i}", Decimal(100 + i), 1,
+                                            start + timedelta(days=i % 28), "Online"), "monthly")
+
+    try:
+        return timed(recurring.run, repeat, setup)
+    finally:
+        _remove_after(last_id)
+        with db.cursor(commit=True) as cursor:
+            cursor.execute("DELETE FROM recurring_rules")
+
+
+def chart_refresh(repeat):
+    """Time redrawing the analysis pie with new totals, or say why it can't run."""
+    try:
+        import tkinter as tk
+        from charts import PieChart
+        root = tk.Tk()
+    except Exception as e:  # no display
+        return {"skipped": f"{type(e).__name__}: {e}"}
+    try:
+        root.withdraw()
+        chart = PieChart(root)
+        totals = expenses.category_totals()
+        # Same slices with different values, as when the analysed month changes
+        data = [totals, [(category, total / 2 + 1) for category, total in totals]]
+        chart.set_data(totals)
+        chart.canvas.draw()
+
+        runs = iter(range(repeat))
+
+        def refresh():
+            chart.set_data(data[next(runs) % 2])
+            chart.canvas.draw()
+        return timed(refresh, repeat)
+    except ImportError as e:  # no matplotlib
+        return {"skipped": f"{type(e).__name__}: {e}"}
+    finally:
+        root.destroy()
+
+
+def trends_refresh(repeat):
+    """Time loading the full trend history and drawing it (off screen), or say why it can't run."""
+    try:
+        import trends
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from trend_window import plot
+    except ImportError as e:  # no numpy or matplotlib
+        return {"skipped": f"{type(e).__name__}: {e}"}
+    figure = Figure(figsize=(12, 7))
+    canvas = FigureCanvasAgg(figure)
+
+    def refresh():
+        plot(figure, trends.load(), "Expenses by category", 12)
+        canvas.draw()
+    return timed(refresh, repeat, query_cache.clear)
+
+
+def forecast_all(repeat):
+    """Time forecasting every expense category from scratch, or say why it can't run."""
+    try:
+        import forecast
+    except ImportError as e:  # no numpy
+        return {"skipped": f"{type(e).__name__}: {e}"}
+
+    def clear():
+        forecast.reset()
+        query_cache.clear()
+    return timed(forecast.budgets, repeat, clear)
+
+
+def run(rows, repeat=5, seed=0, workdir=None):
+    """Fill the database with `rows` expenses and time every benchmark; return name -> stats."""
+    results = {}
+    reset()
+
+    start = time.perf_counter()
+    generate.populate(STORES, rows, seed=seed)
+    results["populate"] = _stats([time.perf_counter() - start], rows)
+
+    clear = query_cache.clear
+    month = date.today().strftime("%Y-%m")
+
+    def clear_search():
+        search.reset()
+        clear()
+
+    for name, store in STORES.items():
+        results[f"{name}.load_data"] = timed(lambda: _view(store), repeat, clear)
+
+    results["expenses.search_index_build"] = timed(lambda: search.filters("item", SEARCH_TERM), repeat, clear_search)
+    results["expenses.search_expenses"] = timed(_search, repeat, clear)
+    results["expenses.search_as_you_type"] = timed(_typed, repeat, clear)
+    results["expenses.search_contains"] = timed(lambda: _view(expenses, [("payment_mode", "contains", "onl")]), repeat, clear)
+    results["expenses.month_filter"] = timed(lambda: _view(expenses, [("date", "month", month)]), repeat, clear)
+
+    for name, store in STORES.items():
+        results[f"{name}.analysis_all"] = timed(store.category_totals, repeat, clear)
+        results[f"{name}.analysis_month"] = timed(lambda: store.category_totals(*month_range(month)), repeat, clear)
+    results["budgets.variance"] = timed(variance.report, repeat, clear)
+    results["budgets.forecast"] = forecast_all(repeat)
+
+    path = os.path.join(workdir or ".", f"bench_expenses_{rows}.csv")
+    results["expenses.export_csv"] = timed(lambda: export_csv(expenses, path), repeat, rows=rows)
+
+    # Each run imports the exported file again; the previous run's rows are
+    # removed (untimed) first, so every run starts from the same table
+    last_id = _last_id()
+    results["expenses.import_csv"] = timed(lambda: import_csv(expenses, path), repeat,
+                                           lambda: _remove_after(last_id), rows=rows)
+    _remove_after(last_id)
+    os.remove(path)
+    results["expenses.recurring_catch_up"] = recurring_catch_up(repeat)
+
+    results["chart_refresh"] = chart_refresh(repeat)
+    results["trends_refresh"] = trends_refresh(repeat)
+    return results
@@ -0,0 +1,124 @@
+import atexit
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from config import get_section
+
+DEFAULTS = {
+    "max_entries": "256",
+    "ttl": "300",
+    "log_stats_at_exit": "no",
+}
+
+
+def normalize_query(query):
+    # Queries built from the same template differ only in whitespace
+    return " ".join(query.split())
+
+
+class QueryCache:
+    """A small LRU cache of read-query results with a time-to-live.
+
+    Entries are keyed by the normalized SQL text plus its parameters and
+    tagged with the tables they read; invalidate(table) drops every entry
+    that read that table. The stores invalidate their table on every write,
+    so a cached result is never older than the last change made through the
+    application (the TTL bounds staleness from changes made elsewhere).
+
+    Writes also name the rollup groups (categories) they touched, so caches
+    kept per category outside this one can tell from versions(table)
+    which categories changed.
+    """
+
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires, tables, rows)
+        # Bumped by invalidate(), so a result loaded while its table was
+        # being written is not cached
+        self._generations = defaultdict(int)
+        # Bumped by invalidate() for the groups a write touched, or for the
+        # whole table when it didn't say
+        self._group_generations = defaultdict(lambda: defaultdict(int))
+        self._table_generations = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, tables, query, params, load):
+        """Return cached rows for the query, or call load() and cache what it returns."""
+        if self.max_entries <= 0:
+            return load()
+
+        key = (normalize_query(query), tuple(params))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(entry[2])
+            self.misses += 1
+            generations = [self._generations[table] for table in tables]
+
+        rows = load()
+        with self._lock:
+            if generations != [self._generations[table] for table in tables]:
+                return rows
+            self._entries[key] = (now + self.ttl, frozenset(tables), list(rows))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return rows
+
+    def invalidate(self, table, groups=None):
+        """Drop every cached result that read `table`; `groups` are the categories changed (None: any)."""
+        with self._lock:
+            self._generations[table] += 1
+            if groups is None:
+                self._table_generations[table] += 1
+            else:
+                for group in groups:
+                    self._group_generations[table][group] += 1
+            stale = [key for key, (_, tables, _) in self._entries.items() if table in tables]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def versions(self, table):
+        """Return (table generation, {group: generation}); a group changed if either moved on."""
+        with self._lock:
+            return self._table_generations[table], dict(self._group_generations[table])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def _from_config():
+    settings = get_section("cache", DEFAULTS)
+    cache = QueryCache(int(settings["max_entries"]), float(settings["ttl"]))
+    if settings["log_stats_at_exit"].lower() in ("1", "yes", "true", "on"):
+        atexit.register(lambda: print("Query cache:", cache.stats()))
+    return cache
+
+
+# Shared by every store in the process
+query_cache = _from_config()
@@ -0,0 +1,97 @@
+"""Pie charts embedded in the windows, drawn on one long-lived figure.
+
+A PieChart owns a single matplotlib Figure and FigureCanvasTkAgg for its
+whole life. New data with the same slices moves the existing wedges and
+labels; anything else clears and redraws the same axes. The Figure is
+created directly rather than through pyplot, so nothing accumulates in
+pyplot's figure registry over a long session.
+"""
+import math
+import tkinter as tk
+
+
+class PieChart(tk.Frame):
+    def __init__(self, master, figsize=(6, 6), startangle=90, colormap=None, autopct='%1.1f%%'):
+        super().__init__(master)
+        # Deferred: matplotlib is slow to import and only needed once a chart is shown
+        from matplotlib import colormaps
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        self.startangle = startangle
+        self.autopct = autopct
+        self.colors = colormaps[colormap].colors if colormap else None
+
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+
+        self._labels = None  # slice labels currently drawn, in order
+        self._wedges = self._texts = self._autotexts = ()
+
+    def set_data(self, data, title=None):
+        """Show `data`, a mapping or (label, value) pairs, as the pie's slices."""
+        items = list(data.items()) if hasattr(data, "items") else list(data)
+        labels = [str(label) for label, _ in items]
+        values = [float(value) for _, value in items]
+
+        if labels == self._labels and sum(values) > 0:
+            self._move_wedges(values)
+        else:
+            self._redraw(labels, values)
+        if title is not None:
+            self.ax.set_title(title)
+        self.canvas.draw_idle()
+
+    def _redraw(self, labels, values):
+        self.ax.clear()
+        if not values or sum(values) <= 0:
+            self.ax.text(0.5, 0.5, "No data", ha='center', va='center', transform=self.ax.transAxes)
+            self.ax.set_axis_off()
+            self._labels = None
+            self._wedges = self._texts = self._autotexts = ()
+            return
+
+        self._wedges, self._texts, self._autotexts = self.ax.pie(
+            values, labels=labels, autopct=self.autopct, startangle=self.startangle, colors=self.colors)
+        self.ax.axis('equal')
+        self._labels = labels
+
+    def _move_wedges(self, values):
+        # Same layout arithmetic as Axes.pie(): counter-clockwise from
+        # startangle, labels at 1.1 and percentages at 0.6 of the radius
+        total = sum(values)
+        theta1 = self.startangle
+        for wedge, text, autotext, value in zip(self._wedges, self._texts, self._autotexts, values):
+            theta2 = theta1 + 360 * value / total
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+
+            middle = math.radians((theta1 + theta2) / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            text.set_position((1.1 * x, 1.1 * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_position((0.6 * x, 0.6 * y))
+            autotext.set_text(self.autopct % (100 * value / total))
+            theta1 = theta2
+
+
+class ChartWindow(tk.Toplevel):
+    """A window holding one PieChart, reused for every analysis a module shows.
+
+    Closing it only hides it, so the next analysis updates the same figure
+    instead of opening a new one.
+    """
+
+    def __init__(self, master, title, **chart_options):
+        super().__init__(master)
+        self.title(title)
+        self.chart = PieChart(self, **chart_options)
+        self.chart.pack(fill='both', expand=True)
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+    def show(self, data, title=None):
+        self.chart.set_data(data, title)
+        self.deiconify()
+        self.lift()
@@ -0,0 +1,42 @@
+import os
+import configparser
+
+# config.ini lives next to the scripts so every window reads the same settings
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini")
+
+_config = None
+
+
+def load_config(path=CONFIG_FILE):
+    """Read config.ini and config.local.ini (if present), then apply PF_<SECTION>_<KEY> environment overrides."""
+    parser = configparser.ConfigParser(interpolation=None)
+    # The local file is git-ignored, for settings such as passwords that must not be committed
+    parser.read([path, os.path.splitext(path)[0] + ".local.ini"])
+
+    for name, value in os.environ.items():
+        if not name.startswith("PF_"):
+            continue
+        section, _, key = name[3:].lower().partition("_")
+        if not key:
+            continue
+        if not parser.has_section(section):
+            parser.add_section(section)
+        parser.set(section, key, value)
+
+    return parser
+
+
+def get_config():
+    global _config
+    if _config is None:
+        _config = load_config()
+    return _config
+
+
+def get_section(section, defaults=None):
+    """Return one section as a plain dict, filled in with `defaults` for missing keys."""
+    values = dict(defaults or {})
+    parser = get_config()
+    if parser.has_section(section):
+        values.update(parser.items(section))
+    return values
@@ -0,0 +1,83 @@
+"""The application's one entry point to the database.
+
+The backend is picked by `backend` in the [database] section of config.ini:
+mysql (mysql_backend, a pooled connection to a MySQL server) or sqlite
+(sqlite_backend, a local file). Both modules provide the same functions:
+get_connection(), Error, SERIAL_KEY, FOR_UPDATE, begin(), month_start(),
+upsert_add(), index_names() and column_names(), which cover the few
+places where their SQL differs.
+"""
+import importlib
+import threading
+from contextlib import contextmanager
+
+import querylog
+from config import get_section
+
+BACKENDS = {
+    "mysql": "mysql_backend",
+    "sqlite": "sqlite_backend",
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def __getattr__(name):
+    # db.Error is the selected backend's exception class; looked up lazily
+    # because mysql.connector is slow to import
+    if name == "Error":
+        return backend().Error
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def backend():
+    """Import the backend module named in config.ini on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = get_section("database", {"backend": "mysql"})["backend"].strip().lower()
+                if name not in BACKENDS:
+                    raise ValueError(f"Unknown database backend: {name!r} (expected one of {', '.join(BACKENDS)})")
+                _backend = importlib.import_module(BACKENDS[name])
+    return _backend
+
+
+def get_connection():
+    return backend().get_connection()
+
+
+def open_cursor(conn, **kwargs):
+    """Open a cursor on a connection, timed by querylog."""
+    return querylog.instrument(conn.cursor(**kwargs))
+
+
+@contextmanager
+def connection():
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def cursor(commit=False, **kwargs):
+    """Borrow a connection and yield a cursor on it.
+
+    With commit=True the work is committed when the block exits cleanly and
+    rolled back if it raises.
+    """
+    with connection() as conn:
+        cur = open_cursor(conn, **kwargs)
+        try:
+            yield cur
+            if commit:
+                conn.commit()
+        except Exception:
+            if commit:
+                conn.rollback()
+            raise
+        finally:
+            cur.close()
@@ -0,0 +1,26 @@
+import csv
+import gzip
+
+# Rows fetched from the server per round trip
+BATCH_SIZE = 1000
+
+
+def export_csv(store, path, filters=None, header=None, batch_size=BATCH_SIZE, progress=None):
+    """Write the store's rows matching `filters` to a CSV file; return the row count.
+
+    Rows are streamed from the server `batch_size` at a time and written
+    straight out, so memory use doesn't grow with the table. A path ending
+    in .gz is gzip-compressed. `header` defaults to the column names and
+    `progress(count)` is called after every batch.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    count = 0
+    with opener(path, 'wt', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(header or store.columns)
+        for rows in store.stream(filters, batch_size):
+            writer.writerows(rows)
+            count += len(rows)
+            if progress:
+                progress(count)
+    return count
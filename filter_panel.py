@@ -0,0 +1,138 @@
+"""A dialog that combines several filters into one search.
+
+Each row is a (column, operator, value) filter, e.g. category = Dining Out,
+payment mode = Online, date between 01-07-2024 and 30-09-2024 and amount
+> 500. The rows are ANDed by the store's query builder into a single
+parameterized query. Only "contains" becomes a LIKE; the other operators
+compare the bare column, so the table's (composite) indexes answer them.
+"""
+import tkinter as tk
+from datetime import date, datetime
+from decimal import Decimal
+from tkinter import ttk, messagebox
+
+# Operators offered for each column type, in menu order
+OPERATORS = {
+    str: ("=", "contains"),
+    Decimal: ("=", ">", ">=", "<", "<=", "between"),
+    int: ("=", ">", ">=", "<", "<=", "between"),
+    date: ("=", ">=", "<=", "between", "month"),
+}
+
+
+def parse_month(text):
+    """Return 'YYYY-MM' for a month typed as MM-YYYY or YYYY-MM."""
+    for fmt in ("%m-%Y", "%Y-%m"):
+        try:
+            return datetime.strptime(text, fmt).strftime("%Y-%m")
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid month: {text!r} (use MM-YYYY)")
+
+
+class FilterPanel(tk.Toplevel):
+    """Rows of filters over `columns` ({label: column}); Apply calls on_apply(filters).
+
+    Clear calls on_apply(None). Closing only hides the panel, so its rows are
+    still there the next time it is opened.
+    """
+
+    def __init__(self, master, store, columns, on_apply, title="Filters"):
+        super().__init__(master)
+        self.store = store
+        self.columns = columns
+        self.on_apply = on_apply
+        self.rows = []  # (frame, column_var, operator_var, value_var, to_var)
+
+        self.title(title)
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+        font_style = ('Arial', 12)
+        self.frame_rows = tk.Frame(self, padx=10, pady=10)
+        self.frame_rows.pack(fill='x')
+
+        frame_buttons = tk.Frame(self, padx=10, pady=10)
+        frame_buttons.pack(fill='x')
+        tk.Button(frame_buttons, text="Add Filter", command=self.add_row, font=font_style, width=12).pack(side='left', padx=5)
+        tk.Button(frame_buttons, text="Apply", command=self.apply, bg="blue", fg="white", font=font_style, width=12).pack(side='left', padx=5)
+        tk.Button(frame_buttons, text="Clear", command=self.clear, font=font_style, width=12).pack(side='left', padx=5)
+
+        self.add_row()
+
+    def add_row(self):
+        frame = tk.Frame(self.frame_rows)
+        frame.pack(fill='x', pady=2)
+
+        labels = list(self.columns)
+        column_var = tk.StringVar(self, value=labels[0])
+        operator_var = tk.StringVar(self)
+        value_var = tk.StringVar(self)
+        to_var = tk.StringVar(self)
+
+        column_cb = ttk.Combobox(frame, textvariable=column_var, values=labels, state="readonly", width=15)
+        column_cb.pack(side='left', padx=5)
+        operator_cb = ttk.Combobox(frame, textvariable=operator_var, state="readonly", width=10)
+        operator_cb.pack(side='left', padx=5)
+        tk.Entry(frame, textvariable=value_var, width=25).pack(side='left', padx=5)
+        tk.Label(frame, text="and").pack(side='left')
+        to_entry = tk.Entry(frame, textvariable=to_var, width=25)
+        to_entry.pack(side='left', padx=5)
+
+        row = (frame, column_var, operator_var, value_var, to_var)
+        tk.Button(frame, text="X", command=lambda: self.remove_row(row), width=2).pack(side='left', padx=5)
+
+        def column_changed(*_):
+            operators = OPERATORS[self.store.column_types[self.columns[column_var.get()]]]
+            operator_cb.config(values=operators)
+            if operator_var.get() not in operators:
+                operator_var.set(operators[0])
+
+        def operator_changed(*_):
+            # The second value is only used by "between"
+            to_entry.config(state='normal' if operator_var.get() == "between" else 'disabled')
+
+        column_cb.bind("<<ComboboxSelected>>", column_changed)
+        operator_var.trace_add("write", operator_changed)
+        column_changed()
+        self.rows.append(row)
+
+    def remove_row(self, row):
+        self.rows.remove(row)
+        row[0].destroy()
+        if not self.rows:
+            self.add_row()
+
+    def filters(self):
+        """Return the filters of every row with a value; raises ValueError naming a bad value."""
+        filters = []
+        for _, column_var, operator_var, value_var, to_var in self.rows:
+            column = self.columns[column_var.get()]
+            op = operator_var.get()
+            value = value_var.get().strip()
+            if not value:
+                continue
+            if op == "month":
+                value = parse_month(value)
+            elif op == "between":
+                value = (self.store.coerce(column, value), self.store.coerce(column, to_var.get().strip()))
+            elif op != "contains":
+                value = self.store.coerce(column, value)
+            filters.append((column, op, value))
+        return filters
+
+    def apply(self):
+        try:
+            filters = self.filters()
+        except ValueError as e:
+            messagebox.showerror("Filter Error", str(e), parent=self)
+            return
+        self.on_apply(filters or None)
+
+    def clear(self):
+        for row in list(self.rows):
+            self.remove_row(row)
+        self.on_apply(None)
+
+    def show(self):
+        self.deiconify()
+        self.lift()
@@ -0,0 +1,133 @@
+"""Next month's and next quarter's spending per category, projected from history.
+
+The last HISTORY_MONTHS complete months of every category are loaded from
+monthly_rollup as one (categories, months) array (see trends.load). With
+two or more years of history each category gets a seasonal offset per
+calendar month; the deseasonalized series is then exponentially smoothed.
+Smoothing is a weighted sum over months, so all categories are projected
+by a single matrix-vector product.
+
+Forecasts are cached per category until a write touches that category
+(query_cache.versions), the month rolls over or the query cache TTL passes.
+"""
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from typing import List, NamedTuple
+
+import numpy as np
+
+import trends
+import variance
+from cache import query_cache
+from store import CENT
+
+# Smoothing factor: the weight of the most recent month
+ALPHA = 0.3
+
+# Complete months of history each forecast is based on
+HISTORY_MONTHS = 36
+
+_cache = {}  # expense category -> (version, expires, Forecast)
+_cache_lock = threading.Lock()
+
+
+class Forecast(NamedTuple):
+    category: str
+    last_month: Decimal  # spent in the last complete month
+    next_month: Decimal
+    next_quarter: Decimal  # the three months after this one
+
+
+class BudgetForecast(NamedTuple):
+    category: str
+    next_month: Decimal
+    month_budget: Decimal
+    next_quarter: Decimal
+    quarter_budget: Decimal
+
+
+def project(history, months, targets, alpha=ALPHA):
+    """Forecast every row of `history` (categories x `months`) for each of the `targets` months.
+
+    Returns a (categories, len(targets)) array; negative projections are clipped to 0.
+    """
+    history = np.asarray(history, dtype=float)
+    count = history.shape[-1]
+    if not count:
+        return np.zeros(history.shape[:-1] + (len(targets),))
+    month_of_year = months.astype(int) % 12
+
+    # Seasonal offset of each calendar month from the mean, over whole years only
+    seasonal = np.zeros(history.shape[:-1] + (12,))
+    years = count // 12
+    if years >= 2:
+        recent = history[..., count - years * 12:]
+        means = recent.reshape(history.shape[:-1] + (years, 12)).mean(axis=-2)
+        seasonal[..., month_of_year[count - years * 12:][:12]] = means - recent.mean(axis=-1, keepdims=True)
+
+    # Simple exponential smoothing seeded with the first month:
+    # level = sum of alpha * (1 - alpha) ** age * value, the first month taking the rest
+    weights = alpha * (1 - alpha) ** np.arange(count - 1, -1, -1)
+    weights[0] = (1 - alpha) ** (count - 1)
+    level = (history - seasonal[..., month_of_year]) @ weights
+    return np.maximum(level[..., None] + seasonal[..., targets.astype(int) % 12], 0)
+
+
+def _decimal(value):
+    return Decimal(str(round(float(value), 2))).quantize(CENT)
+
+
+def expenses(today: date = None) -> List[Forecast]:
+    """Forecast every expense category with spending in the last HISTORY_MONTHS months."""
+    this_month = np.datetime64(today or date.today(), "M")
+    start = (this_month - HISTORY_MONTHS).astype("datetime64[D]").astype(date)
+    end = this_month.astype("datetime64[D]").astype(date)
+
+    # Taken before loading, so a write that lands meanwhile makes the entry stale
+    table_version, group_versions = query_cache.versions(trends.expenses.table)
+    now = time.monotonic()
+    data = trends.load(start, end)
+    categories = data.expense_categories
+    versions = {category: (this_month, table_version, group_versions.get(category, 0)) for category in categories}
+
+    with _cache_lock:
+        cached = {category: entry[2] for category, entry in _cache.items()
+                  if entry[0] == versions.get(category) and entry[1] > now}
+    stale = [i for i, category in enumerate(categories) if category not in cached]
+    if stale:
+        targets = this_month + np.arange(1, 4)
+        projected = project(data.expenses[stale], data.months, targets)
+        expires = now + query_cache.ttl
+        with _cache_lock:
+            for row, i in enumerate(stale):
+                category = categories[i]
+                cached[category] = Forecast(category, _decimal(data.expenses[i, -1]),
+                                            _decimal(projected[row, 0]), _decimal(projected[row].sum()))
+                _cache[category] = (versions[category], expires, cached[category])
+    return [cached[category] for category in categories]
+
+
+def budgets(today: date = None) -> List[BudgetForecast]:
+    """Expense forecasts summed per budget category, next to what is budgeted for the same months."""
+    this_month = np.datetime64(today or date.today(), "M")
+    next_month, after_next, quarter_end = ((this_month + i).astype("datetime64[D]").astype(date) for i in (1, 2, 4))
+
+    totals = {}  # budget category -> [next month, month budget, next quarter, quarter budget]
+    for row in expenses(today):
+        total = totals.setdefault(variance.map_category(row.category), [Decimal(0)] * 4)
+        total[0] += row.next_month
+        total[2] += row.next_quarter
+    for row in variance.report(next_month, quarter_end):
+        total = totals.setdefault(row.category, [Decimal(0)] * 4)
+        if row.month < after_next:
+            total[1] += row.budgeted
+        total[3] += row.budgeted
+    return [BudgetForecast(category, *total) for category, total in sorted(totals.items())]
+
+
+def reset():
+    """Forget every cached forecast."""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,32 @@
+"""A window listing spending forecasts (see forecast.py), one row per category."""
+import tkinter as tk
+from tkinter import ttk
+
+
+class ForecastWindow(tk.Toplevel):
+    """Shows rows of (category, amounts...) under `columns`; rows over budget are red."""
+
+    def __init__(self, master, title, columns, over_budget=None):
+        super().__init__(master)
+        self.columns = columns
+        self.over_budget = over_budget  # row -> True to highlight it
+        self.title(title)
+        self.geometry("900x600")
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show='headings')
+        scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        for col in self.columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=130 if col != "Category" else 300)
+        self.tree.tag_configure("over", foreground="red")
+        scrollbar.pack(side='right', fill='y')
+        self.tree.pack(fill='both', expand=True)
+
+    def show(self, rows):
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            tags = ("over",) if self.over_budget and self.over_budget(row) else ()
+            self.tree.insert('', 'end', values=(row[0],) + tuple(f"{value:.2f}" for value in row[1:]), tags=tags)
+        self.deiconify()
+        self.lift()
@@ -0,0 +1,128 @@
+import csv
+import gzip
+from decimal import Decimal
+
+import db
+
+# Header names the windows show (and save) mapped to table columns
+HEADER_ALIASES = {
+    "income_source": "source",
+    "payment": "payment_mode",
+}
+
+# Rows inserted and committed per transaction
+CHUNK_SIZE = 5000
+
+
+class ImportResult:
+    def __init__(self, path):
+        self.path = path
+        self.imported = 0
+        self.rejected = []  # (line number, raw row, reason)
+
+    def summary(self, limit=10):
+        text = f"Imported {self.imported} rows from {self.path}."
+        if self.rejected:
+            text += f"\n{len(self.rejected)} rows were rejected:"
+            for line, _, reason in self.rejected[:limit]:
+                text += f"\n  line {line}: {reason}"
+            if len(self.rejected) > limit:
+                text += f"\n  ... see {rejects_path(self.path)}"
+        return text
+
+
+def rejects_path(path):
+    return f"{path}.rejected.csv"
+
+
+def _column_positions(store, header):
+    positions = {}
+    for index, name in enumerate(header):
+        column = name.strip().lower().replace(" ", "_")
+        column = HEADER_ALIASES.get(column, column)
+        if column in store.columns and column != "id":
+            positions[column] = index
+
+    missing = [c for c in store.columns[1:] if c not in positions and c not in store.defaults]
+    if missing:
+        raise ValueError(f"The file has no column for: {', '.join(missing)}")
+    return positions
+
+
+def _parse(store, positions, row):
+    values = {column: row[index] for column, index in positions.items()}
+    for column, value in store.defaults.items():
+        if not values.get(column, "").strip():
+            values[column] = value
+    for column in store.columns[1:]:
+        if values[column] == "":
+            raise ValueError(f"{column} is empty")
+    record = store.normalize(store.record(id=None, **values))
+    # The windows only accept positive amounts and quantities
+    for column, value in zip(store.columns, record):
+        if column != "id" and isinstance(value, (Decimal, int)) and value < 0:
+            raise ValueError(f"{column} is negative")
+    # Rejected here rather than failing the batch it would be written in
+    store.check(record)
+    return record
+
+
+def import_csv(store, path, chunk_size=CHUNK_SIZE, progress=None):
+    """Stream a CSV file into the store's table.
+
+    The file is parsed row by row and written in multi-row batches of
+    `chunk_size`, each committed on its own, so memory and transaction size
+    stay bounded however long the file is. Columns are matched by header
+    name. Rows that fail to parse are skipped and reported (and written to
+    <path>.rejected.csv). A path ending in .gz is read as gzip.
+    `progress(result)` is called after every batch.
+    """
+    result = ImportResult(path)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'rt', newline='', encoding='utf-8-sig') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return result
+        positions = _column_positions(store, header)
+
+        with db.connection() as conn:
+            cursor = db.open_cursor(conn)
+            try:
+                batch = []
+                for line, row in enumerate(reader, start=2):
+                    if not any(field.strip() for field in row):
+                        continue
+                    try:
+                        batch.append(_parse(store, positions, row))
+                    except (ValueError, IndexError) as e:
+                        result.rejected.append((line, row, str(e) or type(e).__name__))
+                        continue
+
+                    if len(batch) >= chunk_size:
+                        _flush(store, conn, cursor, batch, result, progress)
+                        batch = []
+                if batch:
+                    _flush(store, conn, cursor, batch, result, progress)
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    if result.rejected:
+        with open(rejects_path(path), 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Line", "Reason"] + header)
+            for line, row, reason in result.rejected:
+                writer.writerow([line, reason] + row)
+    return result
+
+
+def _flush(store, conn, cursor, batch, result, progress):
+    store.write_batch(cursor, batch)
+    conn.commit()
+    store.invalidate(batch)
+    result.imported += len(batch)
+    if progress:
+        progress(result)
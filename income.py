@@ -1,240 +1,305 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import mysql.connector
 from datetime import datetime
-import matplotlib.pyplot as plt
-
-# Database Connection
-def create_connection():
-    try:
-        return mysql.connector.connect(
-            host="localhost",  # Change to your MySQL server
-            user="root",       # Replace with your username
-            password="Antim@123",  # Replace with your password
-            database="Personal_Finance"  # Updated database name
-        )
-    except mysql.connector.Error as e:
-        messagebox.showerror("Database Error", f"Failed to connect to database: {e}")
-        return None
-
-db = create_connection()
-if db is None:
-    exit()
-
-cursor = db.cursor()
-
-# Functions
-def add_income():
-    source = source_var.get()
-    amount = amount_var.get()
-    income_type = income_type_var.get()
-    income_date = date_var.get()
-
-    if not amount.isdigit() or float(amount) <= 0:
-        messagebox.showerror("Input Error", "Amount must be a positive number.")
-        return
-
-    if source and income_type and income_date:
-        try:
-            query = "INSERT INTO income (source, type, amount, date) VALUES (%s, %s, %s, %s)"
-            cursor.execute(query, (source, income_type, float(amount), income_date))
-            db.commit()
-            load_data()  # Refresh treeview
-            reset_fields()
-            messagebox.showinfo("Success", "Income added successfully!")
-        except Exception as e:
-            messagebox.showerror("Database Error", f"Failed to add income: {e}")
-    else:
-        messagebox.showerror("Input Error", "All fields are required.")
-
-def delete_income():
-    selected_item = tree.selection()
-    if not selected_item:
-        messagebox.showerror("Selection Error", "No item selected to delete.")
-        return
-
-    try:
-        item = tree.item(selected_item)
-        record_id = item['values'][0]
-        cursor.execute("DELETE FROM income WHERE id = %s", (record_id,))
-        db.commit()
-        load_data()  # Refresh treeview
-        messagebox.showinfo("Success", "Income deleted successfully!")
-    except Exception as e:
-        messagebox.showerror("Database Error", f"Failed to delete income: {e}")
-
-def reset_fields():
-    source_var.set('')
-    amount_var.set('')
-    income_type_var.set('Salary')
-    date_var.set(datetime.now().strftime('%Y-%m-%d'))  # Reset to current date
-
-def load_data(search_query=None):
-    # Clear current entries in treeview
-    for item in tree.get_children():
-        tree.delete(item)
-
-    # Fetch from database
-    try:
-        if search_query:
-            cursor.execute(search_query)
-        else:
-            cursor.execute("SELECT id, source, type, amount, DATE_FORMAT(date, '%Y-%m-%d') FROM income")
-        rows = cursor.fetchall()
-        for row in rows:
-            tree.insert('', 'end', values=row)
-        calculate_total_income()
-    except Exception as e:
-        messagebox.showerror("Database Error", f"Failed to load data: {e}")
-
-def calculate_total_income():
-    total_income = 0
-    for child in tree.get_children():
-        values = tree.item(child, 'values')
-        total_income += float(values[3])
-
-    total_income_label.config(text=f"Total Income: ₹{total_income:.2f}")
-
-def search_by_month():
-    month_year = month_var.get().strip()
-    if not month_year:
-        messagebox.showerror("Input Error", "Please enter a valid month (YYYY-MM).")
-        return
-
-    try:
-        query = f"SELECT id, source, type, amount, DATE_FORMAT(date, '%Y-%m-%d') FROM income WHERE DATE_FORMAT(date, '%Y-%m') = '{month_year}'"
-        load_data(query)
-    except Exception as e:
-        messagebox.showerror("Database Error", f"Failed to search data: {e}")
-
-def show_this_month():
-    current_month = datetime.now().strftime('%Y-%m')
-    try:
-        query = f"SELECT id, source, type, amount, DATE_FORMAT(date, '%Y-%m-%d') FROM income WHERE DATE_FORMAT(date, '%Y-%m') = '{current_month}'"
-        load_data(query)
-    except Exception as e:
-        messagebox.showerror("Database Error", f"Failed to load this month's data: {e}")
-        
-
-
-def analyze_this_month():
-    """Analyze and display this month's income distribution in a pie chart."""
-    current_month = datetime.now().strftime('%Y-%m')
-    try:
-        query = f"SELECT type, SUM(amount) FROM income WHERE DATE_FORMAT(date, '%Y-%m') = '{current_month}' GROUP BY type"
-        cursor.execute(query)
-        data = cursor.fetchall()
-        if data:
-            labels = [row[0] for row in data]
-            sizes = [row[1] for row in data]
-            plt.figure(figsize=(8, 6))
-            plt.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=140, colors=plt.cm.Paired.colors)
-            plt.title("Income Distribution for This Month")
-            plt.show()
+from decimal import Decimal
+from functools import partial
+import startup
+from recurring_window import RecurringWindow, catch_up
+from store import Income, IncomeStore, date_range, month_range
+from store_window import StoreWindow
+from charts import ChartWindow
+from virtual_table import VirtualTable
+from worker import Worker
+
+store = IncomeStore()
+
+
+class IncomeWindow(StoreWindow, tk.Toplevel):
+    """The Income Management window; opened from index.py or run on its own."""
+
+    store = store
+    noun = "income"
+
+    def __init__(self, master=None):
+        super().__init__(master)
+
+        # Filters behind the rows currently shown, and the total of those rows
+        self.current_filters = None
+        self.total_income = Decimal(0)
+
+        # Window the analysis charts are drawn in (created on first use)
+        self.analysis_window = None
+        self.recurring_window = None  # Recurring income rules (created on first use)
+
+        self.title("Income Management System")
+        self.attributes('-fullscreen', True)  # Fullscreen mode
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Runs the database calls so the window stays responsive
+        self.worker = Worker(self, on_busy=self.show_busy)
+
+        self.build()
+        startup.mark("income: window built")
+
+        # Create the table (and its indexes) on first run, then load the
+        # rows; both run on the worker so the window paints straight away
+        self.worker.submit(store.ensure_table, on_done=lambda _: self.load_data(), on_error=self.connect_failed)
+
+    # Functions
+    def fields_record(self):
+        """The income typed into the input fields, or None after telling the user what is wrong."""
+        source = self.source_var.get()
+        amount = self.amount_var.get()
+        income_type = self.income_type_var.get()
+        income_date = self.date_var.get()
+
+        if not amount.isdigit() or float(amount) <= 0:
+            messagebox.showerror("Input Error", "Amount must be a positive number.", parent=self)
+            return None
+
+        if not (source and income_type and income_date):
+            messagebox.showerror("Input Error", "All fields are required.", parent=self)
+            return None
+        return Income(None, source, income_type, amount, income_date)
+
+    def add_income(self):
+        record = self.fields_record()
+        if record is None:
+            return
+
+        def added(record):
+            if store.matches(record, self.current_filters):
+                self.table.add_row(record)  # Show just the new row
+                self.adjust_total_income(record.amount)
+            self.reset_fields()
+            messagebox.showinfo("Success", "Income added successfully!", parent=self)
+
+        self.worker.submit(store.insert, record, on_done=added,
+                           on_error=lambda e: messagebox.showerror("Database Error", f"Failed to add income: {e}", parent=self))
+
+    def show_recurring(self):
+        # Salary and other income entered once and added every period
+        if self.recurring_window is None:
+            self.recurring_window = RecurringWindow(self, store, self.fields_record, self.load_data, "Recurring Income")
         else:
-            messagebox.showinfo("Analysis", "No income data available for this month.")
-    except Exception as e:
-        messagebox.showerror("Analysis Error", f"Failed to analyze this month's income: {e}")
-
-def analyze_all():
-    """Analyze and display all-time income distribution in a pie chart."""
-    try:
-        query = "SELECT type, SUM(amount) FROM income GROUP BY type"
-        cursor.execute(query)
-        data = cursor.fetchall()
-        if data:
-            labels = [row[0] for row in data]
-            sizes = [row[1] for row in data]
-            plt.figure(figsize=(8, 6))
-            plt.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=140, colors=plt.cm.Paired.colors)
-            plt.title("All-Time Income Distribution")
-            plt.show()
-        else:
-            messagebox.showinfo("Analysis", "No income data available.")
-    except Exception as e:
-        messagebox.showerror("Analysis Error", f"Failed to analyze all-time income: {e}")
-
-
-def exit_application():
-    if messagebox.askyesno("Exit", "Are you sure you want to exit?"):
-        root.destroy()
-
-# Main Window
-root = tk.Tk()
-root.title("Income Management System")
-root.attributes('-fullscreen', True)  # Fullscreen mode
-
-# Input Section
-frame_input = tk.Frame(root, padx=10, pady=10)
-frame_input.pack(fill='x')
-
-tk.Label(frame_input, text="Income Source: ").grid(row=0, column=0, padx=5, pady=5)
-source_var = tk.StringVar()
-tk.Entry(frame_input, textvariable=source_var, width=20).grid(row=0, column=1, padx=5, pady=5)
-
-tk.Label(frame_input, text="Amount: ").grid(row=0, column=2, padx=5, pady=5)
-amount_var = tk.StringVar()
-tk.Entry(frame_input, textvariable=amount_var, width=20).grid(row=0, column=3, padx=5, pady=5)
-
-tk.Label(frame_input, text="Type: ").grid(row=0, column=4, padx=5, pady=5)
-income_type_var = tk.StringVar(value="Salary")
-ttk.Combobox(
-    frame_input,
-    textvariable=income_type_var,
-    values=["Salary", "Business", "Investments", "Freelancing", "Other"],
-    state="readonly",
-    width=15
-).grid(row=0, column=5, padx=5, pady=5)
-
-tk.Label(frame_input, text="Date (YYYY-MM-DD): ").grid(row=0, column=6, padx=5, pady=5)
-date_var = tk.StringVar(value=datetime.now().strftime('%Y-%m-%d'))  # Default to current date
-tk.Entry(frame_input, textvariable=date_var, width=15).grid(row=0, column=7, padx=5, pady=5)
-
-tk.Button(frame_input, text="Add Income", command=add_income, bg="green", fg="white", width=12).grid(row=0, column=8, padx=5, pady=5)
-
-# Search Section
-frame_search = tk.Frame(root, padx=10, pady=10)
-frame_search.pack(fill='x')
-
-tk.Label(frame_search, text="Search Month (YYYY-MM): ").grid(row=0, column=0, padx=5, pady=5)
-month_var = tk.StringVar()
-tk.Entry(frame_search, textvariable=month_var, width=20).grid(row=0, column=1, padx=5, pady=5)
-tk.Button(frame_search, text="Search by Month", command=search_by_month, bg="blue", fg="white", width=15).grid(row=0, column=2, padx=5, pady=5)
-tk.Button(frame_search, text="Show This Month", command=show_this_month, bg="blue", fg="white", width=15).grid(row=0, column=3, padx=5, pady=5)
-
-tk.Button(frame_search, text="Reset", command=lambda: [month_var.set(''), load_data()], bg="grey", fg="white", width=10).grid(row=0, column=4, padx=5, pady=5)
-
-# Output Section
-frame_output = tk.Frame(root, padx=10, pady=10)
-frame_output.pack(fill='both', expand=True)
-
-columns = ('ID', 'Income Source', 'Type', 'Amount', 'Date')
-tree = ttk.Treeview(frame_output, columns=columns, show='headings', height=15)
-tree.heading('ID', text='ID')
-tree.heading('Income Source', text='Income Source')
-tree.heading('Type', text='Type')
-tree.heading('Amount', text='Amount')
-tree.heading('Date', text='Date')
-tree.column('ID', width=50)
-tree.pack(fill='both', expand=True)
-
-# Summary Section
-frame_summary = tk.Frame(root, padx=10, pady=10)
-frame_summary.pack(fill='x')
-
-total_income_label = tk.Label(frame_summary, text="Total Income: ₹0.00", font=('Arial', 12), fg="green")
-total_income_label.pack(side='left', padx=10)
-
-# Delete and Exit Buttons
-tk.Button(root, text="Delete Income", command=delete_income, bg="red", fg="white", width=12).place(x=970, y=15)
-tk.Button(root, text="Exit", command=exit_application, bg="black", fg="white", width=12).place(x=root.winfo_screenwidth()-110, y=10)
-
-# Buttons for Analysis
-tk.Button(frame_search, text="Analyze This Month", command=analyze_this_month, bg="purple", fg="white", width=15).grid(row=0, column=5, padx=5, pady=5)
-tk.Button(frame_search, text="Analyze All", command=analyze_all, bg="purple", fg="white", width=15).grid(row=0, column=6, padx=5, pady=5)
-
-# Load data on startup
-load_data()
-
-# Mainloop
-root.mainloop()
+            self.recurring_window.show()
+
+    def delete_income(self):
+        selected_item = self.tree.selection()
+        if not selected_item:
+            messagebox.showerror("Selection Error", "No item selected to delete.", parent=self)
+            return
+
+        item = self.tree.item(selected_item)
+        record_id = item['values'][0]
+
+        def deleted(record):
+            self.table.remove_row(record_id)  # Drop just that row
+            if record and store.matches(record, self.current_filters):
+                self.adjust_total_income(-record.amount)
+            messagebox.showinfo("Success", "Income deleted successfully!", parent=self)
+
+        self.worker.submit(store.delete, record_id, on_done=deleted,
+                           on_error=lambda e: messagebox.showerror("Database Error", f"Failed to delete income: {e}", parent=self))
+
+    def reset_fields(self):
+        self.source_var.set('')
+        self.amount_var.set('')
+        self.income_type_var.set('Salary')
+        self.date_var.set(datetime.now().strftime('%Y-%m-%d'))  # Reset to current date
+
+    def fetch_view(self, filters):
+        # First page of the matching income and its total; the table only holds
+        # a window of rows, so the total is summed in SQL
+        return store.page(filters, limit=self.table.page_size), store.total(filters)
+
+    def load_data(self, filters=None):
+        # Page the matching income into the table; a newer search supersedes this one
+        def loaded(view):
+            rows, self.total_income = view
+            self.current_filters = filters
+            self.table.load(partial(store.page, filters), rows)
+            self.show_total_income()
+
+        self.worker.submit(self.fetch_view, filters, key="view", on_done=loaded,
+                           on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load data: {e}", parent=self))
+
+    def adjust_total_income(self, delta):
+        # Apply one added/deleted row to the running total
+        self.total_income += delta
+        self.show_total_income()
+
+    def show_total_income(self):
+        self.total_income_label.config(text=f"Total Income: ₹{self.total_income:.2f}")
+
+    def search_by_month(self):
+        month_year = self.month_var.get().strip()
+        try:
+            month_range(month_year)
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter a valid month (YYYY-MM).", parent=self)
+            return
+        self.load_data([("date", "month", month_year)])
+
+    def search_by_range(self):
+        start_date = self.start_date_var.get().strip() or None
+        end_date = self.end_date_var.get().strip() or None
+        if not start_date and not end_date:
+            messagebox.showerror("Input Error", "Please enter a start and/or end date (YYYY-MM-DD).", parent=self)
+            return
+
+        try:
+            filters = date_range(start_date, end_date)
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter valid dates (YYYY-MM-DD).", parent=self)
+            return
+        self.load_data(filters)
+
+    def show_this_month(self):
+        current_month = datetime.now().strftime('%Y-%m')
+        self.load_data([("date", "month", current_month)])
+
+    def reset_search(self):
+        self.month_var.set('')
+        self.start_date_var.set('')
+        self.end_date_var.set('')
+        self.load_data()
+
+    def analyze_this_month(self):
+        """Analyze and display this month's income distribution in a pie chart."""
+        current_month = datetime.now().strftime('%Y-%m')
+
+        def plot(data):
+            if data:
+                self.show_analysis(data, "Income Distribution for This Month")
+            else:
+                messagebox.showinfo("Analysis", "No income data available for this month.", parent=self)
+
+        self.worker.submit(store.category_totals, *month_range(current_month), key="analysis", on_done=plot,
+                           on_error=lambda e: messagebox.showerror("Analysis Error", f"Failed to analyze this month's income: {e}", parent=self))
+
+    def analyze_all(self):
+        """Analyze and display all-time income distribution in a pie chart."""
+        def plot(data):
+            if data:
+                self.show_analysis(data, "All-Time Income Distribution")
+            else:
+                messagebox.showinfo("Analysis", "No income data available.", parent=self)
+
+        self.worker.submit(store.category_totals, key="analysis", on_done=plot,
+                           on_error=lambda e: messagebox.showerror("Analysis Error", f"Failed to analyze all-time income: {e}", parent=self))
+
+    def show_analysis(self, data, title):
+        # Every analysis reuses one chart window and figure
+        if self.analysis_window is None:
+            self.analysis_window = ChartWindow(self, "Income Analysis", figsize=(8, 6), startangle=140, colormap="Paired")
+        self.analysis_window.show(data, title)
+
+    def exit_application(self):
+        if messagebox.askyesno("Exit", "Are you sure you want to exit?", parent=self):
+            self.close()
+
+    def build(self):
+        # Menu Bar
+        menu_bar = tk.Menu(self)
+        self.config(menu=menu_bar)
+
+        file_menu = tk.Menu(menu_bar, tearoff=0)
+        menu_bar.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="Save File", command=self.save_to_file)
+        file_menu.add_command(label="Import File", command=self.import_from_file)
+        file_menu.add_separator()
+        file_menu.add_command(label="Exit", command=self.exit_application)
+
+        # Input Section
+        frame_input = tk.Frame(self, padx=10, pady=10)
+        frame_input.pack(fill='x')
+
+        tk.Label(frame_input, text="Income Source: ").grid(row=0, column=0, padx=5, pady=5)
+        self.source_var = tk.StringVar(self)
+        tk.Entry(frame_input, textvariable=self.source_var, width=20).grid(row=0, column=1, padx=5, pady=5)
+
+        tk.Label(frame_input, text="Amount: ").grid(row=0, column=2, padx=5, pady=5)
+        self.amount_var = tk.StringVar(self)
+        tk.Entry(frame_input, textvariable=self.amount_var, width=20).grid(row=0, column=3, padx=5, pady=5)
+
+        tk.Label(frame_input, text="Type: ").grid(row=0, column=4, padx=5, pady=5)
+        self.income_type_var = tk.StringVar(self, value="Salary")
+        ttk.Combobox(
+            frame_input,
+            textvariable=self.income_type_var,
+            values=["Salary", "Business", "Investments", "Freelancing", "Other"],
+            state="readonly",
+            width=15
+        ).grid(row=0, column=5, padx=5, pady=5)
+
+        tk.Label(frame_input, text="Date (YYYY-MM-DD): ").grid(row=0, column=6, padx=5, pady=5)
+        self.date_var = tk.StringVar(self, value=datetime.now().strftime('%Y-%m-%d'))  # Default to current date
+        tk.Entry(frame_input, textvariable=self.date_var, width=15).grid(row=0, column=7, padx=5, pady=5)
+
+        tk.Button(frame_input, text="Add Income", command=self.add_income, bg="green", fg="white", width=12).grid(row=0, column=8, padx=5, pady=5)
+        tk.Button(frame_input, text="Recurring...", command=self.show_recurring, bg="dark green", fg="white", width=12).grid(row=0, column=9, padx=5, pady=5)
+
+        # Search Section
+        frame_search = tk.Frame(self, padx=10, pady=10)
+        frame_search.pack(fill='x')
+
+        tk.Label(frame_search, text="Search Month (YYYY-MM): ").grid(row=0, column=0, padx=5, pady=5)
+        self.month_var = tk.StringVar(self)
+        tk.Entry(frame_search, textvariable=self.month_var, width=20).grid(row=0, column=1, padx=5, pady=5)
+        tk.Button(frame_search, text="Search by Month", command=self.search_by_month, bg="blue", fg="white", width=15).grid(row=0, column=2, padx=5, pady=5)
+        tk.Button(frame_search, text="Show This Month", command=self.show_this_month, bg="blue", fg="white", width=15).grid(row=0, column=3, padx=5, pady=5)
+
+        tk.Button(frame_search, text="Reset", command=self.reset_search, bg="grey", fg="white", width=10).grid(row=0, column=4, padx=5, pady=5)
+
+        tk.Label(frame_search, text="From (YYYY-MM-DD): ").grid(row=1, column=0, padx=5, pady=5)
+        self.start_date_var = tk.StringVar(self)
+        tk.Entry(frame_search, textvariable=self.start_date_var, width=20).grid(row=1, column=1, padx=5, pady=5)
+        tk.Label(frame_search, text="To (YYYY-MM-DD): ").grid(row=1, column=2, padx=5, pady=5)
+        self.end_date_var = tk.StringVar(self)
+        tk.Entry(frame_search, textvariable=self.end_date_var, width=15).grid(row=1, column=3, padx=5, pady=5)
+        tk.Button(frame_search, text="Search by Range", command=self.search_by_range, bg="blue", fg="white", width=15).grid(row=1, column=4, padx=5, pady=5)
+
+        # Output Section
+        frame_output = tk.Frame(self, padx=10, pady=10)
+        frame_output.pack(fill='both', expand=True)
+
+        self.columns = ('ID', 'Income Source', 'Type', 'Amount', 'Date')
+        self.table = VirtualTable(frame_output, self.columns, store.key_of, self.worker, height=15)
+        self.tree = self.table.tree
+        self.tree.heading('ID', text='ID')
+        self.tree.heading('Income Source', text='Income Source')
+        self.tree.heading('Type', text='Type')
+        self.tree.heading('Amount', text='Amount')
+        self.tree.heading('Date', text='Date')
+        self.tree.column('ID', width=50)
+        self.table.pack(fill='both', expand=True)
+
+        # Summary Section
+        frame_summary = tk.Frame(self, padx=10, pady=10)
+        frame_summary.pack(fill='x')
+
+        self.total_income_label = tk.Label(frame_summary, text="Total Income: ₹0.00", font=('Arial', 12), fg="green")
+        self.total_income_label.pack(side='left', padx=10)
+
+        self.status_label = tk.Label(frame_summary, text="", font=('Arial', 12), fg="grey")
+        self.status_label.pack(side='right', padx=10)
+
+        # Delete and Exit Buttons
+        tk.Button(self, text="Delete Income", command=self.delete_income, bg="red", fg="white", width=12).place(x=970, y=15)
+        tk.Button(self, text="Exit", command=self.exit_application, bg="black", fg="white", width=12).place(x=self.winfo_screenwidth()-110, y=10)
+
+        # Buttons for Analysis
+        tk.Button(frame_search, text="Analyze This Month", command=self.analyze_this_month, bg="purple", fg="white", width=15).grid(row=0, column=5, padx=5, pady=5)
+        tk.Button(frame_search, text="Analyze All", command=self.analyze_all, bg="purple", fg="white", width=15).grid(row=0, column=6, padx=5, pady=5)
+
+
+
+if __name__ == "__main__":
+    # Run on its own: a hidden root that quits when the window closes
+    root = tk.Tk()
+    root.withdraw()
+    window = IncomeWindow(root)
+    window.bind("<Destroy>", lambda event: root.destroy() if event.widget is window else None)
+    catch_up(window.worker, lambda _: window.load_data(), window)
+    root.mainloop()
@@ -1,15 +1,124 @@
+import startup  # First, so --profile-startup times everything after it
+
+import importlib
 import tkinter as tk
-import subprocess
+from tkinter import messagebox
+
+from worker import Worker
+
+startup.mark("import tkinter")
+
+# name -> (module, window class). Modules are imported on first open so the
+# home window doesn't wait for them (or for matplotlib / mysql.connector).
+MODULES = {
+    "income": ("income", "IncomeWindow"),
+    "expense": ("Expence", "ExpenseWindow"),
+    "budget": ("Budget", "BudgetWindow"),
+    "trends": ("trend_window", "TrendWindow"),
+}
+
+# The open module windows, so a second click focuses the existing one.
+# They all run in this process and share one connection pool and query cache.
+windows = {}
 
+# Table -> the module showing it, reloaded after recurring entries are added
+TABLES = {"income": "income", "expenses": "expense", "budgets": "budget"}
+
+
+def open_module(name):
+    window = windows.get(name)
+    if window is not None and window.winfo_exists():
+        window.deiconify()
+        window.lift()
+        window.focus_force()
+        return window
+
+    module_name, class_name = MODULES[name]
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:  # e.g. no numpy or matplotlib; see requirements.txt
+        messagebox.showerror("Missing Package", f"Can't open {name}: {e}\nInstall the packages in requirements.txt.", parent=root)
+        return None
+    startup.mark(f"import {module_name}")
+    window = getattr(module, class_name)(root)
+    windows[name] = window
+    return window
 
 def open_income_gui():
-    subprocess.Popen(["python", "income.py"])
+    open_module("income")
 
 def open_expense_gui():
-    subprocess.Popen(["python", "Expence.py"])
+    open_module("expense")
 
 def open_budget_gui():
-    subprocess.Popen(["python", "Budget.py"])
+    open_module("budget")
+
+def open_trends_gui():
+    open_module("trends")
+
+def catch_up_recurring():
+    # Add the recurring entries that fell due since the last run, once per
+    # process and for every window; imported on the worker so the home
+    # window doesn't wait for the database driver
+    def run():
+        import recurring
+        return recurring.run()
+
+    def written(counts):
+        # recurring.run() already dropped the cached reads and search indexes
+        # of the tables it wrote; show the new rows in the open windows
+        if not counts:
+            return
+        for name in {TABLES[table] for table in counts} | {"trends"}:
+            window = windows.get(name)
+            if window is None or not window.winfo_exists():
+                continue
+            if name == "trends":
+                window.refresh()
+            else:
+                window.load_data()
+
+    worker.submit(run, on_done=written,
+                  on_error=lambda e: messagebox.showerror("Recurring Entries", f"Failed to add recurring entries: {e}", parent=root))
+
+def profile_startup(name=None):
+    # Runs from the event loop once the home window exists: wait for each
+    # window to be painted (and a module's first rows to load), then report
+    def finish(phase=None):
+        if phase:
+            startup.mark(phase)
+        startup.report()
+        root.destroy()
+
+    root.wait_visibility()
+    root.update_idletasks()
+    startup.mark("home window painted")
+
+    if name is None:
+        finish()
+        return
+
+    window = open_module(name)
+    if window is None:  # a package it needs is missing
+        finish(f"{name}: not opened")
+        return
+    try:
+        window.wait_visibility()
+        window.update_idletasks()
+    except tk.TclError:  # closed before it was painted, e.g. by connect_failed
+        finish(f"{name}: window closed")
+        return
+    startup.mark(f"{name}: window painted")
+
+    def wait_for_data():
+        # A window closed on an error stops its worker, which then stays busy
+        if not window.winfo_exists():
+            finish(f"{name}: window closed")
+        elif window.worker.busy:
+            root.after(5, wait_for_data)
+        else:
+            finish(f"{name}: first rows loaded")
+    wait_for_data()
 
 # Main Home Window
 root = tk.Tk()
@@ -23,6 +132,18 @@ tk.Label(root, text="Financial Management System", font=("Arial", 18, "bold")).p
 tk.Button(root, text="Income Management", command=open_income_gui, font=("Arial", 14), bg="green", fg="white", width=20).pack(pady=10)
 tk.Button(root, text="Expense Management", command=open_expense_gui, font=("Arial", 14), bg="blue", fg="white", width=20).pack(pady=10)
 tk.Button(root, text="Budget Planning", command=open_budget_gui, font=("Arial", 14), bg="orange", fg="white", width=20).pack(pady=10)
+tk.Button(root, text="Trend Analysis", command=open_trends_gui, font=("Arial", 14), bg="purple", fg="white", width=20).pack(pady=10)
+
+startup.mark("home window built")
+
+# Runs the recurring catch-up off the Tk thread
+worker = Worker(root)
+
+if startup.enabled:
+    root.after(0, profile_startup, startup.argument())
+else:
+    # Not while profiling, where its writes would be timed as window startup
+    root.after(0, catch_up_recurring)
 
 # Mainloop
 root.mainloop()
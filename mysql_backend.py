@@ -0,0 +1,142 @@
+"""MySQL backend: a pooled mysql.connector connection to a MySQL server."""
+import time
+import threading
+
+from config import get_section
+
+# Used when config.ini is missing a key
+DEFAULTS = {
+    "host": "localhost",
+    "port": "3306",
+    "user": "root",
+    "password": "",
+    "database": "Personal_Finance",
+    "pool_name": "personal_finance",
+    "pool_size": "5",
+    "health_check_interval": "30",
+    "checkout_timeout": "10",
+}
+
+# Column definition of an auto-numbered primary key
+SERIAL_KEY = "INT AUTO_INCREMENT PRIMARY KEY"
+
+# Appended to a SELECT that reads rows about to be changed in the same transaction
+FOR_UPDATE = " FOR UPDATE"
+
+_pool = None
+_pool_lock = threading.Lock()
+_settings = None
+
+# Last time each physical connection was known to be alive (monotonic seconds)
+_last_alive = {}
+
+
+def __getattr__(name):
+    # mysql.connector is slow to import, so it is only loaded when the pool
+    # is first used (on a worker thread) or Error is looked up
+    if name == "Error":
+        import mysql.connector
+        return mysql.connector.Error
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_settings():
+    global _settings
+    if _settings is None:
+        _settings = get_section("mysql", DEFAULTS)
+    return _settings
+
+
+def get_pool():
+    """Create the shared connection pool on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from mysql.connector import pooling
+                settings = get_settings()
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name=settings["pool_name"],
+                    pool_size=int(settings["pool_size"]),
+                    pool_reset_session=True,
+                    host=settings["host"],
+                    port=int(settings["port"]),
+                    user=settings["user"],
+                    password=settings["password"],
+                    database=settings["database"],
+                )
+    return _pool
+
+
+def _check_health(conn):
+    # Ping connections that have been idle for a while so a connection the
+    # server dropped (wait_timeout, restart) is reopened before we use it.
+    settings = get_settings()
+    raw = getattr(conn, "_cnx", conn)
+    now = time.monotonic()
+    if now - _last_alive.get(id(raw), 0) > float(settings["health_check_interval"]):
+        conn.ping(reconnect=True, attempts=3, delay=0)
+    _last_alive[id(raw)] = now
+
+
+def get_connection():
+    """Check a connection out of the pool, waiting for one if the pool is exhausted.
+
+    Calling close() on the returned connection hands it back to the pool.
+    """
+    from mysql.connector import Error, pooling
+
+    pool = get_pool()
+    deadline = time.monotonic() + float(get_settings()["checkout_timeout"])
+    while True:
+        try:
+            conn = pool.get_connection()
+            break
+        except pooling.PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+    try:
+        _check_health(conn)
+    except Error:
+        conn.close()
+        raise
+    return conn
+
+
+def begin(cursor):
+    """Start a write transaction now; a no-op, as MySQL locks the rows read with FOR_UPDATE."""
+
+
+def month_start(column):
+    """SQL expression for the first day of the month of a DATE column."""
+    return f"DATE_FORMAT({column}, '%Y-%m-01')"
+
+
+def upsert_add(table, columns, key, add):
+    """INSERT one row of `columns`; if a row with the same `key` exists, add the `add` columns to it."""
+    updates = ", ".join(f"{column} = {column} + VALUES({column})" for column in add)
+    return (f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))}) "
+            f"ON DUPLICATE KEY UPDATE {updates}")
+
+
+def index_names(cursor, table):
+    """Return the lower-cased names of the indexes that exist on a table."""
+    cursor.execute(
+        "SELECT DISTINCT index_name FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s",
+        (table,),
+    )
+    return {row[0].lower() for row in cursor.fetchall()}
+
+
+def column_names(cursor, table):
+    """Return the lower-cased names of a table's columns."""
+    cursor.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = %s",
+        (table,),
+    )
+    return {row[0].lower() for row in cursor.fetchall()}
@@ -0,0 +1,212 @@
+"""Per-statement timings and a slow-query log.
+
+Every cursor handed out by db is wrapped in an InstrumentedCursor, which
+times execute() (DB time) separately from the fetch calls that follow it
+(fetch time) and counts the rows returned. Each finished statement is
+added to a latency histogram keyed by its shape: the SQL with whitespace
+collapsed and variable-length placeholder lists folded. Statements slower
+than slow_query_ms are appended to the slow-query log. The histograms are
+printed by dump(), at exit if dump_at_exit is set, and on SIGUSR1 where
+the platform has it.
+"""
+import atexit
+import bisect
+import os
+import re
+import signal
+import sys
+import threading
+import time
+
+from config import CONFIG_FILE, get_section
+
+DEFAULTS = {
+    "enabled": "yes",
+    "slow_query_ms": "200",
+    "slow_log": "slow_queries.log",
+    "dump_at_exit": "no",
+}
+
+# Upper bounds of the histogram buckets, in milliseconds
+BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_PLACEHOLDER_LIST = re.compile(r"%s(?:, %s)+")
+_CASE_ARMS = re.compile(r"(?:WHEN %s THEN %s ?)+")
+
+
+def statement_shape(query):
+    """Return the query with whitespace collapsed and placeholder lists folded.
+
+    IN (%s, %s, %s) and IN (%s) become the same shape, as do CASE
+    expressions with different numbers of WHEN arms.
+    """
+    shape = " ".join(query.split())
+    shape = _PLACEHOLDER_LIST.sub("%s, ...", shape)
+    return _CASE_ARMS.sub("WHEN ... ", shape)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last bucket is everything slower
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+
+    def add(self, ms, rows):
+        self.counts[bisect.bisect_left(BUCKETS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.rows += rows
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of calls."""
+        wanted = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= wanted:
+                return bound
+        return self.max_ms
+
+
+class QueryLog:
+    """Collects statement timings from InstrumentedCursors; safe to use from any thread."""
+
+    def __init__(self, slow_query_ms=200, slow_log=None):
+        self.slow_query_ms = slow_query_ms
+        self.slow_log = slow_log  # path, or None to not log slow statements
+        self.histograms = {}  # statement shape -> Histogram
+        self._lock = threading.Lock()
+
+    def record(self, query, params_count, rows, db_ms, fetch_ms):
+        shape = statement_shape(query)
+        ms = db_ms + fetch_ms
+        with self._lock:
+            histogram = self.histograms.get(shape)
+            if histogram is None:
+                histogram = self.histograms[shape] = Histogram()
+            histogram.add(ms, rows)
+            if self.slow_log and ms >= self.slow_query_ms:
+                with open(self.slow_log, "a", encoding="utf-8") as log:
+                    log.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} db={db_ms:.1f}ms fetch={fetch_ms:.1f}ms "
+                              f"rows={rows} params={params_count} thread={threading.current_thread().name} "
+                              f"{shape}\n")
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+
+    def dump(self, file=None):
+        """Print every statement's call count, latency percentiles and buckets, slowest total first."""
+        file = file or sys.stderr
+        with self._lock:
+            histograms = sorted(self.histograms.items(), key=lambda item: item[1].total_ms, reverse=True)
+            print(f"{'calls':>7} {'total ms':>10} {'mean':>8} {'p50<=':>7} {'p95<=':>7} {'max':>8} {'rows':>8}  statement",
+                  file=file)
+            for shape, h in histograms:
+                print(f"{h.count:7} {h.total_ms:10.1f} {h.total_ms / h.count:8.2f} {h.percentile(0.5):7g} "
+                      f"{h.percentile(0.95):7g} {h.max_ms:8.1f} {h.rows:8}  {shape}", file=file)
+                buckets = " ".join(f"<={bound:g}:{count}" for bound, count in zip(BUCKETS, h.counts) if count)
+                if h.counts[-1]:
+                    buckets += f" >{BUCKETS[-1]:g}:{h.counts[-1]}"
+                print(f"{'':7} ms buckets: {buckets}", file=file)
+
+
+class InstrumentedCursor:
+    """Wraps a DB-API cursor, reporting each statement to a QueryLog when the next one starts or the cursor closes."""
+
+    def __init__(self, cursor, log):
+        self._cursor = cursor
+        self._log = log
+        self._query = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _finish(self):
+        if self._query is not None:
+            rows = self._rows if self._fetched else max(self._cursor.rowcount, 0)
+            self._log.record(self._query, self._params_count, rows, self._db_ms, self._fetch_ms)
+            self._query = None
+
+    def _start(self, query, params_count):
+        self._finish()
+        self._query = query
+        self._params_count = params_count
+        self._rows = 0
+        self._fetched = False
+        self._fetch_ms = 0.0
+
+    def execute(self, query, params=()):
+        self._start(query, len(params or ()))
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(query, params)
+        finally:
+            self._db_ms = (time.perf_counter() - start) * 1000
+
+    def executemany(self, query, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        self._start(query, sum(len(params) for params in seq_of_params))
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, seq_of_params)
+        finally:
+            self._db_ms = (time.perf_counter() - start) * 1000
+
+    def _fetch(self, fetch, *args):
+        start = time.perf_counter()
+        try:
+            rows = fetch(*args)
+        finally:
+            self._fetch_ms += (time.perf_counter() - start) * 1000
+        self._fetched = True
+        return rows
+
+    def fetchone(self):
+        row = self._fetch(self._cursor.fetchone)
+        self._rows += row is not None
+        return row
+
+    def fetchmany(self, size):
+        rows = self._fetch(self._cursor.fetchmany, size)
+        self._rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._fetch(self._cursor.fetchall)
+        self._rows += len(rows)
+        return rows
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+
+def instrument(cursor):
+    """Wrap a cursor so its statements are timed, unless instrumentation is turned off."""
+    if query_log is None:
+        return cursor
+    return InstrumentedCursor(cursor, query_log)
+
+
+def _from_config():
+    settings = get_section("querylog", DEFAULTS)
+    if settings["enabled"].lower() not in ("1", "yes", "true", "on"):
+        return None
+    slow_log = settings["slow_log"].strip()
+    if slow_log:
+        slow_log = os.path.join(os.path.dirname(CONFIG_FILE), os.path.expanduser(slow_log))
+    log = QueryLog(float(settings["slow_query_ms"]), slow_log or None)
+    if settings["dump_at_exit"].lower() in ("1", "yes", "true", "on"):
+        atexit.register(log.dump)
+    if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+        # kill -USR1 <pid> prints the histograms of a running app
+        signal.signal(signal.SIGUSR1, lambda signum, frame: log.dump())
+    return log
+
+
+# Shared by every connection in the process (None when turned off)
+query_log = _from_config()
@@ -0,0 +1,203 @@
+"""Recurring expenses, income and budgets (rent, utilities, subscriptions...).
+
+A rule keeps a record template (every field but id and date) and repeats
+it every N months, weeks or days from its start date, optionally until an
+end date. run() writes every occurrence that has fallen due since the last
+run, for all rules, in one transaction with each store's write_batch, so
+catching up after months away is a single batch. Each rule's next_date
+moves past the occurrences it wrote in that same transaction, and only if
+no other run moved it first, so running again (or twice at once) never
+writes an occurrence twice.
+"""
+import calendar
+import json
+import threading
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional
+
+import db
+import search_index
+from store import BudgetStore, ExpenseStore, IncomeStore
+
+FREQUENCIES = ("monthly", "weekly", "days")
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS recurring_rules (
+        id {serial_key},
+        source VARCHAR(20) NOT NULL,
+        template TEXT NOT NULL,
+        frequency VARCHAR(10) NOT NULL,
+        every_n INT NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE,
+        next_date DATE NOT NULL
+    )
+'''
+# source is the table occurrences are written to; template is a JSON object
+# of the record's other fields; next_date is the first occurrence not written yet
+
+INDEXES = {"idx_recurring_rules_next_date": ("next_date",)}
+
+# Table -> the store its occurrences are written through
+STORES = {store.table: store for store in (ExpenseStore(), IncomeStore(), BudgetStore())}
+
+_created = False
+_created_lock = threading.Lock()
+
+
+class Rule(NamedTuple):
+    id: Optional[int]
+    source: str
+    template: dict
+    frequency: str  # one of FREQUENCIES
+    every_n: int  # every N months, weeks or days
+    start_date: date
+    end_date: Optional[date]
+    next_date: date
+
+    def describe(self):
+        unit = {"monthly": "month", "weekly": "week", "days": "day"}[self.frequency]
+        return f"Every {unit}" if self.every_n == 1 else f"Every {self.every_n} {unit}s"
+
+
+COLUMNS = ", ".join(Rule._fields)
+
+
+def _rule(row):
+    rule = Rule._make(row)
+    return rule._replace(template=json.loads(rule.template))
+
+
+def ensure_table():
+    """Create recurring_rules (and its index) once per process."""
+    global _created
+    with _created_lock:
+        if _created:
+            return
+        with db.cursor(commit=True) as cursor:
+            cursor.execute(SCHEMA.format(serial_key=db.backend().SERIAL_KEY))
+            existing = db.backend().index_names(cursor, "recurring_rules")
+            for name, columns in INDEXES.items():
+                if name.lower() not in existing:
+                    cursor.execute(f"CREATE INDEX {name} ON recurring_rules ({', '.join(columns)})")
+        _created = True
+    for store in STORES.values():
+        store.ensure_table()
+
+
+def occurrence(rule, k):
+    """The date of a rule's k-th occurrence (the 0th is its start date).
+
+    Monthly rules keep the start date's day, or the month's last day when
+    it is shorter (a rule starting on the 31st falls on Feb 28/29).
+    """
+    if rule.frequency == "monthly":
+        year, month = divmod(rule.start_date.month - 1 + k * rule.every_n, 12)
+        year += rule.start_date.year
+        return date(year, month + 1, min(rule.start_date.day, calendar.monthrange(year, month + 1)[1]))
+    days = rule.every_n * (7 if rule.frequency == "weekly" else 1)
+    return rule.start_date + timedelta(days=k * days)
+
+
+def due(rule, until):
+    """Return (occurrence dates from next_date through `until` and the end date, the next date after them)."""
+    # Jump close to next_date, then step onto it
+    if rule.frequency == "monthly":
+        elapsed = (rule.next_date.year - rule.start_date.year) * 12 + rule.next_date.month - rule.start_date.month
+        k = max(elapsed // rule.every_n - 1, 0)
+    else:
+        k = (rule.next_date - rule.start_date).days // (rule.every_n * (7 if rule.frequency == "weekly" else 1))
+    while occurrence(rule, k) < rule.next_date:
+        k += 1
+
+    last = until if rule.end_date is None else min(until, rule.end_date)
+    dates = []
+    day = occurrence(rule, k)
+    while day <= last:
+        dates.append(day)
+        k += 1
+        day = occurrence(rule, k)
+    return dates, day
+
+
+def add(store, record, frequency, every_n=1, end_date=None) -> Rule:
+    """Repeat `record` from its date on; raises ValueError for a bad frequency, interval or end date."""
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency: {frequency}")
+    every_n = int(every_n)
+    if every_n < 1:
+        raise ValueError("Repeat interval must be at least 1")
+    record = store.normalize(record)
+    end_date = store.coerce("date", end_date) if end_date else None
+    if end_date is not None and end_date < record.date:
+        raise ValueError("End date is before the first occurrence")
+
+    template = {column: str(value) for column, value in record._asdict().items() if column not in ("id", "date")}
+    rule = Rule(None, store.table, template, frequency, every_n, record.date, end_date, record.date)
+    ensure_table()
+    with db.cursor(commit=True) as cursor:
+        cursor.execute(
+            f"INSERT INTO recurring_rules ({', '.join(Rule._fields[1:])}) VALUES ({', '.join(['%s'] * 7)})",
+            (rule.source, json.dumps(template), frequency, every_n, rule.start_date, end_date, rule.next_date),
+        )
+        return rule._replace(id=cursor.lastrowid)
+
+
+def rules(store=None) -> List[Rule]:
+    """Every rule, or those writing to one store, in the order they were added."""
+    ensure_table()
+    query = f"SELECT {COLUMNS} FROM recurring_rules"
+    params = []
+    if store is not None:
+        query += " WHERE source = %s"
+        params.append(store.table)
+    with db.cursor() as cursor:
+        cursor.execute(query + " ORDER BY id", params)
+        return [_rule(row) for row in cursor.fetchall()]
+
+
+def delete(rule_id) -> bool:
+    """Stop a rule; what it already wrote stays. Returns False if there was no such rule."""
+    ensure_table()
+    with db.cursor(commit=True) as cursor:
+        cursor.execute("DELETE FROM recurring_rules WHERE id = %s", (rule_id,))
+        return cursor.rowcount > 0
+
+
+def run(today: date = None, store=None) -> dict:
+    """Write every occurrence due on or before today, of every rule or those writing to one store.
+
+    Returns {table: records written}.
+    """
+    ensure_table()
+    today = today or date.today()
+    query = (f"SELECT {COLUMNS} FROM recurring_rules "
+             f"WHERE next_date <= %s AND (end_date IS NULL OR next_date <= end_date)")
+    params = [today]
+    if store is not None:
+        query += " AND source = %s"
+        params.append(store.table)
+    written = {}
+    with db.cursor(commit=True) as cursor:
+        cursor.execute(query + f" ORDER BY id{db.backend().FOR_UPDATE}", params)
+        for rule in [_rule(row) for row in cursor.fetchall()]:
+            dates, next_date = due(rule, today)
+            # Only if next_date is still what we read; otherwise another run wrote these
+            cursor.execute("UPDATE recurring_rules SET next_date = %s WHERE id = %s AND next_date = %s",
+                           (next_date, rule.id, rule.next_date))
+            if cursor.rowcount != 1:
+                continue
+            store = STORES[rule.source]
+            record = store.normalize(store.record(id=None, date=rule.start_date, **rule.template))
+            written.setdefault(rule.source, []).extend(record._replace(date=day) for day in dates)
+        for source, records in written.items():
+            STORES[source].write_batch(cursor, records)
+    for source, records in written.items():
+        STORES[source].invalidate(records)
+        search_index.reset(source)  # Pick up the values of the added entries
+    return {source: len(records) for source, records in written.items()}
+
+
+if __name__ == "__main__":
+    for table, count in run().items():
+        print(f"Wrote {count} recurring {table} entries")
@@ -0,0 +1,134 @@
+"""A dialog listing one store's recurring rules, where new ones are made from the window's input fields."""
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+import recurring
+
+# Menu label -> recurring frequency
+FREQUENCIES = {"Monthly": "monthly", "Weekly": "weekly", "Every N days": "days"}
+
+
+class RecurringWindow(tk.Toplevel):
+    """Rules writing to `store`; "Add Rule" repeats the record fields_record() returns.
+
+    fields_record() reads the owning window's input fields, returning None
+    after telling the user what is wrong. Database calls run on the owning
+    window's worker, and on_written() is called after entries are written.
+    """
+
+    columns = ("ID", "Entry", "Amount", "Repeats", "Next", "Until")
+
+    def __init__(self, master, store, fields_record, on_written, title="Recurring Entries"):
+        super().__init__(master)
+        self.store = store
+        self.fields_record = fields_record
+        self.on_written = on_written
+        self.worker = master.worker
+
+        self.title(title)
+        self.geometry("1000x500")
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+        font_style = ('Arial', 12)
+        frame_input = tk.Frame(self, padx=10, pady=10)
+        frame_input.pack(fill='x')
+
+        tk.Label(frame_input, text="Repeat:", font=font_style).grid(row=0, column=0, padx=5, sticky='w')
+        self.frequency_var = tk.StringVar(self, value="Monthly")
+        ttk.Combobox(frame_input, textvariable=self.frequency_var, values=list(FREQUENCIES), state="readonly",
+                     font=font_style, width=14).grid(row=0, column=1, padx=5)
+
+        tk.Label(frame_input, text="Every:", font=font_style).grid(row=0, column=2, padx=5, sticky='w')
+        self.every_var = tk.StringVar(self, value="1")
+        tk.Entry(frame_input, textvariable=self.every_var, font=font_style, width=5).grid(row=0, column=3, padx=5)
+
+        tk.Label(frame_input, text="End Date (optional):", font=font_style).grid(row=0, column=4, padx=5, sticky='w')
+        self.end_var = tk.StringVar(self)
+        tk.Entry(frame_input, textvariable=self.end_var, font=font_style, width=12).grid(row=0, column=5, padx=5)
+
+        tk.Button(frame_input, text="Add Rule", command=self.add_rule, bg="green", fg="white", font=font_style, width=12).grid(row=0, column=6, padx=10)
+
+        tk.Label(self, text="The rule repeats the entry typed into the main window, starting on its date.",
+                 font=('Arial', 10), fg="grey").pack(anchor='w', padx=15)
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show='headings', selectmode='browse')
+        for col in self.columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=300 if col == "Entry" else 100)
+        self.tree.pack(fill='both', expand=True, padx=10)
+
+        frame_buttons = tk.Frame(self, padx=10, pady=10)
+        frame_buttons.pack(fill='x')
+        tk.Button(frame_buttons, text="Delete Selected", command=self.delete_rule, bg="red", fg="white", font=font_style, width=15).pack(side='left', padx=5)
+        tk.Button(frame_buttons, text="Run Now", command=self.run, bg="blue", fg="white", font=font_style, width=15).pack(side='left', padx=5)
+
+        self.refresh()
+
+    def refresh(self):
+        def loaded(rules):
+            self.tree.delete(*self.tree.get_children())
+            for rule in rules:
+                template = rule.template
+                entry = " / ".join(value for column, value in template.items() if column not in ("amount", "quantity"))
+                amount = template["amount"] if template.get("quantity", "1") == "1" else f"{template['amount']} x {template['quantity']}"
+                until = rule.end_date.strftime("%Y-%m-%d") if rule.end_date else ""
+                ended = rule.end_date is not None and rule.next_date > rule.end_date
+                self.tree.insert('', 'end', values=(rule.id, entry, amount, rule.describe(),
+                                                    "Ended" if ended else rule.next_date.strftime("%Y-%m-%d"), until))
+
+        self.worker.submit(recurring.rules, self.store, key="recurring", on_done=loaded,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to load recurring entries: {e}", parent=self))
+
+    def add_rule(self):
+        record = self.fields_record()
+        if record is None:
+            return
+        every = self.every_var.get().strip()
+        if not every.isdigit() or int(every) < 1:
+            messagebox.showerror("Input Error", "Every must be a whole number of 1 or more.", parent=self)
+            return
+
+        # Then write the occurrences already due, the first one included
+        self.worker.submit(recurring.add, self.store, record, FREQUENCIES[self.frequency_var.get()], int(every),
+                           self.end_var.get().strip() or None, on_done=lambda _: self.run(),
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to add recurring entry: {e}", parent=self))
+
+    def delete_rule(self):
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showerror("Selection Error", "No rule selected to delete.", parent=self)
+            return
+        rule_id = self.tree.item(selected[0])['values'][0]
+        if not messagebox.askyesno("Delete Rule", "Stop this recurring entry? Entries it already added are kept.", parent=self):
+            return
+        self.worker.submit(recurring.delete, rule_id, on_done=lambda _: self.refresh(),
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to delete rule: {e}", parent=self))
+
+    def run(self):
+        def ran(written):
+            self.refresh()
+            if written:
+                self.on_written()
+
+        # Only this store's rules, so no other window is left showing stale rows
+        self.worker.submit(recurring.run, store=self.store, on_done=ran,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to add recurring entries: {e}", parent=self))
+
+    def show(self):
+        self.deiconify()
+        self.lift()
+        self.refresh()
+
+
+def catch_up(worker, on_written, parent=None):
+    """Add the recurring entries of every rule that fell due since the last run, on `worker`.
+
+    Run once per process (index.py does, and each window run on its own);
+    on_written(written) gets recurring.run()'s {table: count} if any were added.
+    """
+    def ran(written):
+        if written:
+            on_written(written)
+
+    worker.submit(recurring.run, on_done=ran,
+                  on_error=lambda e: messagebox.showerror("Recurring Entries", f"Failed to add recurring entries: {e}", parent=parent))
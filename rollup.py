@@ -0,0 +1,99 @@
+"""Per-month, per-category totals kept alongside the raw tables.
+
+Every insert, delete and import made through the stores adjusts the
+matching monthly_rollup rows in the same transaction, so the analysis
+screens read a few hundred pre-summed rows instead of grouping the whole
+raw table. Run `python rollup.py` to rebuild it if the raw tables were
+changed behind the application's back.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+import db
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS monthly_rollup (
+        source VARCHAR(20) NOT NULL,
+        category VARCHAR(255) NOT NULL,
+        month DATE NOT NULL,
+        total DECIMAL(16, 2) NOT NULL,
+        row_count INT NOT NULL,
+        PRIMARY KEY (source, month, category)
+    )
+'''
+# source is the raw table name; category is the store's rollup_group column
+# (category, or type for income); month is the first day of the month
+
+COLUMNS = ("source", "category", "month", "total", "row_count")
+KEY = ("source", "month", "category")
+
+
+def deltas(store, records, sign=1):
+    """Sum records into {(category, month): [total, count]} changes."""
+    changes = defaultdict(lambda: [Decimal(0), 0])
+    for record in records:
+        change = changes[(getattr(record, store.rollup_group), record.date.replace(day=1))]
+        change[0] += sign * store.amount_of(record)
+        change[1] += sign
+    return changes
+
+
+def apply(cursor, store, changes):
+    """Add the changes to monthly_rollup on the caller's cursor (and transaction)."""
+    if not changes:
+        return
+    upsert = db.backend().upsert_add("monthly_rollup", COLUMNS, KEY, ("total", "row_count"))
+    cursor.executemany(upsert, [
+        (store.table, category, month, total, count)
+        for (category, month), (total, count) in changes.items()
+    ])
+    if any(count < 0 for _, count in changes.values()):
+        cursor.execute("DELETE FROM monthly_rollup WHERE source = %s AND row_count <= 0", (store.table,))
+
+
+def rebuild(cursor, store):
+    """Recompute one table's rollup rows from scratch."""
+    month = db.backend().month_start("date")
+    cursor.execute("DELETE FROM monthly_rollup WHERE source = %s", (store.table,))
+    cursor.execute(
+        f"INSERT INTO monthly_rollup (source, category, month, total, row_count) "
+        f"SELECT %s, {store.rollup_group}, {month}, SUM({store.amount_expr}), COUNT(*) "
+        f"FROM {store.table} GROUP BY {store.rollup_group}, {month}",
+        (store.table,),
+    )
+
+
+def ensure(cursor, store):
+    """Create monthly_rollup if needed and build it for a table that has rows but no rollup yet."""
+    cursor.execute(SCHEMA)
+    cursor.execute("SELECT 1 FROM monthly_rollup WHERE source = %s LIMIT 1", (store.table,))
+    has_rollup = cursor.fetchall()
+    cursor.execute(f"SELECT 1 FROM {store.table} LIMIT 1")
+    has_rows = cursor.fetchall()
+    if has_rows and not has_rollup:
+        rebuild(cursor, store)
+
+
+def totals(store, start=None, end=None):
+    """Return (category, total) pairs for months in [start, end), largest first."""
+    query = "SELECT category, SUM(total) AS total FROM monthly_rollup WHERE source = %s"
+    params = [store.table]
+    if start is not None:
+        query += " AND month >= %s"
+        params.append(start)
+    if end is not None:
+        query += " AND month < %s"
+        params.append(end)
+    query += " GROUP BY category HAVING SUM(row_count) > 0 ORDER BY total DESC"
+    # Cached with the store's own reads, so writes to its table invalidate it
+    return store.read(query, params)
+
+
+if __name__ == "__main__":
+    from store import BudgetStore, ExpenseStore, IncomeStore
+
+    for store in (ExpenseStore(), IncomeStore(), BudgetStore()):
+        store.create_table()
+        with db.cursor(commit=True) as cursor:
+            rebuild(cursor, store)
+        print(f"Rebuilt monthly_rollup for {store.table}")
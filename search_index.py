@@ -0,0 +1,217 @@
+"""Typo-tolerant search over the distinct values of a text column.
+
+A LIKE '%term%' can't use an index, so the expense search instead looks the
+term up in an in-memory trigram index of the column's distinct values (a few
+thousand item names, however many rows use them), ranks the close matches
+and then selects rows with `item IN (...)`, which the column index answers.
+Search-as-you-type uses a PrefixIndex of the same values instead, so each
+keystroke is a binary search rather than a query.
+"""
+import bisect
+import re
+import threading
+from collections import Counter, defaultdict
+
+# Matches scoring below this are dropped ("grocries" vs "groceries" scores
+# ~0.58, the transposed "petorl" vs "petrol" ~0.27)
+THRESHOLD = 0.25
+# Most fuzzy-only values a search expands to (substring matches are never cut)
+LIMIT = 20
+# Most values a prefix lookup expands to
+PREFIX_LIMIT = 200
+# Milliseconds the windows wait after the last keystroke before searching
+TYPING_DELAY = 250
+
+# Every ColumnSearch, so reset() can reach those over a table
+_searches = []
+
+
+def trigrams(text):
+    """Return the set of trigrams of each word, padded like PostgreSQL's pg_trgm."""
+    grams = set()
+    for word in text.lower().split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Maps trigrams to the terms containing them."""
+
+    def __init__(self, terms=()):
+        self._terms = {}  # term -> its trigrams
+        self._lower = {}  # term -> its lower-cased text, for substring matching
+        self._postings = defaultdict(set)  # trigram -> terms
+        for term in terms:
+            self.add(term)
+
+    def __len__(self):
+        return len(self._terms)
+
+    def add(self, term):
+        if term in self._terms:
+            return
+        grams = trigrams(term)
+        self._terms[term] = grams
+        self._lower[term] = term.lower()
+        for gram in grams:
+            self._postings[gram].add(term)
+
+    def search(self, text, limit=LIMIT, threshold=THRESHOLD):
+        """Return (term, score) pairs, best first: every term containing the
+        text, then up to `limit` more scored by trigram similarity (shared / union).
+
+        The substring matches are what LIKE '%text%' would find, so they are
+        never cut by the limit; only the fuzzy extras are.
+        """
+        needle = text.lower().strip()
+        grams = trigrams(needle)
+        if not grams:
+            return []
+
+        shared = Counter()
+        for gram in grams:
+            for term in self._postings.get(gram, ()):
+                shared[term] += 1
+
+        def score(term):
+            count = shared.get(term, 0)
+            return count / (len(grams) + len(self._terms[term]) - count)
+
+        # A scan rather than the postings: a short needle can sit inside a
+        # word without sharing any of its padded trigrams
+        exact = [(term, score(term) + 1) for term, lower in self._lower.items() if needle in lower]
+        found = {term for term, _ in exact}
+        fuzzy = [(term, score(term)) for term in shared if term not in found]
+        fuzzy = [match for match in fuzzy if match[1] >= threshold]
+
+        exact.sort(key=lambda match: (-match[1], match[0]))
+        fuzzy.sort(key=lambda match: (-match[1], match[0]))
+        return exact + fuzzy[:limit]
+
+
+class PrefixIndex:
+    """Sorted (key, term) pairs, searched for a prefix with bisect.
+
+    Each term is keyed by its whole lower-cased text and by every word in
+    it, so "elec" finds both "Electric kettle" and "Utilities (Electricity,
+    Water, ...)".
+    """
+
+    def __init__(self, terms=()):
+        self._terms = set()
+        self._keys = []
+        for term in terms:
+            if term not in self._terms:
+                self._terms.add(term)
+                self._keys.extend((key, term) for key in self._keys_of(term))
+        self._keys.sort()
+
+    def __len__(self):
+        return len(self._terms)
+
+    @staticmethod
+    def _keys_of(term):
+        text = term.lower()
+        return {text, *re.findall(r"\w+", text)}
+
+    def add(self, term):
+        if term in self._terms:
+            return
+        self._terms.add(term)
+        for key in self._keys_of(term):
+            bisect.insort(self._keys, (key, term))
+
+    def search(self, prefix, limit=PREFIX_LIMIT):
+        """Return up to `limit` terms with a key starting with the prefix, in key order."""
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+        found = {}
+        for i in range(bisect.bisect_left(self._keys, (prefix,)), len(self._keys)):
+            key, term = self._keys[i]
+            if not key.startswith(prefix) or len(found) >= limit:
+                break
+            found[term] = None
+        return list(found)
+
+
+class ColumnSearch:
+    """Fuzzy and prefix search over one store's text columns, built on first use.
+
+    Call note(record) after inserting so new values are searchable at once,
+    and reset() after bulk changes such as an import. Values whose last row
+    was deleted stay in the index; they just select no rows.
+    """
+
+    def __init__(self, store, columns):
+        self.store = store
+        self.columns = tuple(columns)
+        self._indexes = {}
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped by note() and reset()
+        _searches.append(self)
+
+    def _index(self, column):
+        # (TrigramIndex, PrefixIndex) of the column's distinct values
+        with self._lock:
+            indexes = self._indexes.get(column)
+        if indexes is not None:
+            return indexes
+
+        # Built without the lock, so note() and reset() on the Tk thread
+        # don't wait for the SELECT DISTINCT
+        while True:
+            generation = self._generation
+            values = self.store.distinct(column)
+            built = (TrigramIndex(values), PrefixIndex(values))
+            with self._lock:
+                indexes = self._indexes.get(column)
+                if indexes is not None:
+                    return indexes  # another thread built it first
+                if generation == self._generation:
+                    self._indexes[column] = built
+                    return built
+            # A note() or reset() came in while building: its value may be
+            # missing from what was read, so read again
+
+    def note(self, record):
+        with self._lock:
+            self._generation += 1
+            for column, indexes in self._indexes.items():
+                for index in indexes:
+                    index.add(getattr(record, column))
+
+    def reset(self):
+        with self._lock:
+            self._generation += 1
+            self._indexes.clear()
+
+    def search(self, column, text, limit=LIMIT):
+        """Return the (value, score) pairs of `column` that best match the text."""
+        if column not in self.columns:
+            raise ValueError(f"{column} is not searchable")
+        return self._index(column)[0].search(text, limit)
+
+    def filters(self, column, text, limit=LIMIT):
+        """Return (filters, matched values): filters select rows holding any matched value."""
+        values = [value for value, _ in self.search(column, text, limit)]
+        return [(column, "in", values)], values
+
+    def complete(self, column, prefix, limit=PREFIX_LIMIT):
+        """Return the values of `column` with a word (or the whole value) starting with the prefix."""
+        if column not in self.columns:
+            raise ValueError(f"{column} is not searchable")
+        return self._index(column)[1].search(prefix, limit)
+
+    def prefix_filters(self, column, prefix, limit=PREFIX_LIMIT):
+        """Like filters(), but matching values by prefix (see complete())."""
+        values = self.complete(column, prefix, limit)
+        return [(column, "in", values)], values
+
+
+def reset(table):
+    """Reset every ColumnSearch over `table`; called after bulk writes such as recurring.run()."""
+    for search in _searches:
+        if search.store.table == table:
+            search.reset()
@@ -0,0 +1,155 @@
+"""SQLite backend: a single local database file, no server needed.
+
+The database runs in WAL mode, so the windows' worker threads can read
+while another thread writes. Each thread keeps one connection open for the
+life of the process; close() only ends its transaction, the way closing a
+pooled MySQL connection hands it back to the pool. Statements are written
+for MySQL (%s placeholders), so the cursor translates the placeholders and
+the few places where the SQL differs go through the helpers below.
+"""
+import os
+import sqlite3
+import threading
+from datetime import date
+from decimal import Decimal
+
+from config import CONFIG_FILE, get_section
+
+# Used when config.ini is missing a key
+DEFAULTS = {
+    "path": "personal_finance.db",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": "-65536",
+    "temp_store": "MEMORY",
+    "mmap_size": "268435456",
+    "busy_timeout": "5000",
+}
+
+# Applied to every new connection, in this order
+PRAGMAS = ("journal_mode", "synchronous", "cache_size", "temp_store", "mmap_size", "busy_timeout")
+
+Error = sqlite3.Error
+
+# INTEGER PRIMARY KEY makes the column an alias of the rowid
+SERIAL_KEY = "INTEGER PRIMARY KEY AUTOINCREMENT"
+
+# SQLite locks the whole database for a write, not rows. sqlite3 only
+# opens its IMMEDIATE transaction before the first write statement, so a
+# SELECT that reads rows about to be changed must come after begin()
+FOR_UPDATE = ""
+
+# Decimals are bound as text, but a DECIMAL column has NUMERIC affinity, so
+# SQLite stores them as INTEGER or REAL (a binary float). Reading the column
+# goes through the DECIMAL converter, which rounds back to cents; that is
+# exact for DECIMAL(10, 2), well within a double's 15 significant digits.
+# SUM() and other expressions have no declared type and come back as floats,
+# which store._decimal() rounds to cents. Not TEXT columns: amount ranges
+# and their indexes must compare numbers. Dates are ISO strings, which sort
+# correctly
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter("DECIMAL", lambda value: Decimal(value.decode()).quantize(Decimal("0.01")))
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+_settings = None
+_local = threading.local()
+
+
+def get_settings():
+    global _settings
+    if _settings is None:
+        _settings = get_section("sqlite", DEFAULTS)
+    return _settings
+
+
+def database_path():
+    """The database file; a relative path is taken relative to config.ini."""
+    path = get_settings()["path"]
+    if path == ":memory:":
+        return path
+    return os.path.join(os.path.dirname(CONFIG_FILE), os.path.expanduser(path))
+
+
+class Cursor(sqlite3.Cursor):
+    """Accepts the MySQL-style %s placeholders the stores use."""
+
+    def execute(self, sql, parameters=()):
+        return super().execute(sql.replace("%s", "?"), parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return super().executemany(sql.replace("%s", "?"), seq_of_parameters)
+
+
+class Connection(sqlite3.Connection):
+    def cursor(self, **kwargs):
+        # mysql.connector options such as buffered=False don't apply here
+        return super().cursor(Cursor)
+
+    def close(self):
+        # Keep the thread's connection open for its next use
+        if self.in_transaction:
+            self.rollback()
+
+
+def _connect():
+    settings = get_settings()
+    path = database_path()
+    uri = path == ":memory:"
+    if uri:
+        # One in-memory database shared by every thread's connection
+        path = "file:personal_finance?mode=memory&cache=shared"
+    conn = sqlite3.connect(
+        path,
+        factory=Connection,
+        uri=uri,
+        timeout=float(settings["busy_timeout"]) / 1000,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        isolation_level="IMMEDIATE",
+        check_same_thread=False,
+    )
+    for pragma in PRAGMAS:
+        conn.execute(f"PRAGMA {pragma} = {settings[pragma]}")
+    return conn
+
+
+def get_connection():
+    """Return this thread's connection, opening it on first use.
+
+    Calling close() on it rolls back anything left uncommitted.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _connect()
+    return conn
+
+
+def begin(cursor):
+    """Start a write transaction now, locking out other writers before the first read."""
+    cursor.execute("BEGIN IMMEDIATE")
+
+
+def month_start(column):
+    """SQL expression for the first day of the month of a DATE column."""
+    return f"strftime('%Y-%m-01', {column})"
+
+
+def upsert_add(table, columns, key, add):
+    """INSERT one row of `columns`; if a row with the same `key` exists, add the `add` columns to it."""
+    updates = ", ".join(f"{column} = {column} + excluded.{column}" for column in add)
+    return (f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))}) "
+            f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates}")
+
+
+def index_names(cursor, table):
+    """Return the lower-cased names of the indexes that exist on a table."""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s", (table,))
+    return {row[0].lower() for row in cursor.fetchall()}
+
+
+def column_names(cursor, table):
+    """Return the lower-cased names of a table's columns."""
+    # table_xinfo, unlike table_info, includes generated columns
+    cursor.execute(f"PRAGMA table_xinfo({table})")
+    return {row[1].lower() for row in cursor.fetchall()}
@@ -0,0 +1,39 @@
+"""Startup timings for `python index.py --profile-startup [income|expense|budget]`.
+
+index.py imports this module first and marks each startup phase; with the
+flag set the timings are printed once the windows are painted and their
+first rows are loaded, and the app exits. Without the flag mark() does
+nothing. For a per-module breakdown of import time, combine it with
+`python -X importtime`.
+"""
+import sys
+import time
+
+FLAG = "--profile-startup"
+
+enabled = FLAG in sys.argv
+
+_start = time.perf_counter()
+_marks = []  # (phase, perf_counter)
+
+
+def mark(phase):
+    """Record that `phase` has just finished."""
+    if enabled:
+        _marks.append((phase, time.perf_counter()))
+
+
+def argument():
+    """Return the module name given after the flag, if any."""
+    args = sys.argv[sys.argv.index(FLAG) + 1:] if enabled else []
+    return args[0] if args and not args[0].startswith("-") else None
+
+
+def report(file=None):
+    """Print each phase's own time and the running total in milliseconds."""
+    file = file or sys.stderr
+    print(f"{'phase':<40} {'ms':>8} {'total':>8}", file=file)
+    previous = _start
+    for phase, at in _marks:
+        print(f"{phase:<40} {(at - previous) * 1000:8.1f} {(at - _start) * 1000:8.1f}", file=file)
+        previous = at
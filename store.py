@@ -0,0 +1,636 @@
+"""Data access for the expenses, income and budgets tables.
+
+The Tkinter windows only talk to these stores; every SQL statement lives here
+so queries can be pooled, batched, cached and benchmarked without a window.
+"""
+import operator
+import re
+import threading
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import cached_property
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import db
+import rollup
+from cache import query_cache
+
+
+class Expense(NamedTuple):
+    id: Optional[int]
+    category: str
+    item: str
+    amount: Decimal
+    quantity: int
+    date: date
+    payment_mode: str
+
+
+class Income(NamedTuple):
+    id: Optional[int]
+    source: str
+    type: str
+    amount: Decimal
+    date: date
+
+
+class Budget(NamedTuple):
+    id: Optional[int]
+    category: str
+    amount: Decimal
+    date: date
+
+
+# A filter is a (column, operator, value) triple, e.g. ("category", "=", "Groceries").
+# "contains" is a substring match, "in" matches any value in a list,
+# "between" matches a (low, high) pair inclusively and "month" matches a
+# 'YYYY-MM' month. Only "contains" becomes a LIKE; every other operator
+# compares the bare column, so the table's indexes can answer it.
+# Date filters are always sent as plain ranges on the column (never wrapped in
+# DATE_FORMAT) so MySQL can answer them from the date indexes.
+Filter = Tuple[str, str, object]
+
+OPERATORS = ("=", "<", "<=", ">", ">=", "contains", "in", "between", "month")
+
+# Sort orders usable for keyset pagination, each ending in the unique id column
+KEYSETS = {
+    "id": ("id",),
+    "date": ("date", "id"),
+}
+
+
+class Ranking(NamedTuple):
+    """A page() order: rows whose `column` holds values[0] first, then values[1]..., each by id.
+
+    Used to list search results best match first; the filters must select
+    only rows holding one of the values.
+    """
+    column: str
+    values: tuple
+
+    def rank(self, value) -> int:
+        try:
+            return self.values.index(value)
+        except ValueError:
+            # MySQL compares case-insensitively, so 'uber' rows match 'Uber'
+            return [str(v).lower() for v in self.values].index(str(value).lower())
+
+
+_COMPARE = {
+    "=": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+CENT = Decimal("0.01")
+
+# Column definitions check() reads its limits from
+_VARCHAR = re.compile(r"(\w+) VARCHAR\((\d+)\)")
+_DECIMAL = re.compile(r"(\w+) DECIMAL\((\d+), (\d+)\)")
+_INT = re.compile(r"(\w+) INT\b")
+INT_MAX = 2 ** 31 - 1
+
+
+def _coerce(kind, value):
+    # Convert a value typed into the UI (or read from a file) to the Python
+    # type the column holds, so records compare and display like fetched rows
+    if value is None:
+        return None
+    if kind is Decimal:
+        value = Decimal(str(value))
+        # NaN would be stored as text on SQLite and left out of every SUM
+        if not value.is_finite():
+            raise ValueError(f"Not a number: {value}")
+        return value.quantize(CENT)
+    if kind is date:
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        value = str(value).strip()
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            # The expense window's DD-MM-YYYY format
+            return datetime.strptime(value, "%d-%m-%Y").date()
+    if kind is int:
+        return int(value)
+    return value
+
+
+def _decimal(value):
+    # SQLite returns SUM() of a DECIMAL column as a float
+    return Decimal(str(value or 0)).quantize(CENT)
+
+
+def month_range(month):
+    """Return the half-open [first day, first day of next month) range of a 'YYYY-MM' month."""
+    start = datetime.strptime(month, "%Y-%m").date()
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def date_range(start=None, end=None, column="date"):
+    """Filters selecting start <= column <= end; either bound may be left open."""
+    filters = []
+    if start is not None:
+        filters.append((column, ">=", _coerce(date, start)))
+    if end is not None:
+        filters.append((column, "<", _coerce(date, end) + timedelta(days=1)))
+    return filters
+
+
+# LIKE escape character; not a backslash, which MySQL and SQLite treat differently
+LIKE_ESCAPE = "!"
+
+
+_AMOUNT_RANGE = re.compile(r"^\s*(?:(<=|>=|<|>|=)\s*([\d.]+)|([\d.]+)\s*(?:-|\.\.|to)\s*([\d.]+)|([\d.]+)\s*(\+)?)\s*$")
+
+
+def amount_range(text, column="amount"):
+    """Filters for an amount typed as 500, 100-500, 100..500, >500, <=200 or 500+ (at least 500).
+
+    They compare the DECIMAL column numerically, so "500" no longer matches
+    1500 or 50.00 the way a LIKE did, and an index on the column applies.
+    """
+    match = _AMOUNT_RANGE.match(str(text))
+    if not match:
+        raise ValueError(f"Invalid amount: {text!r} (use 500, 100-500, >500 or 500+)")
+    op, value, low, high, single, plus = match.groups()
+    try:
+        if op:
+            return [(column, op, _coerce(Decimal, value))]
+        if low:
+            return [(column, "between", (_coerce(Decimal, low), _coerce(Decimal, high)))]
+        return [(column, ">=" if plus else "=", _coerce(Decimal, single))]
+    except ArithmeticError:
+        raise ValueError(f"Invalid amount: {text!r}") from None
+
+
+def _escape_like(value):
+    return str(value).replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def _keyset_clause(columns, op, key):
+    # (a, b) > (x, y)  ->  a > x OR (a = x AND b > y), which MySQL can turn
+    # into an index range scan
+    clauses, params = [], []
+    for i, column in enumerate(columns):
+        terms = [f"{prev} = %s" for prev in columns[:i]] + [f"{column} {op} %s"]
+        clauses.append("(" + " AND ".join(terms) + ")")
+        params.extend(key[:i + 1])
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+# Tables create_table() has already run for in this process
+_created = set()
+_created_lock = threading.Lock()
+
+
+class _Store:
+    table = ""
+    record = None  # NamedTuple type for one row
+    schema = ""  # CREATE TABLE; {serial_key} is the backend's auto-increment id column
+    defaults = {}
+    # name -> indexed columns, created by create_table() when missing
+    indexes = {}
+    # SQL expression summed by aggregate()
+    amount_expr = "amount"
+    # Column monthly_rollup groups by
+    rollup_group = "category"
+    # Generated columns, filterable but not part of the record:
+    # name -> (Python type, column definition)
+    generated = {}
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self.record._fields
+
+    @cached_property
+    def column_types(self) -> dict:
+        """Python type of every filterable column, generated ones included."""
+        types = dict(self.record.__annotations__)
+        types.update((name, kind) for name, (kind, _) in self.generated.items())
+        return types
+
+    def value_of(self, record: NamedTuple, column: str) -> object:
+        """A column's value in a record; stores with generated columns compute theirs."""
+        return getattr(record, column)
+
+    def amount_of(self, record: NamedTuple) -> Decimal:
+        """Python twin of amount_expr."""
+        return record.amount
+
+    def coerce(self, column: str, value) -> object:
+        """Convert a typed-in value to the type `column` holds; raises ValueError if it can't."""
+        if column not in self.column_types:
+            raise ValueError(f"Unknown column for {self.table}: {column}")
+        try:
+            return _coerce(self.column_types[column], value)
+        except (ValueError, TypeError, ArithmeticError):
+            raise ValueError(f"Invalid {column}: {value!r}") from None
+
+    @cached_property
+    def limits(self) -> dict:
+        """Longest text or largest value each column's definition holds, generated ones included."""
+        # Stored columns first, so check() blames quantity rather than the total it overflows
+        limits = {}
+        for definitions in [self.schema] + [f"{name} {definition}" for name, (_, definition) in self.generated.items()]:
+            limits.update((name, int(length)) for name, length in _VARCHAR.findall(definitions))
+            for name, precision, scale in _DECIMAL.findall(definitions):
+                limits[name] = Decimal(10) ** (int(precision) - int(scale)) - Decimal(1).scaleb(-int(scale))
+            limits.update((name, INT_MAX) for name in _INT.findall(definitions))
+        return limits
+
+    def check(self, record: NamedTuple) -> None:
+        """Raise ValueError if a normalized record has a value its column can't hold.
+
+        MySQL in strict mode fails a whole batch on one such row; SQLite stores it as is.
+        """
+        for column, limit in self.limits.items():
+            value = self.value_of(record, column)
+            if isinstance(value, str):
+                if len(value) > limit:
+                    raise ValueError(f"{column} is longer than {limit} characters")
+            elif abs(value) > limit:
+                raise ValueError(f"{column} is larger than {limit}")
+
+    def normalize(self, record: NamedTuple) -> NamedTuple:
+        """Return the record with every value converted to its column's type."""
+        values = []
+        for column, value in zip(self.columns, record):
+            if column != "id":
+                value = self.coerce(column, value)
+            values.append(value)
+        return self.record._make(values)
+
+    def matches(self, record: NamedTuple, filters: Optional[Iterable[Filter]]) -> bool:
+        """Return True if the record would be selected by the filters (mirrors _where)."""
+        for column, op, value in filters or ():
+            actual = self.value_of(record, column)
+            if op == "contains":
+                if str(value).lower() not in str(actual).lower():
+                    return False
+            elif op == "in":
+                if actual not in value:
+                    return False
+            elif op == "between":
+                low, high = (_coerce(self.column_types[column], bound) for bound in value)
+                if not low <= actual <= high:
+                    return False
+            elif op == "month":
+                if str(actual)[:7] != value:
+                    return False
+            elif not _COMPARE[op](actual, _coerce(self.column_types[column], value)):
+                return False
+        return True
+
+    def read(self, query: str, params=()) -> list:
+        """Run a read query on this table, answering repeats from the query cache.
+
+        Cached results stay valid until the next write made through this
+        store invalidates them.
+        """
+        def load():
+            with db.cursor() as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+        return query_cache.get_or_load((self.table,), query, params, load)
+
+    def invalidate(self, records: Iterable[NamedTuple] = None) -> None:
+        """Forget cached reads of this table; called after every committed write.
+
+        Pass the records written so per-category caches only drop their categories.
+        """
+        groups = None if records is None else {getattr(record, self.rollup_group) for record in records}
+        query_cache.invalidate(self.table, groups)
+
+    def create_table(self) -> None:
+        """Create the table and any of its indexes that don't exist yet."""
+        with db.cursor(commit=True) as cursor:
+            cursor.execute(self.schema.format(serial_key=db.backend().SERIAL_KEY))
+            # Generated columns are added separately so older tables get them too
+            columns = db.backend().column_names(cursor, self.table)
+            for name, (_, definition) in self.generated.items():
+                if name.lower() not in columns:
+                    cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN {name} {definition}")
+            existing = db.backend().index_names(cursor, self.table)
+            for name, columns in self.indexes.items():
+                if name.lower() not in existing:
+                    cursor.execute(f"CREATE INDEX {name} ON {self.table} ({', '.join(columns)})")
+            rollup.ensure(cursor, self)
+        self.invalidate()
+
+    def ensure_table(self) -> None:
+        """Run create_table() once per process, however many windows open this table."""
+        with _created_lock:
+            if self.table not in _created:
+                self.create_table()
+                _created.add(self.table)
+
+    def _where(self, filters: Optional[Iterable[Filter]], extra: Tuple[str, list] = None
+               ) -> Tuple[str, list]:
+        clauses, params = [], []
+        for column, op, value in filters or ():
+            if column not in self.column_types:
+                raise ValueError(f"Unknown column for {self.table}: {column}")
+            if op == "contains":
+                clauses.append(f"{column} LIKE %s ESCAPE '{LIKE_ESCAPE}'")
+                params.append(f"%{_escape_like(value)}%")
+            elif op == "in":
+                values = list(value)
+                if values:
+                    clauses.append(f"{column} IN ({', '.join(['%s'] * len(values))})")
+                    params.extend(values)
+                else:
+                    clauses.append("1 = 0")
+            elif op == "between":
+                low, high = value
+                clauses.append(f"{column} >= %s AND {column} <= %s")
+                params.extend((low, high))
+            elif op == "month":
+                clauses.append(f"{column} >= %s AND {column} < %s")
+                params.extend(month_range(value))
+            elif op in OPERATORS:
+                clauses.append(f"{column} {op} %s")
+                params.append(value)
+            else:
+                raise ValueError(f"Unknown filter operator: {op}")
+        if extra:
+            clauses.append(extra[0])
+            params.extend(extra[1])
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
+
+    def _insert_sql(self) -> str:
+        fields = self.columns[1:]
+        return (f"INSERT INTO {self.table} ({', '.join(fields)}) "
+                f"VALUES ({', '.join(['%s'] * len(fields))})")
+
+    def insert(self, record: NamedTuple) -> NamedTuple:
+        """Insert one record (its id is ignored) and return it as stored, with its new id."""
+        record = self.normalize(record)
+        with db.cursor(commit=True) as cursor:
+            cursor.execute(self._insert_sql(), tuple(record)[1:])
+            record = record._replace(id=cursor.lastrowid)
+            rollup.apply(cursor, self, rollup.deltas(self, [record]))
+        self.invalidate([record])
+        return record
+
+    def bulk_insert(self, records: Iterable[NamedTuple]) -> int:
+        """Insert many records in one transaction and return how many were written."""
+        records = [self.normalize(record) for record in records]
+        if not records:
+            return 0
+        with db.cursor(commit=True) as cursor:
+            self.write_batch(cursor, records)
+        self.invalidate(records)
+        return len(records)
+
+    def write_batch(self, cursor, records: List[NamedTuple]) -> None:
+        """Insert normalized records on an open cursor without committing.
+
+        mysql.connector rewrites an INSERT executemany() into one multi-row
+        INSERT, so a batch costs a single round trip (SQLite has no round
+        trips, and the batch is one transaction). monthly_rollup is
+        updated in the same transaction. Call invalidate(records) after committing.
+        """
+        cursor.executemany(self._insert_sql(), [tuple(record)[1:] for record in records])
+        rollup.apply(cursor, self, rollup.deltas(self, records))
+
+    def delete(self, record_id: int) -> Optional[NamedTuple]:
+        """Delete a row by id and return it, or None if there was no such row."""
+        with db.cursor(commit=True) as cursor:
+            # Lock before reading, so a concurrent delete of the same row waits
+            db.backend().begin(cursor)
+            cursor.execute(
+                f"SELECT {', '.join(self.columns)} FROM {self.table} WHERE id = %s{db.backend().FOR_UPDATE}",
+                (record_id,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            record = self.record._make(row)
+            cursor.execute(f"DELETE FROM {self.table} WHERE id = %s", (record_id,))
+            if cursor.rowcount != 1:
+                # Deleted by someone else since the SELECT; their rollup change stands
+                return None
+            rollup.apply(cursor, self, rollup.deltas(self, [record], sign=-1))
+        self.invalidate([record])
+        return record
+
+    def query(self, filters: Optional[Iterable[Filter]] = None,
+              limit: Optional[int] = None) -> List[NamedTuple]:
+        where, params = self._where(filters)
+        query = f"SELECT {', '.join(self.columns)} FROM {self.table}{where} ORDER BY id"
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(int(limit))
+        return [self.record._make(row) for row in self.read(query, params)]
+
+    def stream(self, filters: Optional[Iterable[Filter]] = None,
+               batch_size: int = 1000) -> Iterator[List[NamedTuple]]:
+        """Yield every matching row in id order, `batch_size` rows at a time.
+
+        Uses an unbuffered cursor, so rows are read off the connection as
+        they are consumed instead of the whole result being loaded first.
+        """
+        where, params = self._where(filters)
+        query = f"SELECT {', '.join(self.columns)} FROM {self.table}{where} ORDER BY id"
+        with db.cursor(buffered=False) as cursor:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [self.record._make(row) for row in rows]
+
+    def key_of(self, record: NamedTuple, order="id") -> tuple:
+        """Return the keyset key of a record for page(after=...) / page(before=...)."""
+        if isinstance(order, Ranking):
+            return order.rank(getattr(record, order.column)), record.id
+        return tuple(getattr(record, column) for column in KEYSETS[order])
+
+    def page(self, filters: Optional[Iterable[Filter]] = None, after: tuple = None,
+             before: tuple = None, limit: int = 100, order="id") -> List[NamedTuple]:
+        """Return up to `limit` rows in `order` (a KEYSETS name or a Ranking), strictly after or before a key.
+
+        Seeks on the sort key instead of using OFFSET, so fetching a page deep
+        into a large table costs the same as fetching the first one. Rows are
+        always returned in ascending order.
+        """
+        if isinstance(order, Ranking):
+            return self._ranked_page(filters, after, before, limit, order)
+        columns = KEYSETS[order]
+        keyset = None
+        if after is not None:
+            keyset = _keyset_clause(columns, ">", after)
+        elif before is not None:
+            keyset = _keyset_clause(columns, "<", before)
+        where, params = self._where(filters, keyset)
+
+        direction = "DESC" if before is not None else "ASC"
+        order_by = ", ".join(f"{column} {direction}" for column in columns)
+        query = f"SELECT {', '.join(self.columns)} FROM {self.table}{where} ORDER BY {order_by} LIMIT %s"
+        params.append(int(limit))
+        rows = [self.record._make(row) for row in self.read(query, params)]
+        if before is not None:
+            rows.reverse()
+        return rows
+
+    def _ranked_page(self, filters, after, before, limit, ranking):
+        # Sorted by CASE column WHEN values[0] THEN 0 ... END, id. Each rank
+        # is one value, so seeking past (rank, id) is "a later value, or this
+        # value and a later id", which the column index can answer
+        if ranking.column not in self.columns:
+            raise ValueError(f"Unknown column for {self.table}: {ranking.column}")
+        column, values = ranking.column, list(ranking.values)
+        if not values:
+            return []  # nothing matched, and CASE needs a WHEN
+        keyset = None
+        if after is not None or before is not None:
+            rank, record_id = after if after is not None else before
+            op, rest = (">", values[rank + 1:]) if after is not None else ("<", values[:rank])
+            clause = f"({column} = %s AND id {op} %s)"
+            params = [values[rank], record_id]
+            if rest:
+                clause = f"({column} IN ({', '.join(['%s'] * len(rest))}) OR {clause})"
+                params = rest + params
+            keyset = (clause, params)
+        where, params = self._where(filters, keyset)
+
+        direction = "DESC" if before is not None else "ASC"
+        case = "CASE " + column + "".join(f" WHEN %s THEN {rank}" for rank in range(len(values))) + " END"
+        query = (f"SELECT {', '.join(self.columns)} FROM {self.table}{where} "
+                 f"ORDER BY {case} {direction}, id {direction} LIMIT %s")
+        params.extend(values)
+        params.append(int(limit))
+        rows = [self.record._make(row) for row in self.read(query, params)]
+        if before is not None:
+            rows.reverse()
+        return rows
+
+    def total(self, filters: Optional[Iterable[Filter]] = None) -> Decimal:
+        """Return the summed amount of every row matching the filters."""
+        where, params = self._where(filters)
+        ((total,),) = self.read(f"SELECT SUM({self.amount_expr}) FROM {self.table}{where}", params)
+        return _decimal(total)
+
+    def top(self, limit: int = 10, filters: Optional[Iterable[Filter]] = None,
+            column: str = "amount") -> List[NamedTuple]:
+        """Return the `limit` rows with the largest `column`, largest first.
+
+        With an index on the column this reads the first `limit` entries of
+        the index backwards instead of sorting the table.
+        """
+        if column not in self.column_types:
+            raise ValueError(f"Unknown column for {self.table}: {column}")
+        where, params = self._where(filters)
+        query = (f"SELECT {', '.join(self.columns)} FROM {self.table}{where} "
+                 f"ORDER BY {column} DESC, id DESC LIMIT %s")
+        params.append(int(limit))
+        return [self.record._make(row) for row in self.read(query, params)]
+
+    def category_totals(self, start: date = None, end: date = None) -> List[Tuple[str, Decimal]]:
+        """Return (category, total) pairs for the months in [start, end), largest first.
+
+        Read from monthly_rollup, so it costs the same however many rows the
+        table holds. Income is grouped by type.
+        """
+        return [(category, _decimal(total)) for category, total in rollup.totals(self, start, end)]
+
+    def distinct(self, column: str) -> List[object]:
+        """Return every distinct value of a column."""
+        if column not in self.columns:
+            raise ValueError(f"Unknown column for {self.table}: {column}")
+        return [row[0] for row in self.read(f"SELECT DISTINCT {column} FROM {self.table}")]
+
+    def aggregate(self, group_by: str, filters: Optional[Iterable[Filter]] = None
+                  ) -> List[Tuple[str, Decimal]]:
+        """Return (group, total) pairs, largest total first."""
+        if group_by not in self.columns:
+            raise ValueError(f"Unknown column for {self.table}: {group_by}")
+        where, params = self._where(filters)
+        query = (f"SELECT {group_by}, SUM({self.amount_expr}) AS total FROM {self.table}{where} "
+                 f"GROUP BY {group_by} ORDER BY total DESC")
+        return [(group, _decimal(total)) for group, total in self.read(query, params)]
+
+
+class ExpenseStore(_Store):
+    table = "expenses"
+    record = Expense
+    # Values used when an imported file has no such column
+    defaults = {"quantity": 1}
+    amount_expr = "amount * quantity"
+    # amount * quantity as a column, so ranges and top-N on it can use an index
+    generated = {"total": (Decimal, "DECIMAL(12, 2) GENERATED ALWAYS AS (amount * quantity) VIRTUAL")}
+    indexes = {
+        "idx_expenses_date": ("date",),
+        "idx_expenses_category_date": ("category", "date"),
+        # Filter panel combinations: equality columns first, the date range last
+        "idx_expenses_category_mode_date": ("category", "payment_mode", "date"),
+        "idx_expenses_mode_date": ("payment_mode", "date"),
+        # Answers the item IN (...) lookups of the fuzzy item search
+        "idx_expenses_item": ("item",),
+        # Amount ranges and the largest expenses
+        "idx_expenses_amount": ("amount",),
+        "idx_expenses_total": ("total",),
+    }
+    schema = '''
+        CREATE TABLE IF NOT EXISTS expenses (
+            id {serial_key},
+            category VARCHAR(255) NOT NULL,
+            item VARCHAR(255) NOT NULL,
+            amount DECIMAL(10, 2) NOT NULL,
+            quantity INT NOT NULL DEFAULT 1,
+            date DATE NOT NULL,
+            payment_mode VARCHAR(20) NOT NULL
+        )
+    '''
+
+    def amount_of(self, record: Expense) -> Decimal:
+        return record.amount * record.quantity
+
+    def value_of(self, record: Expense, column: str) -> object:
+        if column == "total":
+            return self.amount_of(record)
+        return getattr(record, column)
+
+
+class IncomeStore(_Store):
+    table = "income"
+    record = Income
+    rollup_group = "type"
+    indexes = {
+        "idx_income_date": ("date",),
+        "idx_income_type_date": ("type", "date"),
+    }
+    schema = '''
+        CREATE TABLE IF NOT EXISTS income (
+            id {serial_key},
+            source VARCHAR(255) NOT NULL,
+            type VARCHAR(50) NOT NULL,
+            amount DECIMAL(10, 2) NOT NULL,
+            date DATE NOT NULL
+        )
+    '''
+
+
+class BudgetStore(_Store):
+    table = "budgets"
+    record = Budget
+    indexes = {
+        "idx_budgets_date": ("date",),
+        "idx_budgets_category_date": ("category", "date"),
+        "idx_budgets_amount": ("amount",),
+    }
+    schema = '''
+        CREATE TABLE IF NOT EXISTS budgets (
+            id {serial_key},
+            category VARCHAR(255) NOT NULL,
+            amount DECIMAL(10, 2) NOT NULL,
+            date DATE NOT NULL
+        )
+    '''
@@ -0,0 +1,141 @@
+"""What the Income, Expense and Budget windows share: file import/export,
+search-as-you-type, the busy status and closing.
+
+A window mixes StoreWindow into its tk.Toplevel, sets the class attributes
+below and provides load_data(), a Worker in self.worker and the widgets
+these methods use (status_label, and for searching search_item_var,
+search_type_var and search_status_label).
+"""
+from decimal import Decimal
+from tkinter import filedialog, messagebox
+
+from exporter import export_csv
+from importer import import_csv
+from search_index import PREFIX_LIMIT, TYPING_DELAY
+from store import amount_range
+
+
+class StoreWindow:
+    store = None
+    search = None  # ColumnSearch over the store's text columns, if any
+    search_columns = {}  # search type shown in the window -> the column it searches
+    noun = "records"  # as in "Failed to search records"
+    columns = ()  # table headings, also the header of saved files
+
+    # Pending after() id of the search-as-you-type delay
+    typing_after = None
+
+    def refresh(self):
+        # Reload what the window shows after its table changed in bulk
+        self.load_data()
+
+    def show_results(self, filters=None, error_message=None):
+        # Show the rows a search matched (all rows for None)
+        self.load_data(filters)
+
+    def search_filters(self, column, text):
+        # Amounts are compared as numbers (500, 100-500, >500, 500+), other
+        # columns by substring; raises ValueError for a malformed amount
+        if self.store.column_types[column] is Decimal:
+            return amount_range(text, column)
+        return [(column, "contains", text)]
+
+    def search_typed(self, *_):
+        # Search as the user types: drop any search still in flight, and only
+        # run a new one once typing pauses for TYPING_DELAY ms
+        self.worker.cancel("view")
+        if self.typing_after is not None:
+            self.after_cancel(self.typing_after)
+        self.typing_after = self.after(TYPING_DELAY, self.live_search)
+
+    def live_search(self):
+        self.typing_after = None
+        column = self.search_columns.get(self.search_type_var.get())
+        search_value = self.search_item_var.get().strip()
+        if column is None:
+            return
+        if not search_value:
+            self.search_status_label.config(text="")
+            self.show_results()
+            return
+
+        error_message = f"Failed to search {self.noun}"
+        if self.search is not None and column in self.search.columns:
+            # Values starting with what was typed, from the in-memory prefix
+            # index, then looked up with an indexed IN (...)
+            def matched(result):
+                filters, values = result
+                if not values:
+                    status = "No matches"
+                elif len(values) >= PREFIX_LIMIT:
+                    status = f"First {len(values)} matches"
+                else:
+                    status = f"{len(values)} matches"
+                self.search_status_label.config(text=status)
+                self.show_results(filters, error_message=error_message)
+
+            # The first search builds the index, so it runs on the worker
+            self.worker.submit(self.search.prefix_filters, column, search_value, key="view", on_done=matched,
+                               on_error=lambda e: messagebox.showerror("Error", f"{error_message}: {e}", parent=self))
+        else:
+            try:
+                filters = self.search_filters(column, search_value)
+            except ValueError as e:
+                # Probably still being typed, e.g. ">"
+                self.search_status_label.config(text=str(e))
+                return
+            self.search_status_label.config(text="")
+            self.show_results(filters, error_message=error_message)
+
+    def save_to_file(self):
+        filepath = filedialog.asksaveasfilename(parent=self, defaultextension=".csv",
+                                                filetypes=[("CSV files", "*.csv"), ("Compressed CSV files", "*.csv.gz")],
+                                                title="Save as")
+        if filepath:
+            # Save the rows currently shown, streamed straight from the database
+            self.worker.submit(export_csv, self.store, filepath, self.current_filters, header=self.columns,
+                               on_done=lambda count: messagebox.showinfo("Export Successful", f"{count} rows saved to {filepath}", parent=self),
+                               on_error=lambda e: messagebox.showerror("Export Error", f"Failed to save file: {e}", parent=self))
+
+    def import_from_file(self):
+        filepath = filedialog.askopenfilename(parent=self, filetypes=[("CSV files", "*.csv *.csv.gz")], title="Select a CSV file")
+        if filepath:
+            title = self.title()
+
+            def show_progress(result):
+                self.title(f"{title} - importing: {result.imported} rows")
+
+            def imported(result):
+                self.title(title)
+                if self.search is not None:
+                    self.search.reset()  # Pick up the imported names
+                self.refresh()
+                if result.rejected:
+                    messagebox.showwarning("Import Finished", result.summary(), parent=self)
+                else:
+                    messagebox.showinfo("Import Successful", result.summary(), parent=self)
+
+            def failed(e):
+                self.title(title)
+                messagebox.showerror("Import Error", f"Failed to import file: {e}", parent=self)
+
+            self.worker.submit(import_csv, self.store, filepath, progress=self.worker.relay(show_progress),
+                               on_done=imported, on_error=failed)
+
+    def connect_failed(self, error):
+        messagebox.showerror("Database Error", f"Failed to connect to database: {error}", parent=self)
+        self.close()
+
+    def show_busy(self, busy):
+        # Busy cursor and status while the worker has database calls in flight
+        self.config(cursor="watch" if busy else "")
+        self.status_label.config(text="Working..." if busy else "")
+
+    def exit_application(self):
+        self.close()
+
+    def close(self):
+        if self.typing_after is not None:
+            self.after_cancel(self.typing_after)
+        self.worker.shutdown()
+        self.destroy()
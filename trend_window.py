@@ -0,0 +1,178 @@
+"""The Trend Analysis window: monthly income, expenses and net over any span.
+
+The series come from trends.load() on the worker thread; the top chart
+plots them (with an optional rolling mean) and the bottom one their
+year-over-year change. Spans longer than trends.MAX_POINTS months are
+averaged into buckets before plotting.
+"""
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk, messagebox
+
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+import trends
+from store import month_range
+from worker import Worker
+
+VIEWS = ("Income vs Expenses", "Expenses by category", "Income by type")
+
+# Rolling mean choices -> window in months (0 = off)
+ROLLING = {"Off": 0, "3 months": 3, "6 months": 6, "12 months": 12}
+
+
+def series_for(data, view):
+    """Return (labels, (series, months) matrix) for one of VIEWS."""
+    if view == "Expenses by category":
+        return data.expense_categories, data.expenses
+    if view == "Income by type":
+        return data.income_types, data.income
+    return ["Income", "Expenses", "Net"], np.vstack([data.income_total, data.expense_total, data.net])
+
+
+def plot(figure, data, view, window=0):
+    """Draw `view` of the Trends `data` on the figure: values on top, YoY change below."""
+    figure.clear()
+    top, bottom = figure.subplots(2, 1, sharex=True, gridspec_kw={"height_ratios": (3, 1)})
+    labels, values = series_for(data, view)
+    if not len(data.months) or not len(labels):
+        top.text(0.5, 0.5, "No data", ha='center', va='center', transform=top.transAxes)
+        top.set_axis_off()
+        bottom.set_axis_off()
+        return
+
+    # Statistics on the full monthly series, then downsampled for drawing
+    yoy = trends.year_over_year(values)
+    rolling = trends.rolling_mean(values, window) if window else None
+    months, shown = trends.downsample(data.months, values)
+    x = months.astype("datetime64[D]").astype(object)
+    _, yoy = trends.downsample(data.months, yoy)
+
+    lines = top.plot(x, shown.T, linewidth=1)
+    if rolling is not None:
+        _, rolling = trends.downsample(data.months, rolling)
+        for line, series in zip(lines, rolling):
+            top.plot(x, series, linestyle='--', linewidth=1, color=line.get_color())
+    top.legend(lines, labels, fontsize='small', ncol=2 if len(labels) > 10 else 1, loc='upper left')
+    top.set_ylabel("₹ per month")
+    top.grid(True, alpha=0.3)
+
+    bottom.plot(x, yoy.T, linewidth=1)
+    bottom.axhline(0, color='grey', linewidth=0.5)
+    bottom.set_ylabel("YoY %")
+    bottom.grid(True, alpha=0.3)
+    figure.autofmt_xdate()
+
+
+def summary(data):
+    """One line about the last month of the span."""
+    if not len(data.months):
+        return ""
+    net = data.net
+    mom = trends.month_over_month(net)[-1]
+    yoy = trends.year_over_year(data.expense_total)[-1]
+    text = (f"{data.months[-1]}: income ₹{data.income_total[-1]:,.2f}, expenses ₹{data.expense_total[-1]:,.2f}, "
+            f"net ₹{net[-1]:,.2f}")
+    if not np.isnan(mom):
+        text += f" ({mom:+,.2f} vs previous month)"
+    if not np.isnan(yoy):
+        text += f", expenses {yoy:+.1f}% year over year"
+    return text
+
+
+class TrendWindow(tk.Toplevel):
+    """Opened from index.py or run on its own."""
+
+    def __init__(self, master=None):
+        super().__init__(master)
+        self.data = None  # Trends currently drawn
+
+        self.title("Trend Analysis")
+        self.geometry("1300x850")
+        self.protocol("WM_DELETE_WINDOW", self.exit_application)
+
+        self.worker = Worker(self, on_busy=self.show_busy)
+        self.build()
+        self.refresh()
+
+    def refresh(self):
+        # Months typed as MM-YYYY; either end may be left blank for all data
+        try:
+            start = month_range(datetime.strptime(self.start_var.get().strip(), "%m-%Y").strftime("%Y-%m"))[0] \
+                if self.start_var.get().strip() else None
+            end = month_range(datetime.strptime(self.end_var.get().strip(), "%m-%Y").strftime("%Y-%m"))[1] \
+                if self.end_var.get().strip() else None
+        except ValueError:
+            messagebox.showerror("Format Error", "Invalid month format. Please use MM-YYYY format.", parent=self)
+            return
+
+        def loaded(data):
+            self.data = data
+            self.redraw()
+
+        self.worker.submit(trends.load, start, end, key="trends", on_done=loaded,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to load trends: {e}", parent=self))
+
+    def redraw(self, *_):
+        if self.data is None:
+            return
+        plot(self.figure, self.data, self.view_var.get(), ROLLING[self.rolling_var.get()])
+        self.canvas.draw_idle()
+        self.summary_label.config(text=summary(self.data))
+
+    def show_busy(self, busy):
+        self.config(cursor="watch" if busy else "")
+        self.status_label.config(text="Working..." if busy else "")
+
+    def exit_application(self):
+        self.worker.shutdown()
+        self.destroy()
+
+    def build(self):
+        font_style = ('Arial', 12)
+
+        frame_controls = tk.Frame(self, padx=20, pady=10)
+        frame_controls.pack(fill='x')
+
+        tk.Label(frame_controls, text="From (MM-YYYY):", font=font_style).grid(row=0, column=0, padx=5, sticky='w')
+        self.start_var = tk.StringVar(self)
+        tk.Entry(frame_controls, textvariable=self.start_var, font=font_style, width=10).grid(row=0, column=1, padx=5)
+
+        tk.Label(frame_controls, text="To (MM-YYYY):", font=font_style).grid(row=0, column=2, padx=5, sticky='w')
+        self.end_var = tk.StringVar(self)
+        tk.Entry(frame_controls, textvariable=self.end_var, font=font_style, width=10).grid(row=0, column=3, padx=5)
+
+        tk.Button(frame_controls, text="Load", command=self.refresh, bg="blue", fg="white", font=font_style, width=10).grid(row=0, column=4, padx=10)
+
+        tk.Label(frame_controls, text="Show:", font=font_style).grid(row=0, column=5, padx=5, sticky='w')
+        self.view_var = tk.StringVar(self, value=VIEWS[0])
+        view_cb = ttk.Combobox(frame_controls, textvariable=self.view_var, values=VIEWS, state="readonly", font=font_style, width=22)
+        view_cb.grid(row=0, column=6, padx=5)
+        view_cb.bind("<<ComboboxSelected>>", self.redraw)
+
+        tk.Label(frame_controls, text="Rolling mean:", font=font_style).grid(row=0, column=7, padx=5, sticky='w')
+        self.rolling_var = tk.StringVar(self, value="3 months")
+        rolling_cb = ttk.Combobox(frame_controls, textvariable=self.rolling_var, values=list(ROLLING), state="readonly", font=font_style, width=10)
+        rolling_cb.grid(row=0, column=8, padx=5)
+        rolling_cb.bind("<<ComboboxSelected>>", self.redraw)
+
+        self.status_label = tk.Label(frame_controls, text="", font=font_style, fg="grey")
+        self.status_label.grid(row=0, column=9, padx=10)
+
+        self.summary_label = tk.Label(self, text="", font=font_style, anchor='w', padx=20)
+        self.summary_label.pack(fill='x')
+
+        self.figure = Figure(figsize=(12, 7))
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+
+
+if __name__ == "__main__":
+    # Run on its own: a hidden root that quits when the window closes
+    root = tk.Tk()
+    root.withdraw()
+    window = TrendWindow(root)
+    window.bind("<Destroy>", lambda e: root.destroy() if e.widget is window else None)
+    root.mainloop()
@@ -0,0 +1,152 @@
+"""Monthly income, expense and net series over any span, with rolling statistics.
+
+All series come from one query over monthly_rollup (rows are already
+summed per source, category and month), loaded into NumPy arrays of
+shape (categories, months). Rolling means, month-over-month deltas and
+year-over-year changes are then whole-array operations, so ten years of
+twenty categories takes milliseconds. Series longer than MAX_POINTS
+months are averaged into buckets before plotting.
+"""
+from datetime import date
+from typing import List, NamedTuple
+
+import numpy as np
+
+import db
+from cache import query_cache
+from store import ExpenseStore, IncomeStore
+
+# Most points per plotted series; longer series are downsampled
+MAX_POINTS = 240
+
+income = IncomeStore()
+expenses = ExpenseStore()
+
+
+class Trends(NamedTuple):
+    months: np.ndarray  # datetime64[M], one per month in the span, gaps included
+    income_types: List[str]
+    income: np.ndarray  # (len(income_types), len(months))
+    expense_categories: List[str]
+    expenses: np.ndarray  # (len(expense_categories), len(months))
+
+    @property
+    def income_total(self):
+        return self.income.sum(axis=0)
+
+    @property
+    def expense_total(self):
+        return self.expenses.sum(axis=0)
+
+    @property
+    def net(self):
+        return self.income_total - self.expense_total
+
+
+def _query(start, end):
+    query = "SELECT source, category, month, total FROM monthly_rollup WHERE source IN (%s, %s)"
+    params = [income.table, expenses.table]
+    if start is not None:
+        query += " AND month >= %s"
+        params.append(start)
+    if end is not None:
+        query += " AND month < %s"
+        params.append(end)
+    return query, params
+
+
+def _matrix(rows, months):
+    # Scatter (category, month, total) rows into a (categories, months) array
+    categories = sorted({category for category, _, _ in rows})
+    matrix = np.zeros((len(categories), len(months)))
+    if rows:
+        index = {category: i for i, category in enumerate(categories)}
+        row_index = np.fromiter((index[category] for category, _, _ in rows), dtype=np.intp, count=len(rows))
+        month_index = np.searchsorted(months, np.array([month for _, month, _ in rows], dtype="datetime64[M]"))
+        totals = np.fromiter((float(total) for _, _, total in rows), dtype=float, count=len(rows))
+        np.add.at(matrix, (row_index, month_index), totals)
+    return categories, matrix
+
+
+def load(start: date = None, end: date = None) -> Trends:
+    """Return the monthly series for months in [start, end); open ends follow the data."""
+    income.ensure_table()
+    expenses.ensure_table()
+    query, params = _query(start, end)
+
+    def read():
+        with db.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    # Cached until either table is written to
+    rows = query_cache.get_or_load((income.table, expenses.table), query, params, read)
+
+    seen = [month for _, _, month, _ in rows]
+    lo = start if start is not None else min(seen, default=None)
+    if end is not None:
+        # Up to and including the month of the day before `end`
+        hi = np.datetime64(np.datetime64(end, "D") - 1, "M") + 1
+    elif seen:
+        hi = np.datetime64(max(seen), "M") + 1
+    else:
+        hi = None
+    if lo is None or hi is None:
+        months = np.array([], dtype="datetime64[M]")
+    else:
+        months = np.arange(np.datetime64(lo, "M"), hi)
+
+    split = {income.table: [], expenses.table: []}
+    for source, category, month, total in rows:
+        split[source].append((category, month, total))
+    income_types, income_matrix = _matrix(split[income.table], months)
+    expense_categories, expense_matrix = _matrix(split[expenses.table], months)
+    return Trends(months, income_types, income_matrix, expense_categories, expense_matrix)
+
+
+def rolling_mean(series, window):
+    """Mean of each month and the window - 1 before it, along the last axis (NaN until the window fills)."""
+    series = np.asarray(series, dtype=float)
+    result = np.full(series.shape, np.nan)
+    if window < 1 or series.shape[-1] < window:
+        return result
+    sums = np.cumsum(series, axis=-1)
+    result[..., window - 1] = sums[..., window - 1]
+    result[..., window:] = sums[..., window:] - sums[..., :-window]
+    result[..., window - 1:] /= window
+    return result
+
+
+def month_over_month(series):
+    """Change from the previous month (NaN for the first)."""
+    series = np.asarray(series, dtype=float)
+    result = np.full(series.shape, np.nan)
+    result[..., 1:] = np.diff(series, axis=-1)
+    return result
+
+
+def year_over_year(series):
+    """Percentage change from the same month a year earlier (NaN for the first year or a zero base)."""
+    series = np.asarray(series, dtype=float)
+    result = np.full(series.shape, np.nan)
+    if series.shape[-1] > 12:
+        base = series[..., :-12]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = (series[..., 12:] - base) / np.abs(base) * 100
+        result[..., 12:] = np.where(base != 0, change, np.nan)
+    return result
+
+
+def downsample(months, series, max_points=MAX_POINTS):
+    """Average consecutive months into at most `max_points` buckets; returns (bucket starts, values)."""
+    series = np.asarray(series, dtype=float)
+    count = len(months)
+    if count <= max_points:
+        return months, series
+    size = -(-count // max_points)  # months per bucket, rounded up
+    buckets = -(-count // size)
+    padded = np.full(series.shape[:-1] + (buckets * size,), np.nan)
+    padded[..., :count] = series
+    with np.errstate(invalid="ignore"):
+        values = np.nanmean(padded.reshape(series.shape[:-1] + (buckets, size)), axis=-1)
+    return months[::size], values
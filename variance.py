@@ -0,0 +1,115 @@
+"""Budgeted vs spent vs remaining, per budget category and month.
+
+Budgets and expenses use different category lists, so expense categories
+are first mapped onto budget categories (CATEGORY_MAP, extendable from the
+[category_map] section of config.ini). Both sides are read from
+monthly_rollup in one grouped query: the mapping is a CASE expression and
+the budgeted/spent columns are conditional sums, so the cost depends on
+the number of months and categories, not on how many rows either table has.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import List, NamedTuple
+
+import db
+from cache import query_cache
+from config import get_section
+from store import CENT, BudgetStore, ExpenseStore
+
+# Expense category -> budget category. Categories not listed here keep their
+# own name and show up with nothing budgeted.
+CATEGORY_MAP = {
+    "Groceries": "Groceries",
+    "Fixed Expenses": "Fixed Expenses",
+    "Rent Payments": "Rent/Mortgage Payments",
+    "Utilities (Electricity, Water, Gas, Internet, Phone)": "Utilities",
+    "Insurance Premiums (Health, Auto, Life, Home)": "Fixed Expenses",
+    "Subscription Services (Streaming platforms, Gym memberships, Magazines)": "Fixed Expenses",
+    "Transportation (Fuel, Public Transport, Ride-sharing)": "Transportation",
+    "Dining Out": "Entertainment",
+    "Entertainment (Movies, Concerts, Hobbies)": "Entertainment",
+    "Healthcare (Doctor visits, Medicines, Therapies)": "Healthcare",
+    "Education (Books, Tuition Fees, Courses)": "Education",
+}
+
+budgets = BudgetStore()
+expenses = ExpenseStore()
+
+
+class Variance(NamedTuple):
+    month: date
+    category: str
+    budgeted: Decimal
+    spent: Decimal
+    remaining: Decimal
+
+
+def category_map():
+    """CATEGORY_MAP plus config.ini overrides, keyed by lower-cased expense category."""
+    mapping = {key.lower(): value for key, value in CATEGORY_MAP.items()}
+    # ConfigParser lower-cases keys, which is why matching is case-insensitive
+    mapping.update(get_section("category_map"))
+    return mapping
+
+
+def map_category(category):
+    """Return the budget category an expense category counts against."""
+    return category_map().get(category.lower(), category)
+
+
+def _query(start, end):
+    mapping = category_map()
+    params = []
+    if mapping:
+        cases = " ".join("WHEN %s THEN %s" for _ in mapping)
+        for pair in mapping.items():
+            params.extend(pair)
+        mapped = f"CASE WHEN source = %s THEN CASE LOWER(category) {cases} ELSE category END ELSE category END"
+        params.insert(0, expenses.table)
+    else:
+        mapped = "category"
+
+    query = (f"SELECT month, {mapped} AS budget_category, "
+             f"SUM(CASE WHEN source = %s THEN total ELSE 0 END) AS budgeted, "
+             f"SUM(CASE WHEN source = %s THEN total ELSE 0 END) AS spent "
+             f"FROM monthly_rollup WHERE source IN (%s, %s)")
+    params += [budgets.table, expenses.table, budgets.table, expenses.table]
+    if start is not None:
+        query += " AND month >= %s"
+        params.append(start)
+    if end is not None:
+        query += " AND month < %s"
+        params.append(end)
+    query += " GROUP BY month, budget_category ORDER BY month, budget_category"
+    return query, params
+
+
+def report(start: date = None, end: date = None) -> List[Variance]:
+    """Return one Variance per (month, budget category) for months in [start, end)."""
+    budgets.ensure_table()
+    expenses.ensure_table()
+    query, params = _query(start, end)
+
+    def load():
+        with db.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    # Cached until either table is written to
+    rows = query_cache.get_or_load((budgets.table, expenses.table), query, params, load)
+    result = []
+    for month, category, budgeted, spent in rows:
+        budgeted = Decimal(str(budgeted or 0)).quantize(CENT)
+        spent = Decimal(str(spent or 0)).quantize(CENT)
+        result.append(Variance(month, category, budgeted, spent, budgeted - spent))
+    return result
+
+
+def by_category(rows: List[Variance]) -> List[Variance]:
+    """Collapse a report over all its months into one row per category (month is None)."""
+    totals = {}
+    for row in rows:
+        budgeted, spent = totals.get(row.category, (Decimal(0), Decimal(0)))
+        totals[row.category] = (budgeted + row.budgeted, spent + row.spent)
+    return [Variance(None, category, budgeted, spent, budgeted - spent)
+            for category, (budgeted, spent) in sorted(totals.items())]
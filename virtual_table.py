@@ -0,0 +1,177 @@
+import bisect
+import tkinter as tk
+from tkinter import ttk
+
+from worker import show_error
+
+
+class VirtualTable(tk.Frame):
+    """A Treeview that only holds a sliding window of a (possibly huge) table.
+
+    Rows are pulled a page at a time from `fetch_page(after=key, before=key,
+    limit=n)`, which must return rows in ascending key order (see
+    store.page()). When the view nears either end of the window the next
+    page is fetched on `worker` (the owning window's Worker) and added when
+    it arrives, and rows that scrolled far out of view are dropped, so Tk
+    never holds more than `max_rows` items no matter how big the table is.
+    """
+
+    def __init__(self, master, columns, key_of, worker, page_size=100, max_rows=500, **tree_options):
+        super().__init__(master)
+        self.key_of = key_of
+        self.default_key_of = key_of
+        self.worker = worker
+        # Worker key of this table's page fetches; a new load() cancels them
+        self.task_key = f"page-{id(self)}"
+        self.page_size = page_size
+        self.max_rows = max(max_rows, page_size * 2)
+        # Fraction of the window from either end at which the next page is prefetched
+        self.prefetch = 0.2
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', **tree_options)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        self._fetch_page = None
+        self._keys = {}  # iid -> keyset key of the rows currently in the window
+        self._more_before = False
+        self._more_after = False
+        self._loading = False  # True from a page fetch's submit until its rows arrive
+
+    def load(self, fetch_page, rows=None, key_of=None):
+        """Replace the contents with the first page from `fetch_page`; return its row count.
+
+        Pass `rows` when the first page was already fetched (e.g. on a worker
+        thread) to skip fetching it here, and `key_of` when fetch_page sorts
+        by another key than the one given to the constructor.
+        """
+        # A page of the previous contents still being fetched is no longer wanted
+        self.worker.cancel(self.task_key)
+        self._loading = False
+        self._fetch_page = fetch_page
+        self.key_of = key_of or self.default_key_of
+        self.clear()
+        if rows is None:
+            rows = fetch_page(limit=self.page_size)
+        self._append(rows)
+        self._more_after = len(rows) == self.page_size
+        return len(rows)
+
+    def add_row(self, row):
+        """Show a newly inserted row in place; returns False if it lies outside the window.
+
+        Rows past the loaded window are left for paging to pick up, so adding
+        costs the same however large the table is.
+        """
+        key = self.key_of(row)
+        children = self.tree.get_children()
+        if children:
+            if self._more_after and key > self._keys[children[-1]]:
+                return False
+            if self._more_before and key < self._keys[children[0]]:
+                return False
+        keys = [self._keys[iid] for iid in children]
+        index = bisect.bisect(keys, key)
+        iid = self._row_iid(row)
+        self.tree.insert('', index, iid=iid, values=row)
+        self._keys[iid] = key
+        self.tree.see(iid)
+        return True
+
+    def remove_row(self, iid):
+        """Remove a deleted row from the window if it is loaded."""
+        iid = str(iid)
+        if iid in self._keys:
+            self._forget((iid,))
+
+    def clear(self):
+        self.tree.delete(*self.tree.get_children())
+        self._keys.clear()
+        self._more_before = self._more_after = False
+
+    def _row_iid(self, row):
+        return str(row[0])
+
+    def _append(self, rows):
+        for row in rows:
+            iid = self._row_iid(row)
+            if iid in self._keys:
+                continue  # added with add_row() while the page was being fetched
+            self.tree.insert('', 'end', iid=iid, values=row)
+            self._keys[iid] = self.key_of(row)
+
+    def _prepend(self, rows):
+        index = 0
+        for row in rows:
+            iid = self._row_iid(row)
+            if iid in self._keys:
+                continue
+            self.tree.insert('', index, iid=iid, values=row)
+            self._keys[iid] = self.key_of(row)
+            index += 1
+        return index
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self._loading or self._fetch_page is None:
+            return
+        children = self.tree.get_children()
+        if not children:
+            return
+        if self._more_after and float(last) >= 1 - self.prefetch:
+            self._fetch(self._appended, after=self._keys[children[-1]])
+        elif self._more_before and float(first) <= self.prefetch:
+            self._fetch(self._prepended, before=self._keys[children[0]])
+
+    def _fetch(self, on_done, **edge):
+        # The page is read on the worker; no more are requested until it arrives
+        self._loading = True
+        self.worker.submit(self._fetch_page, limit=self.page_size, **edge, key=self.task_key,
+                           on_done=on_done, on_error=self._failed)
+
+    def _failed(self, error):
+        self._loading = False
+        show_error(error)
+
+    def _top_index(self):
+        top = self.tree.identify_row(1)
+        return self.tree.index(top) if top else 0
+
+    def _appended(self, rows):
+        try:
+            self._more_after = len(rows) == self.page_size
+            self._append(rows)
+
+            # Drop rows that have scrolled well above the view
+            children = self.tree.get_children()
+            excess = len(children) - self.max_rows
+            if excess > 0:
+                top = self._top_index()
+                self._forget(children[:excess])
+                self._more_before = True
+                self.tree.yview_moveto(max(top - excess, 0) / self.max_rows)
+        finally:
+            self._loading = False
+
+    def _prepended(self, rows):
+        try:
+            top = self._top_index()
+            self._more_before = len(rows) == self.page_size
+            added = self._prepend(rows)
+
+            # Drop rows that have scrolled well below the view
+            children = self.tree.get_children()
+            excess = len(children) - self.max_rows
+            if excess > 0:
+                self._forget(children[-excess:])
+                self._more_after = True
+            self.tree.yview_moveto((top + added) / len(self.tree.get_children()))
+        finally:
+            self._loading = False
+
+    def _forget(self, iids):
+        self.tree.delete(*iids)
+        for iid in iids:
+            del self._keys[iid]
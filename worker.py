@@ -0,0 +1,146 @@
+"""Run database calls off the Tk thread.
+
+Tk widgets may only be touched from the thread running mainloop(), so a
+Worker runs each call on a small thread pool and hands the result back
+through a queue that the Tk thread polls with after(). Callbacks therefore
+always run on the Tk thread and may update widgets freely.
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+# Milliseconds between checks for finished calls while any are pending
+POLL_INTERVAL = 50
+
+# Queued when a task's thread is done (or the task was cancelled before starting)
+_FINISHED = object()
+
+
+class Task:
+    """Handle for one submitted call."""
+
+    def __init__(self, key=None):
+        self.key = key
+        self.cancelled = False
+        self.future = None
+
+    def cancel(self):
+        # A call that already started still runs to the end; its result is dropped
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+def show_error(error):
+    messagebox.showerror("Error", str(error))
+
+
+class Worker:
+    """Runs functions on background threads and delivers results via `widget.after`.
+
+    `on_busy(busy)` is called on the Tk thread when the first call starts
+    and when the last one finishes, so a window can show a busy cursor or
+    status. Calls submitted with the same `key` supersede each other: when
+    a new search is submitted under "search", the older one is cancelled
+    (or, if already running, its result is ignored).
+    """
+
+    def __init__(self, widget, max_workers=2, on_busy=None):
+        self.widget = widget
+        self.on_busy = on_busy
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()  # (task, callback, value) to run on the Tk thread
+        self._latest = {}  # key -> newest Task submitted under it
+        self._pending = 0
+        self._poll_id = None  # after() id while polling
+        self._closed = False
+
+    def submit(self, fn, *args, on_done=None, on_error=show_error, key=None, **kwargs):
+        """Run fn(*args, **kwargs) in the background; return its Task.
+
+        on_done(result) or on_error(exception) is called on the Tk thread
+        unless the task was cancelled or superseded first.
+        """
+        task = Task(key)
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = task
+
+        def run():
+            if task.cancelled:
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._results.put((task, on_error, e))
+            else:
+                self._results.put((task, on_done, result))
+
+        self._started()
+        task.future = self._executor.submit(run)
+        task.future.add_done_callback(lambda _: self._results.put((task, _FINISHED, None)))
+        return task
+
+    @property
+    def busy(self):
+        """True while any submitted call has not finished."""
+        return self._pending > 0
+
+    def relay(self, callback):
+        """Wrap a callback so calling it from a worker thread runs it on the Tk thread.
+
+        Used for progress reports, e.g. import_csv(..., progress=worker.relay(show_progress)).
+        """
+        return lambda value: self._results.put((None, callback, value))
+
+    def cancel(self, key):
+        """Cancel the newest task submitted under `key`, if any."""
+        task = self._latest.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def shutdown(self):
+        """Cancel outstanding calls and stop polling; call before destroying the widget."""
+        self._closed = True
+        for task in list(self._latest.values()):
+            task.cancel()
+        if self._poll_id is not None:
+            self.widget.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._executor.shutdown(wait=False)
+
+    def _started(self):
+        self._pending += 1
+        if self._pending == 1 and self.on_busy:
+            self.on_busy(True)
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(POLL_INTERVAL, self._poll)
+
+    def _poll(self):
+        while not self._closed:
+            try:
+                task, callback, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if callback is _FINISHED:
+                self._finished(task)
+            elif callback is not None and not (task is not None and task.cancelled):
+                try:
+                    callback(value)
+                except Exception as e:
+                    show_error(e)
+
+        if self._pending and not self._closed:
+            self._poll_id = self.widget.after(POLL_INTERVAL, self._poll)
+        else:
+            self._poll_id = None
+
+    def _finished(self, task):
+        if task.key is not None and self._latest.get(task.key) is task:
+            del self._latest[task.key]
+        self._pending -= 1
+        if self._pending == 0 and self.on_busy:
+            self.on_busy(False)